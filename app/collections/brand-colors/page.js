@@ -1,23 +1,73 @@
 'use client'
 
-import { useState } from 'react'
+import { useState, useEffect, useMemo } from 'react'
 import { Card, CardHeader, CardTitle, CardContent } from '@/components/ui/card'
 import { brandColors, getCategories, getBrandsByCategory, searchBrands } from '@/lib/brandColors'
 import { getTextColor } from '@/lib/colorUtils'
+import {
+  loadContrastMatrix,
+  getAccessiblePairs,
+  loadAccessibleSuggestions,
+  getAccessibleSuggestion
+} from '@/lib/contrastMatrix'
+import { loadPaletteGradients, getPaletteGradient, gradientCss } from '@/lib/colorGradient'
+import { loadColorSearchIndex, searchColorIndex } from '@/lib/colorSearch'
 import Link from 'next/link'
 
 export default function BrandColorsPage() {
   const [searchQuery, setSearchQuery] = useState('')
   const [selectedCategory, setSelectedCategory] = useState('all')
   const [copied, setCopied] = useState('')
+  const [contrastMatrix, setContrastMatrix] = useState(null)
+  const [suggestions, setSuggestions] = useState(null)
+  const [gradients, setGradients] = useState(null)
+  const [searchIndex, setSearchIndex] = useState(null)
 
   const categories = getCategories()
 
-  const filteredBrands = searchQuery
-    ? searchBrands(searchQuery)
-    : selectedCategory === 'all'
-    ? brandColors
-    : getBrandsByCategory(selectedCategory)
+  // Ranked name, prefix and fuzzy matches plus '#hex' / 'near r,g,b' color queries from the
+  // prebuilt index; a plain substring scan until it has loaded
+  const filteredBrands = useMemo(() => {
+    if (!searchQuery) {
+      return selectedCategory === 'all' ? brandColors : getBrandsByCategory(selectedCategory)
+    }
+    if (!searchIndex) return searchBrands(searchQuery)
+    const brandsByName = new Map(brandColors.map(brand => [brand.brand, brand]))
+    return searchColorIndex(searchIndex, searchQuery, { kind: 'brand' })
+      .map(result => brandsByName.get(result.name))
+      .filter(Boolean)
+  }, [searchQuery, selectedCategory, searchIndex])
+
+  useEffect(() => {
+    let cancelled = false
+    loadContrastMatrix('brand')
+      .then(matrix => { if (!cancelled) setContrastMatrix(matrix) })
+      .catch(() => {})
+    loadAccessibleSuggestions()
+      .then(data => { if (!cancelled) setSuggestions(data) })
+      .catch(() => {})
+    loadPaletteGradients()
+      .then(data => { if (!cancelled) setGradients(data) })
+      .catch(() => {})
+    loadColorSearchIndex()
+      .then(index => { if (!cancelled) setSearchIndex(index) })
+      .catch(() => {})
+    return () => { cancelled = true }
+  }, [])
+
+  // Highest-contrast pair within each brand palette, looked up in the precomputed matrix
+  const bestPairs = useMemo(() => {
+    if (!contrastMatrix) return {}
+    const positions = new Map(contrastMatrix.colors.map((hex, i) => [hex, i]))
+    const pairs = {}
+    brandColors.forEach(brand => {
+      const indices = [...new Set(brand.colors.map(hex => positions.get(hex.toUpperCase())))]
+        .filter(i => i !== undefined)
+      const [best] = getAccessiblePairs(contrastMatrix, { minLevel: 'Fail', indices, limit: 1 })
+      if (best) pairs[brand.brand] = best
+    })
+    return pairs
+  }, [contrastMatrix])
 
   const copyColor = (color) => {
     navigator.clipboard.writeText(color)
@@ -51,7 +101,7 @@ export default function BrandColorsPage() {
           <div className="grid grid-cols-1 md:grid-cols-2 gap-4">
             <input
               type="text"
-              placeholder="Search brands..."
+              placeholder="Search brands, or #hex / near r,g,b..."
               value={searchQuery}
               onChange={(e) => setSearchQuery(e.target.value)}
               className="px-4 py-3 rounded-lg border-2 border-gray-300 dark:border-gray-600 bg-white dark:bg-gray-800 focus:border-purple-500 focus:outline-none"
@@ -100,6 +150,60 @@ export default function BrandColorsPage() {
                 ))}
               </div>
 
+              {/* OKLab gradient through the palette, precomputed as minimal CSS stops */}
+              {gradients && (() => {
+                const stops = getPaletteGradient(gradients, brand.brand)
+                if (!stops) return null
+                const css = gradientCss(stops, 90)
+                return (
+                  <div
+                    className="h-6 rounded-lg shadow cursor-pointer hover:opacity-80 transition-opacity"
+                    style={{ background: css }}
+                    onClick={() => copyColor(css)}
+                    title={copied === css ? '✓ Copied!' : 'Gradient - Click to copy CSS'}
+                  />
+                )
+              })()}
+
+              {/* Best Contrast Pair */}
+              {bestPairs[brand.brand] && (
+                <div className="flex items-center space-x-3 text-sm">
+                  <div
+                    className="w-10 h-8 rounded shadow flex items-center justify-center font-bold flex-shrink-0"
+                    style={{
+                      backgroundColor: contrastMatrix.colors[bestPairs[brand.brand].i],
+                      color: contrastMatrix.colors[bestPairs[brand.brand].j]
+                    }}
+                  >
+                    Aa
+                  </div>
+                  <div className="text-gray-600 dark:text-gray-400">
+                    Best pair: {bestPairs[brand.brand].ratio.toFixed(2)}:1 · {bestPairs[brand.brand].level}
+                  </div>
+                </div>
+              )}
+              {bestPairs[brand.brand] && suggestions && (() => {
+                const { i, j } = bestPairs[brand.brand]
+                const fix = getAccessibleSuggestion(suggestions, contrastMatrix.colors[j], contrastMatrix.colors[i])
+                return fix && (
+                  <div
+                    className="flex items-center space-x-3 text-sm cursor-pointer"
+                    onClick={() => copyColor(fix.hex)}
+                    title={`${fix.hex} - Click to copy`}
+                  >
+                    <div
+                      className="w-10 h-8 rounded shadow flex items-center justify-center font-bold flex-shrink-0"
+                      style={{ backgroundColor: contrastMatrix.colors[i], color: fix.hex }}
+                    >
+                      Aa
+                    </div>
+                    <div className="text-gray-600 dark:text-gray-400">
+                      AA fix: <span className="font-mono">{fix.hex}</span> ({fix.ratio.toFixed(2)}:1)
+                    </div>
+                  </div>
+                )
+              })()}
+
               {/* Color Codes */}
               <div className="space-y-2">
                 {brand.colors.map((color, colorIdx) => (
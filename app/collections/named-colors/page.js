@@ -1,22 +1,52 @@
 'use client'
 
-import { useState } from 'react'
+import { useState, useEffect, useMemo } from 'react'
 import { Card, CardHeader, CardTitle, CardContent } from '@/components/ui/card'
-import { namedColors, getCategories, getColorsByCategory, searchColors } from '@/lib/namedColors'
+import { namedColors, getCategories, getColorsByCategory, getColorByName, searchColors } from '@/lib/namedColors'
 import { getTextColor } from '@/lib/colorUtils'
+import { loadContrastMatrix, getAccessiblePairs } from '@/lib/contrastMatrix'
+import { loadColorSearchIndex, searchColorIndex } from '@/lib/colorSearch'
 import Link from 'next/link'
 
 export default function NamedColorsPage() {
   const [searchQuery, setSearchQuery] = useState('')
   const [selectedCategory, setSelectedCategory] = useState('all')
+  const [contrastMatrix, setContrastMatrix] = useState(null)
+  const [pairLevel, setPairLevel] = useState('AA')
+  const [searchIndex, setSearchIndex] = useState(null)
 
   const categories = getCategories()
 
-  const filteredColors = searchQuery
-    ? searchColors(searchQuery)
-    : selectedCategory === 'all'
-    ? namedColors
-    : getColorsByCategory(selectedCategory)
+  // Ranked name, prefix and fuzzy matches plus '#hex' / 'near r,g,b' color queries from the
+  // prebuilt index; a plain substring scan until it has loaded
+  const filteredColors = useMemo(() => (
+    searchQuery
+      ? searchIndex
+        ? searchColorIndex(searchIndex, searchQuery, { kind: 'named' }).map(result => getColorByName(result.name)).filter(Boolean)
+        : searchColors(searchQuery)
+      : selectedCategory === 'all'
+      ? namedColors
+      : getColorsByCategory(selectedCategory)
+  ), [searchQuery, selectedCategory, searchIndex])
+
+  useEffect(() => {
+    let cancelled = false
+    loadContrastMatrix('named')
+      .then(matrix => { if (!cancelled) setContrastMatrix(matrix) })
+      .catch(() => {})
+    loadColorSearchIndex()
+      .then(index => { if (!cancelled) setSearchIndex(index) })
+      .catch(() => {})
+    return () => { cancelled = true }
+  }, [])
+
+  // Pairs come from the precomputed matrix; only the visible colors are considered
+  const accessiblePairs = useMemo(() => {
+    if (!contrastMatrix) return []
+    const positions = new Map(contrastMatrix.names.map((name, i) => [name, i]))
+    const indices = filteredColors.map(color => positions.get(color.name)).filter(i => i !== undefined)
+    return getAccessiblePairs(contrastMatrix, { minLevel: pairLevel, indices, limit: 24 })
+  }, [contrastMatrix, filteredColors, pairLevel])
 
   return (
     <div className="container mx-auto px-4 py-8">
@@ -38,7 +68,7 @@ export default function NamedColorsPage() {
           <div className="grid grid-cols-1 md:grid-cols-2 gap-4">
             <input
               type="text"
-              placeholder="Search colors..."
+              placeholder="Search colors, or #hex / near r,g,b..."
               value={searchQuery}
               onChange={(e) => setSearchQuery(e.target.value)}
               className="px-4 py-3 rounded-lg border-2 border-gray-300 dark:border-gray-600 bg-white dark:bg-gray-800 focus:border-purple-500 focus:outline-none"
@@ -100,6 +130,48 @@ export default function NamedColorsPage() {
         </Card>
       )}
 
+      {/* Accessible Pairs */}
+      {accessiblePairs.length > 0 && (
+        <Card className="mt-8 glass">
+          <CardHeader>
+            <div className="flex items-center justify-between">
+              <CardTitle>Accessible Pairs</CardTitle>
+              <select
+                value={pairLevel}
+                onChange={(e) => setPairLevel(e.target.value)}
+                className="px-3 py-2 rounded-lg border-2 border-gray-300 dark:border-gray-600 bg-white dark:bg-gray-800 focus:border-purple-500 focus:outline-none text-sm"
+              >
+                <option value="AA Large">AA Large (3:1)</option>
+                <option value="AA">AA (4.5:1)</option>
+                <option value="AAA">AAA (7:1)</option>
+              </select>
+            </div>
+          </CardHeader>
+          <CardContent>
+            <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-4">
+              {accessiblePairs.map(({ i, j, ratio, level }) => (
+                <div key={`${i}-${j}`} className="flex items-center space-x-3">
+                  <div
+                    className="w-16 h-12 rounded-lg shadow flex items-center justify-center font-bold flex-shrink-0"
+                    style={{ backgroundColor: contrastMatrix.colors[i], color: contrastMatrix.colors[j] }}
+                  >
+                    Aa
+                  </div>
+                  <div className="flex-1 min-w-0">
+                    <div className="text-sm font-semibold capitalize truncate">
+                      {contrastMatrix.names[j]} on {contrastMatrix.names[i]}
+                    </div>
+                    <div className="text-xs text-gray-500">
+                      {ratio.toFixed(2)}:1 · {level}
+                    </div>
+                  </div>
+                </div>
+              ))}
+            </div>
+          </CardContent>
+        </Card>
+      )}
+
       {/* Info */}
       <Card className="mt-8 glass">
         <CardHeader>
@@ -1,5 +1,6 @@
 import { Card, CardHeader, CardTitle, CardContent } from '@/components/ui/card'
-import { getColorByName, getSimilarColors, namedColors } from '@/lib/namedColors'
+import { getColorByName, namedColors } from '@/lib/namedColors'
+import similarColors from '@/lib/similarColors.json'
 import {
   hexToRgb,
   hexToHsl,
@@ -12,6 +13,9 @@ import {
   generateShades
 } from '@/lib/colorUtils'
 import { getContrastRatio } from '@/lib/contrastUtils'
+import { getShadeScale } from '@/lib/shadeScales'
+import { getShadeScaleData } from '@/lib/shadeScaleData'
+import { getNearestGridHex } from '@/lib/colorGrid'
 import Link from 'next/link'
 import { notFound } from 'next/navigation'
 
@@ -51,9 +55,15 @@ export default function ColorPage({ params }) {
   const complementary = getComplementary(hex)
   const analogous = getAnalogous(hex)
   const triadic = getTriadic(hex)
-  const tints = generateTints(hex, 5)
-  const shades = generateShades(hex, 5)
-  const similar = getSimilarColors(hex, 6).slice(1) // Exclude the color itself
+  // Ramps precomputed for the whole table by colors_update.py, computed here only without it
+  const ramps = getShadeScale(getShadeScaleData(), hex)
+  const tints = ramps ? ramps.tints : generateTints(hex, 5)
+  const shades = ramps ? ramps.shades : generateShades(hex, 5)
+  // Perceptual neighbors precomputed by colors_update.py
+  const similar = (similarColors.similar[name] || []).map(getColorByName).filter(Boolean)
+
+  // Static palette page of the nearest color on the precomputed grid
+  const paletteHex = getNearestGridHex(hex)
 
   const contrastWhite = getContrastRatio(hex, '#FFFFFF')
   const contrastBlack = getContrastRatio(hex, '#000000')
@@ -176,6 +186,23 @@ export default function ColorPage({ params }) {
               </div>
             </CardContent>
           </Card>
+
+          {paletteHex && (
+            <Card className="glass">
+              <CardHeader>
+                <CardTitle>More Palettes</CardTitle>
+              </CardHeader>
+              <CardContent>
+                <Link href={`/palettes/${paletteHex}`} className="flex items-center space-x-3 hover:underline">
+                  <div className="w-10 h-10 rounded shadow" style={{ backgroundColor: `#${paletteHex}` }} />
+                  <span>
+                    Harmonies, scheme and color blindness views for the nearby{' '}
+                    <span className="font-mono">#{paletteHex}</span>
+                  </span>
+                </Link>
+              </CardContent>
+            </Card>
+          )}
         </div>
 
         {/* Color Harmonies & Variations */}
@@ -0,0 +1,165 @@
+import { Card, CardHeader, CardTitle, CardContent } from '@/components/ui/card'
+import { colorBlindnessTypes } from '@/lib/colorBlindness'
+import { getGridColor, getGridHexes, getGridNeighbors } from '@/lib/colorGrid'
+import Link from 'next/link'
+import { notFound } from 'next/navigation'
+
+// Only grid colors precomputed by colors_update.py have pages
+export const dynamicParams = false
+
+export async function generateStaticParams() {
+  return getGridHexes().map((hex) => ({ hex }))
+}
+
+export async function generateMetadata({ params }) {
+  const record = getGridColor(params.hex)
+
+  if (!record) {
+    return {
+      title: 'Color Not Found'
+    }
+  }
+
+  return {
+    title: `${record.hex.toUpperCase()} Color Palettes - Harmonies, Scheme & Accessibility`,
+    description: `Color harmonies, a lightness scheme, contrast ratios and color blindness simulations for ${record.hex.toUpperCase()}.`,
+  }
+}
+
+const HARMONY_LABELS = {
+  complementary: 'Complementary',
+  analogous: 'Analogous',
+  triadic: 'Triadic',
+  tetradic: 'Tetradic',
+  monochromatic: 'Monochromatic',
+  'split-complementary': 'Split Complementary'
+}
+
+function Swatches({ colors }) {
+  return (
+    <div className="flex space-x-4">
+      {colors.map((color, idx) => (
+        <div key={idx} className="flex-1 space-y-2">
+          <div
+            className="h-20 rounded-lg shadow"
+            style={{ backgroundColor: color }}
+          />
+          <div className="text-center font-mono text-sm">{color}</div>
+        </div>
+      ))}
+    </div>
+  )
+}
+
+export default function PalettePage({ params }) {
+  const record = getGridColor(params.hex)
+
+  if (!record) {
+    notFound()
+  }
+
+  const { hex, harmonies, scheme, contrast, colorBlindness } = record
+  const neighbors = getGridNeighbors(hex)
+  const textColor = contrast.white.ratio > contrast.black.ratio ? '#FFFFFF' : '#000000'
+
+  return (
+    <div className="container mx-auto px-4 py-8">
+      {/* Breadcrumb */}
+      <div className="mb-6 text-sm">
+        <Link href="/" className="text-purple-500 hover:underline">Home</Link>
+        <span className="mx-2">/</span>
+        <Link href="/tools/palette-generator" className="text-purple-500 hover:underline">Palettes</Link>
+        <span className="mx-2">/</span>
+        <span className="text-gray-600 dark:text-gray-400 font-mono">{hex}</span>
+      </div>
+
+      {/* Hero Section */}
+      <div
+        className="w-full h-48 rounded-2xl shadow-2xl border-8 border-white dark:border-gray-800 mb-8 flex items-center justify-center"
+        style={{ backgroundColor: hex }}
+      >
+        <h1 className="text-5xl font-bold font-mono" style={{ color: textColor }}>
+          {hex}
+        </h1>
+      </div>
+
+      <div className="grid grid-cols-1 lg:grid-cols-3 gap-8">
+        <div className="space-y-6">
+          <Card className="glass">
+            <CardHeader>
+              <CardTitle>Contrast Ratios</CardTitle>
+            </CardHeader>
+            <CardContent className="space-y-3">
+              <div className="flex items-center justify-between">
+                <span>vs White</span>
+                <span className="font-bold">{contrast.white.ratio.toFixed(2)}:1 · {contrast.white.level}</span>
+              </div>
+              <div className="flex items-center justify-between">
+                <span>vs Black</span>
+                <span className="font-bold">{contrast.black.ratio.toFixed(2)}:1 · {contrast.black.level}</span>
+              </div>
+            </CardContent>
+          </Card>
+
+          <Card className="glass">
+            <CardHeader>
+              <CardTitle>Color Blindness</CardTitle>
+            </CardHeader>
+            <CardContent className="grid grid-cols-2 gap-4">
+              {colorBlindnessTypes.filter(type => colorBlindness[type.id]).map(type => (
+                <div key={type.id} className="space-y-1">
+                  <div
+                    className="h-12 rounded shadow"
+                    style={{ backgroundColor: colorBlindness[type.id] }}
+                    title={colorBlindness[type.id]}
+                  />
+                  <div className="text-xs text-gray-500">{type.name}</div>
+                </div>
+              ))}
+            </CardContent>
+          </Card>
+
+          {neighbors.length > 0 && (
+            <Card className="glass">
+              <CardHeader>
+                <CardTitle>Nearby Colors</CardTitle>
+              </CardHeader>
+              <CardContent className="grid grid-cols-2 gap-4">
+                {neighbors.map(({ channel, step, hex: neighbor }) => (
+                  <Link key={neighbor} href={`/palettes/${neighbor}`} className="flex items-center space-x-2 hover:underline">
+                    <div className="w-8 h-8 rounded shadow" style={{ backgroundColor: `#${neighbor}` }} />
+                    <span className="font-mono text-sm">
+                      {channel.toUpperCase()}{step > 0 ? '+' : '−'} #{neighbor}
+                    </span>
+                  </Link>
+                ))}
+              </CardContent>
+            </Card>
+          )}
+        </div>
+
+        <div className="lg:col-span-2 space-y-6">
+          <Card className="glass">
+            <CardHeader>
+              <CardTitle>Scheme</CardTitle>
+            </CardHeader>
+            <CardContent>
+              <Swatches colors={scheme} />
+            </CardContent>
+          </Card>
+
+          {Object.entries(HARMONY_LABELS).map(([harmony, label]) => (
+            <Card key={harmony} className="glass">
+              <CardHeader>
+                <CardTitle>{label}</CardTitle>
+              </CardHeader>
+              <CardContent>
+                <Swatches colors={harmonies[harmony]} />
+              </CardContent>
+            </Card>
+          ))}
+        </div>
+      </div>
+    </div>
+  )
+}
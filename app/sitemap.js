@@ -1,3 +1,5 @@
+import { getGridHexes } from '@/lib/colorGrid'
+
 export default function sitemap() {
   const baseUrl = 'https://color.makr.io'
   const currentDate = new Date().toISOString()
@@ -68,5 +70,15 @@ export default function sitemap() {
     },
   ]
 
+  // Static palette pages for the precomputed color grid
+  for (const hex of getGridHexes()) {
+    routes.push({
+      url: `${baseUrl}/palettes/${hex}`,
+      lastModified: currentDate,
+      changeFrequency: 'yearly',
+      priority: 0.5,
+    })
+  }
+
   return routes
 }
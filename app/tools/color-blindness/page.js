@@ -1,17 +1,62 @@
 'use client'
 
-import { useState } from 'react'
+import { useState, useEffect, useRef } from 'react'
 import { Card, CardHeader, CardTitle, CardContent } from '@/components/ui/card'
 import { Button } from '@/components/ui/button'
 import { getRandomColor, generateRandomPalette, getTextColor } from '@/lib/colorUtils'
-import { simulateColorBlindness, simulatePalette, colorBlindnessTypes } from '@/lib/colorBlindness'
+import { simulateColorBlindness, simulatePalette, simulateImageData, colorBlindnessTypes } from '@/lib/colorBlindness'
 import Link from 'next/link'
 
+// Uploaded images are scaled down to at most this many pixels before simulating
+const MAX_IMAGE_PIXELS = 12 * 1000 * 1000
+
+const MODES = [
+  { id: 'single', label: 'Single Color' },
+  { id: 'palette', label: 'Color Palette' },
+  { id: 'image', label: 'Image' }
+]
+
 export default function ColorBlindnessPage() {
   const [color, setColor] = useState('#3B82F6')
   const [palette, setPalette] = useState(['#3B82F6', '#8B5CF6', '#EC4899', '#F59E0B', '#10B981'])
   const [selectedType, setSelectedType] = useState('deuteranopia')
-  const [mode, setMode] = useState('single') // single or palette
+  const [mode, setMode] = useState('single') // single, palette or image
+  const [image, setImage] = useState(null) // { data: ImageData, name }
+  const [simulation, setSimulation] = useState(null) // { width, height, ms }
+  const originalCanvasRef = useRef(null)
+  const simulatedCanvasRef = useRef(null)
+
+  const handleImageUpload = async (e) => {
+    const file = e.target.files[0]
+    if (!file) return
+    const bitmap = await createImageBitmap(file)
+    const scale = Math.min(1, Math.sqrt(MAX_IMAGE_PIXELS / (bitmap.width * bitmap.height)))
+    const width = Math.max(1, Math.round(bitmap.width * scale))
+    const height = Math.max(1, Math.round(bitmap.height * scale))
+    const canvas = document.createElement('canvas')
+    canvas.width = width
+    canvas.height = height
+    const ctx = canvas.getContext('2d', { willReadFrequently: true })
+    ctx.drawImage(bitmap, 0, 0, width, height)
+    bitmap.close()
+    setImage({ data: ctx.getImageData(0, 0, width, height), name: file.name })
+  }
+
+  // Whole-image simulation through the per-channel tables, timed as the user sees it
+  useEffect(() => {
+    if (mode !== 'image' || !image || !originalCanvasRef.current || !simulatedCanvasRef.current) return
+    const { data } = image
+    for (const canvas of [originalCanvasRef.current, simulatedCanvasRef.current]) {
+      canvas.width = data.width
+      canvas.height = data.height
+    }
+    originalCanvasRef.current.getContext('2d').putImageData(data, 0, 0)
+    const start = performance.now()
+    const simulated = selectedType === 'normal' ? data : simulateImageData(data, selectedType)
+    const ms = performance.now() - start
+    simulatedCanvasRef.current.getContext('2d').putImageData(simulated, 0, 0)
+    setSimulation({ width: data.width, height: data.height, ms })
+  }, [mode, image, selectedType])
 
   const handleRandomColor = () => {
     setColor(getRandomColor())
@@ -46,26 +91,19 @@ export default function ColorBlindnessPage() {
               <CardTitle>Mode</CardTitle>
             </CardHeader>
             <CardContent className="space-y-2">
-              <button
-                onClick={() => setMode('single')}
-                className={`w-full px-4 py-3 rounded-lg font-medium transition-all ${
-                  mode === 'single'
-                    ? 'bg-purple-500 text-white'
-                    : 'bg-gray-100 dark:bg-gray-800 hover:bg-gray-200 dark:hover:bg-gray-700'
-                }`}
-              >
-                Single Color
-              </button>
-              <button
-                onClick={() => setMode('palette')}
-                className={`w-full px-4 py-3 rounded-lg font-medium transition-all ${
-                  mode === 'palette'
-                    ? 'bg-purple-500 text-white'
-                    : 'bg-gray-100 dark:bg-gray-800 hover:bg-gray-200 dark:hover:bg-gray-700'
-                }`}
-              >
-                Color Palette
-              </button>
+              {MODES.map(({ id, label }) => (
+                <button
+                  key={id}
+                  onClick={() => setMode(id)}
+                  className={`w-full px-4 py-3 rounded-lg font-medium transition-all ${
+                    mode === id
+                      ? 'bg-purple-500 text-white'
+                      : 'bg-gray-100 dark:bg-gray-800 hover:bg-gray-200 dark:hover:bg-gray-700'
+                  }`}
+                >
+                  {label}
+                </button>
+              ))}
             </CardContent>
           </Card>
 
@@ -103,7 +141,7 @@ export default function ColorBlindnessPage() {
                 </Button>
               </CardContent>
             </Card>
-          ) : (
+          ) : mode === 'palette' ? (
             <Card className="glass">
               <CardHeader>
                 <CardTitle>Palette</CardTitle>
@@ -131,6 +169,23 @@ export default function ColorBlindnessPage() {
                 </Button>
               </CardContent>
             </Card>
+          ) : (
+            <Card className="glass">
+              <CardHeader>
+                <CardTitle>Image</CardTitle>
+              </CardHeader>
+              <CardContent className="space-y-4">
+                <input
+                  type="file"
+                  accept="image/*"
+                  onChange={handleImageUpload}
+                  className="w-full text-sm"
+                />
+                <p className="text-xs text-gray-500">
+                  Images over {MAX_IMAGE_PIXELS / 1e6} MP are scaled down first. Nothing is uploaded; the image is processed in your browser.
+                </p>
+              </CardContent>
+            </Card>
           )}
 
           <Card className="glass">
@@ -206,6 +261,29 @@ export default function ColorBlindnessPage() {
                     </div>
                   </div>
                 </div>
+              ) : mode === 'image' ? (
+                <div className="space-y-4">
+                  {!image && (
+                    <p className="text-center text-gray-500 py-16">Choose an image to compare.</p>
+                  )}
+                  <div className={`grid grid-cols-1 md:grid-cols-2 gap-6 ${image ? '' : 'hidden'}`}>
+                    <div className="space-y-3">
+                      <h3 className="text-lg font-semibold text-center">Normal Vision</h3>
+                      <canvas ref={originalCanvasRef} className="w-full h-auto rounded-lg shadow-lg" />
+                    </div>
+                    <div className="space-y-3">
+                      <h3 className="text-lg font-semibold text-center">
+                        {colorBlindnessTypes.find(t => t.id === selectedType)?.name}
+                      </h3>
+                      <canvas ref={simulatedCanvasRef} className="w-full h-auto rounded-lg shadow-lg" />
+                    </div>
+                  </div>
+                  {image && simulation && (
+                    <p className="text-sm text-gray-500 text-center">
+                      {image.name}: {simulation.width}×{simulation.height} ({(simulation.width * simulation.height / 1e6).toFixed(1)} MP) simulated in {simulation.ms.toFixed(0)} ms
+                    </p>
+                  )}
+                </div>
               ) : (
                 <div className="space-y-8">
                   {/* Original Palette */}
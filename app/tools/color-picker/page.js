@@ -21,8 +21,7 @@ export default function ColorPickerPage() {
 
   const handleColorChange = (newColor) => {
     setColor(newColor)
-    addToHistory(newColor)
-    setHistory(getColorHistory())
+    setHistory(addToHistory(newColor))
   }
 
   const handleSaveColor = () => {
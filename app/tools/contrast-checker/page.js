@@ -8,7 +8,8 @@ import {
   getContrastRatio,
   getWCAGRating,
   getContrastDescription,
-  getContrastScore
+  getContrastScore,
+  suggestAccessibleColor
 } from '@/lib/contrastUtils'
 import Link from 'next/link'
 
@@ -26,6 +27,11 @@ export default function ContrastCheckerPage() {
   // Large text is 18pt+ (24px) or 14pt+ (18.5px) bold
   const isLargeText = fontSize >= 24 || (fontSize >= 18.5 && fontWeight === 'bold')
 
+  // Nearest text color (same hue and saturation) that passes AA at the current text size
+  const targetRatio = isLargeText ? 3 : 4.5
+  const suggestedColor = contrastRatio < targetRatio ? suggestAccessibleColor(bgColor, fgColor, targetRatio) : null
+  const hasSuggestion = suggestedColor && suggestedColor.toLowerCase() !== fgColor.toLowerCase()
+
   const swapColors = () => {
     const temp = bgColor
     setBgColor(fgColor)
@@ -234,6 +240,25 @@ export default function ContrastCheckerPage() {
                   </div>
                   <div className="text-sm text-gray-500 mt-1">{score}/100</div>
                 </div>
+                {hasSuggestion && (
+                  <div className="flex items-center justify-between gap-4 p-4 rounded-lg bg-gray-100 dark:bg-gray-800 text-left">
+                    <div className="flex items-center gap-3">
+                      <div
+                        className="w-10 h-10 rounded-lg border border-gray-300 dark:border-gray-600"
+                        style={{ backgroundColor: suggestedColor }}
+                      />
+                      <div>
+                        <div className="font-semibold">Suggested text color: {suggestedColor}</div>
+                        <div className="text-sm text-gray-500">
+                          {getContrastRatio(bgColor, suggestedColor).toFixed(2)}:1, passes AA for {isLargeText ? 'large' : 'normal'} text
+                        </div>
+                      </div>
+                    </div>
+                    <Button onClick={() => setFgColor(suggestedColor)} variant="outline">
+                      Use
+                    </Button>
+                  </div>
+                )}
               </div>
             </CardContent>
           </Card>
@@ -1,9 +1,10 @@
 'use client'
 
-import { useState } from 'react'
+import { useState, useMemo } from 'react'
 import { Card, CardHeader, CardTitle, CardContent } from '@/components/ui/card'
 import { Button } from '@/components/ui/button'
-import { getRandomColor } from '@/lib/colorUtils'
+import { getRandomColor, hexToRgb } from '@/lib/colorUtils'
+import { gradientStops } from '@/lib/colorGradient'
 import Link from 'next/link'
 
 const directions = [
@@ -17,6 +18,12 @@ const directions = [
   { id: 'to top left', name: 'Diagonal ↖', angle: 315 }
 ]
 
+const interpolations = [
+  { id: 'oklab', name: 'OKLab', description: 'Perceptually even, no grey midpoints' },
+  { id: 'oklch', name: 'OKLCH', description: 'Keeps chroma, travels around the hue wheel' },
+  { id: 'srgb', name: 'sRGB', description: 'Browser default' }
+]
+
 export default function GradientGeneratorPage() {
   const [gradientType, setGradientType] = useState('linear')
   const [direction, setDirection] = useState('to bottom')
@@ -25,11 +32,22 @@ export default function GradientGeneratorPage() {
     { color: '#3B82F6', position: 0 },
     { color: '#8B5CF6', position: 100 }
   ])
+  const [interpolation, setInterpolation] = useState('oklab')
   const [copied, setCopied] = useState(false)
 
+  // Browsers blend stops in sRGB, so a perceptual gradient is baked into the fewest extra
+  // stops that reproduce it; skipped while a typed color is incomplete
+  const cssStops = useMemo(() => {
+    const sorted = [...colorStops].sort((a, b) => a.position - b.position)
+    if (interpolation === 'srgb' || !sorted.every(stop => hexToRgb(stop.color))) return sorted
+    return gradientStops(sorted.map(stop => stop.color), {
+      space: interpolation,
+      positions: sorted.map(stop => stop.position / 100)
+    })
+  }, [colorStops, interpolation])
+
   const generateCSS = () => {
-    const stops = colorStops
-      .sort((a, b) => a.position - b.position)
+    const stops = cssStops
       .map(stop => `${stop.color} ${stop.position}%`)
       .join(', ')
 
@@ -160,6 +178,28 @@ export default function GradientGeneratorPage() {
             </Card>
           )}
 
+          <Card className="glass">
+            <CardHeader>
+              <CardTitle>Interpolation</CardTitle>
+            </CardHeader>
+            <CardContent className="space-y-2">
+              {interpolations.map((option) => (
+                <button
+                  key={option.id}
+                  onClick={() => setInterpolation(option.id)}
+                  className={`w-full text-left px-4 py-2 rounded-lg transition-all ${
+                    interpolation === option.id
+                      ? 'bg-purple-500 text-white'
+                      : 'bg-gray-100 dark:bg-gray-800 hover:bg-gray-200 dark:hover:bg-gray-700'
+                  }`}
+                >
+                  <div className="font-medium">{option.name}</div>
+                  <div className="text-xs opacity-75">{option.description}</div>
+                </button>
+              ))}
+            </CardContent>
+          </Card>
+
           <Card className="glass">
             <CardHeader>
               <CardTitle>Color Stops</CardTitle>
@@ -262,6 +302,7 @@ export default function GradientGeneratorPage() {
                 <li>Add multiple color stops to create complex gradients</li>
                 <li>Drag the position sliders to adjust where colors appear</li>
                 <li>Use radial gradients for circular effects</li>
+                <li>OKLab and OKLCH blend like the eye does; the CSS gets a few extra stops so every browser renders it</li>
                 <li>Experiment with different angles for linear gradients</li>
                 <li>Copy the CSS and paste directly into your stylesheets</li>
               </ul>
@@ -13,7 +13,7 @@ import {
   getRandomColor,
   getTextColor
 } from '@/lib/colorUtils'
-import { savePalette, getSavedPalettes } from '@/lib/storage'
+import { savePalette, getSavedPalettes, getStorageUsage, getArchivedPalettes, restorePalette } from '@/lib/storage'
 import Link from 'next/link'
 
 const harmonyTypes = [
@@ -32,10 +32,16 @@ export default function PaletteGeneratorPage() {
   const [locked, setLocked] = useState([])
   const [copied, setCopied] = useState(false)
   const [savedPalettes, setSavedPalettes] = useState([])
+  const [storageUsage, setStorageUsage] = useState(null)
+  const [archivedPalettes, setArchivedPalettes] = useState(null) // loaded on request
 
   useEffect(() => {
-    generatePalette()
     setSavedPalettes(getSavedPalettes())
+    getStorageUsage().then(setStorageUsage)
+  }, [])
+
+  useEffect(() => {
+    generatePalette()
   }, [baseColor, harmonyType])
 
   const generatePalette = () => {
@@ -83,9 +89,21 @@ export default function PaletteGeneratorPage() {
     if (name) {
       savePalette(palette, name)
       setSavedPalettes(getSavedPalettes())
+      getStorageUsage().then(setStorageUsage)
     }
   }
 
+  const showArchivedPalettes = () => {
+    getArchivedPalettes().then(setArchivedPalettes)
+  }
+
+  const handleRestorePalette = async (archived) => {
+    await restorePalette(archived)
+    setSavedPalettes(getSavedPalettes())
+    setArchivedPalettes(await getArchivedPalettes())
+    getStorageUsage().then(setStorageUsage)
+  }
+
   const copyAllColors = () => {
     const colorsText = palette.join(', ')
     navigator.clipboard.writeText(colorsText)
@@ -268,6 +286,11 @@ export default function PaletteGeneratorPage() {
             <Card className="glass">
               <CardHeader>
                 <CardTitle>Saved Palettes</CardTitle>
+                {storageUsage && (
+                  <p className="text-sm text-gray-500">
+                    {(storageUsage.localStorage / 1024).toFixed(1)} KB of {storageUsage.localStorageQuota / 1024 / 1024} MB local storage used
+                  </p>
+                )}
               </CardHeader>
               <CardContent>
                 <div className="space-y-4">
@@ -299,6 +322,49 @@ export default function PaletteGeneratorPage() {
                     </div>
                   ))}
                 </div>
+
+                {/* Palettes past the 50 most recent, kept in IndexedDB */}
+                <div className="mt-6 pt-4 border-t border-gray-200 dark:border-gray-700">
+                  {archivedPalettes === null ? (
+                    <button
+                      onClick={showArchivedPalettes}
+                      className="text-sm text-purple-500 hover:text-purple-600"
+                    >
+                      Show archived palettes
+                    </button>
+                  ) : archivedPalettes.length === 0 ? (
+                    <p className="text-sm text-gray-500">
+                      No archived palettes. Older palettes move here once you have more than 50.
+                    </p>
+                  ) : (
+                    <div className="space-y-3 max-h-96 overflow-y-auto">
+                      <div className="text-sm font-medium">Archived ({archivedPalettes.length})</div>
+                      {archivedPalettes.map((archived) => (
+                        <div key={archived.id} className="space-y-1">
+                          <div className="flex justify-between items-center">
+                            <span className="text-sm">{archived.name}</span>
+                            <button
+                              onClick={() => handleRestorePalette(archived)}
+                              className="text-sm text-purple-500 hover:text-purple-600"
+                            >
+                              Restore
+                            </button>
+                          </div>
+                          <div className="flex space-x-1">
+                            {archived.colors.map((color, idx) => (
+                              <div
+                                key={idx}
+                                className="flex-1 h-6 rounded"
+                                style={{ backgroundColor: color }}
+                                title={color}
+                              />
+                            ))}
+                          </div>
+                        </div>
+                      ))}
+                    </div>
+                  )}
+                </div>
               </CardContent>
             </Card>
           )}
@@ -1,26 +1,41 @@
 'use client'
 
-import { useState } from 'react'
+import { useEffect, useMemo, useState } from 'react'
 import { Card, CardHeader, CardTitle, CardContent } from '@/components/ui/card'
 import { Button } from '@/components/ui/button'
 import {
   generateTints,
   generateShades,
-  generateShadeScale,
   getRandomColor,
   getTextColor
 } from '@/lib/colorUtils'
+import { getShadeScale, loadShadeScales, shadeScale } from '@/lib/shadeScales'
 import Link from 'next/link'
 
 export default function ShadeGeneratorPage() {
   const [baseColor, setBaseColor] = useState('#3B82F6')
   const [steps, setSteps] = useState(5)
   const [mode, setMode] = useState('both') // both, tints, shades, scale
+  const [ramp, setRamp] = useState('hsl') // hsl, oklch
   const [copied, setCopied] = useState('')
+  const [precomputed, setPrecomputed] = useState(null)
 
-  const tints = generateTints(baseColor, steps)
-  const shades = generateShades(baseColor, steps)
-  const scale = generateShadeScale(baseColor)
+  useEffect(() => {
+    loadShadeScales().then(setPrecomputed).catch(() => {})
+  }, [])
+
+  // Named and brand colors come from the precomputed asset; anything else is computed
+  // once per change of color, step count or ramp rather than on every render
+  const ramps = useMemo(() => getShadeScale(precomputed, baseColor, ramp), [precomputed, baseColor, ramp])
+  const tints = useMemo(
+    () => (ramps && steps === precomputed.tintSteps ? ramps.tints : generateTints(baseColor, steps)),
+    [ramps, precomputed, baseColor, steps]
+  )
+  const shades = useMemo(
+    () => (ramps && steps === precomputed.tintSteps ? ramps.shades : generateShades(baseColor, steps)),
+    [ramps, precomputed, baseColor, steps]
+  )
+  const scale = useMemo(() => (ramps ? ramps.scale : shadeScale(baseColor, ramp)), [ramps, baseColor, ramp])
 
   const copyColor = (color) => {
     navigator.clipboard.writeText(color)
@@ -59,7 +74,7 @@ export default function ShadeGeneratorPage() {
       colors = scale.map(s => s.color)
     } else {
       if (mode === 'both' || mode === 'tints') {
-        colors = [...tints.reverse()]
+        colors = [...tints].reverse()
       }
       colors.push(baseColor)
       if (mode === 'both' || mode === 'shades') {
@@ -154,6 +169,32 @@ export default function ShadeGeneratorPage() {
             </CardContent>
           </Card>
 
+          {mode === 'scale' && (
+            <Card className="glass">
+              <CardHeader>
+                <CardTitle>Ramp</CardTitle>
+              </CardHeader>
+              <CardContent className="space-y-2">
+                {[
+                  { id: 'hsl', name: 'HSL Lightness' },
+                  { id: 'oklch', name: 'Perceptual (OKLCH)' }
+                ].map((r) => (
+                  <button
+                    key={r.id}
+                    onClick={() => setRamp(r.id)}
+                    className={`w-full px-4 py-3 rounded-lg font-medium transition-all ${
+                      ramp === r.id
+                        ? 'bg-purple-500 text-white'
+                        : 'bg-gray-100 dark:bg-gray-800 hover:bg-gray-200 dark:hover:bg-gray-700'
+                    }`}
+                  >
+                    {r.name}
+                  </button>
+                ))}
+              </CardContent>
+            </Card>
+          )}
+
           {mode !== 'scale' && (
             <Card className="glass">
               <CardHeader>
@@ -342,6 +383,7 @@ export default function ShadeGeneratorPage() {
                 <li><strong>Tints:</strong> Add white to create lighter variations</li>
                 <li><strong>Shades:</strong> Add black to create darker variations</li>
                 <li><strong>Tailwind Scale:</strong> Generate a complete color scale like Tailwind CSS</li>
+                <li><strong>Perceptual ramp:</strong> Steps evenly spaced in OKLCH lightness, with your color at 500</li>
                 <li>Click any color to copy its hex code</li>
                 <li>Use the export buttons to copy all colors as CSS or JSON</li>
                 <li>Perfect for creating consistent color systems</li>
@@ -0,0 +1,469 @@
+# Batch subcommands for colors_update.py: stream color lists through the component algorithms
+#
+# Colors are read from stdin or files (one per line, CSV or NDJSON), parsed and processed
+# in fixed-size chunks with the vectorized color_*.py mirrors, and each chunk's results are
+# written out (NDJSON, CSV or, with pyarrow, Parquet row groups) before the next chunk is
+# read. Memory is bounded by the chunk size, not the input size, so tens of millions of
+# colors stream through in a few hundred MB.
+
+import csv
+import io
+import json
+import os
+import re
+import sys
+from itertools import islice
+
+import numpy as np
+
+from color_blindness import color_blindness_types, simulate
+from color_contrast import WCAG_LEVELS, relative_luminance, wcag_levels
+from color_core import format_hex_bulk, rgb_to_hsl_arrays
+from color_distance import METRICS, name_colors, named_color_table
+from color_harmony import HARMONIES, harmony_palettes
+from color_shard import map_sharded
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+# Colors per chunk; at 64k a chunk's temporaries stay in the tens of MB for every command
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+# Field tried for the color in CSV and NDJSON records when --column is not given
+COLOR_FIELDS = ('hex', 'color')
+
+# Hex digits of an input color after the optional '#'; int(x, 16) alone would also take
+# '0x..', signs, '_' separators and non-ASCII digits
+HEX_DIGITS_RE = re.compile(r'[0-9a-fA-F]{3}|[0-9a-fA-F]{6}')
+
+INPUT_FORMATS = ('auto', 'lines', 'csv', 'ndjson')
+OUTPUT_FORMATS = ('auto', 'ndjson', 'csv', 'parquet')
+
+# Fixed decimals for float columns, so output is stable and diffable between runs
+FLOAT_DIGITS = 6
+
+
+def detect_format(path, default):
+    # Format from the file extension; stdin and unknown extensions use the default
+    extension = os.path.splitext(path or '')[1].lower()
+    return {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson', '.parquet': 'parquet'}.get(extension, default)
+
+
+def _color_field(fields, column):
+    if column:
+        return column
+    for field in COLOR_FIELDS:
+        if field in fields:
+            return field
+    return fields[0]
+
+
+def iter_records(stream, input_format, column=None, fieldnames=None):
+    # (color string, record dict or None) per input row; CSV blocks cut from the middle of
+    # a file have no header row, so their fieldnames are passed in
+    if input_format == 'lines':
+        for line in stream:
+            line = line.strip()
+            if line:
+                yield line, None
+    elif input_format == 'csv':
+        reader = csv.DictReader(stream, fieldnames=fieldnames)
+        field = _color_field(reader.fieldnames or [''], column)
+        for record in reader:
+            yield (record.get(field) or '').strip(), record
+    elif input_format == 'ndjson':
+        field = column
+        for line in stream:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if field is None:
+                field = _color_field(list(record), None)
+            yield str(record.get(field) or '').strip(), record
+    else:
+        raise ValueError(f"Unknown input format: {input_format}")
+
+
+def iter_chunks(records, chunk_size):
+    # Lists of at most chunk_size records, read lazily
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def parse_colors(strings):
+    # 3- or 6-digit hex with or without '#' -> ((N, 3) uint8, (N,) valid mask); invalid rows are black
+    keys = np.full(len(strings), -1, dtype=np.int64)
+    for i, text in enumerate(strings):
+        digits = text[1:] if text.startswith('#') else text
+        if not HEX_DIGITS_RE.fullmatch(digits):
+            continue
+        if len(digits) == 3:
+            digits = digits[0] * 2 + digits[1] * 2 + digits[2] * 2
+        keys[i] = int(digits, 16)
+    valid = keys >= 0
+    keys = np.where(valid, keys, 0)
+    rgb = np.stack([keys >> 16, (keys >> 8) & 0xFF, keys & 0xFF], axis=1).astype(np.uint8)
+    return rgb, valid
+
+
+def _js_round(x):
+    # Math.round for arrays (halves round up)
+    floor = np.floor(x)
+    return (floor + (x - floor >= 0.5)).astype(np.int64)
+
+
+def _floats(values):
+    return np.round(values, FLOAT_DIGITS).tolist()
+
+
+def _contrast_columns(luminance, background, suffix):
+    # ratio_<suffix> and level_<suffix> against one background color
+    bg_luminance = relative_luminance(background)[0]
+    ratios = (np.maximum(luminance, bg_luminance) + 0.05) / (np.minimum(luminance, bg_luminance) + 0.05)
+    return {
+        f'contrast_{suffix}': _floats(ratios),
+        f'level_{suffix}': [WCAG_LEVELS[code] for code in wcag_levels(ratios).tolist()],
+    }
+
+
+def nearest_rgb_names(rgb):
+    # Closest named color by RGB distance, ties to the earlier table entry: the same answer
+    # as the k-d tree behind ColorNamer (lib/colorNameIndex.js)
+    # |x|² - 2x·t + |t|² as one float32 matrix product: every term is an integer below 2²⁴,
+    # so the distances are exact and the (N, M) temporary is 4 bytes per pair
+    names, table_rgb, _ = named_color_table()
+    x = rgb.astype(np.float32)
+    t = table_rgb.astype(np.float32)
+    distance_sq = (x * x).sum(axis=1)[:, None] - 2 * (x @ t.T) + (t * t).sum(axis=1)[None, :]
+    best = distance_sq.argmin(axis=1)
+    return [names[i] for i in best.tolist()], np.sqrt(distance_sq[np.arange(len(rgb)), best].astype(np.float64))
+
+
+def analyze(rgb, args):
+    # What ColorInfo, ColorAccessibility and ColorNamer show for each color
+    h, s, l = rgb_to_hsl_arrays(rgb)
+    luminance = relative_luminance(rgb)
+    names, _ = nearest_rgb_names(rgb)
+    columns = {
+        'hex': [c.upper() for c in format_hex_bulk(rgb)],
+        'r': rgb[:, 0].tolist(),
+        'g': rgb[:, 1].tolist(),
+        'b': rgb[:, 2].tolist(),
+        'h': _js_round(h).tolist(),
+        's': _js_round(s).tolist(),
+        'l': _js_round(l).tolist(),
+        'luminance': _floats(luminance),
+    }
+    columns.update(_contrast_columns(luminance, np.array([[255, 255, 255]], dtype=np.uint8), 'white'))
+    columns.update(_contrast_columns(luminance, np.array([[0, 0, 0]], dtype=np.uint8), 'black'))
+    columns['name'] = names
+    return columns
+
+
+def palette(rgb, args):
+    # generatePalette for the chosen harmonies; each column is [base, ...variations], with
+    # channels clamped to 0-255 where the JS overflows (monochromatic on light colors)
+    harmonies = HARMONIES if args.harmony == 'all' else [args.harmony]
+    palettes = harmony_palettes(rgb, harmonies)
+    columns = {'hex': [c.upper() for c in format_hex_bulk(rgb)]}
+    for harmony in harmonies:
+        k = palettes[harmony].shape[1]
+        hexes = format_hex_bulk(palettes[harmony])
+        columns[harmony] = [hexes[i:i + k] for i in range(0, len(hexes), k)]
+    return columns
+
+
+def contrast(rgb, args):
+    # Contrast ratio and WCAG level against each --against color
+    luminance = relative_luminance(rgb)
+    columns = {'hex': [c.upper() for c in format_hex_bulk(rgb)]}
+    for background in args.against:
+        background_rgb, valid = parse_colors([background])
+        if not valid[0]:
+            raise ValueError(f"Invalid --against color: {background}")
+        suffix = format_hex_bulk(background_rgb)[0][1:]
+        columns.update(_contrast_columns(luminance, background_rgb, suffix))
+    return columns
+
+
+def name(rgb, args):
+    # Nearest named color: by RGB distance like ColorNamer, or by a ΔE metric
+    if args.metric == 'rgb':
+        names, distances = nearest_rgb_names(rgb)
+    else:
+        names, distances = name_colors(rgb, args.metric)
+    return {'hex': [c.upper() for c in format_hex_bulk(rgb)], 'name': names, 'distance': _floats(distances)}
+
+
+def simulate_types(rgb, args):
+    # Simulated hex per color blindness type, as the ColorBlindnessSimulator shows them
+    types = color_blindness_types()
+    for type_id in args.type or []:
+        if type_id not in types:
+            raise ValueError(f"Unknown color blindness type: {type_id} (one of {', '.join(types)})")
+    columns = {'hex': [c.upper() for c in format_hex_bulk(rgb)]}
+    for type_id in args.type or [t for t in types if t != 'normal']:
+        columns[type_id] = format_hex_bulk(simulate(rgb, type_id))
+    return columns
+
+
+COMMANDS = {
+    'analyze': (analyze, "hex, RGB, HSL, luminance, contrast against white and black, and nearest name"),
+    'palette': (palette, "harmony palettes from generatePalette"),
+    'contrast': (contrast, "contrast ratios and WCAG levels against given colors"),
+    'name': (name, "nearest named color"),
+    'simulate': (simulate_types, "color blindness simulations"),
+}
+
+
+def process_chunk(command, chunk, args):
+    # Columns for one chunk: passthrough fields, input, the command's columns and error
+    strings = [color for color, _ in chunk]
+    rgb, valid = parse_colors(strings)
+    columns = {field: [record.get(field) if record else None for _, record in chunk] for field in args.keep}
+    columns['input'] = strings
+
+    # Invalid rows get None in every result column; a chunk without valid colors still
+    # runs the command (on no rows) so every chunk has the same columns
+    results = command(rgb[valid], args)
+    positions = np.flatnonzero(valid).tolist()
+    for field, values in results.items():
+        column = [None] * len(chunk)
+        for position, value in zip(positions, values):
+            column[position] = value
+        columns[field] = column
+    columns['error'] = [None if ok else 'invalid color' for ok in valid.tolist()]
+    return columns
+
+
+def encode_ndjson(columns):
+    # One JSON object per row
+    fields = list(columns)
+    encode = json.JSONEncoder(separators=(',', ':'), check_circular=False).encode
+    return ''.join(encode(dict(zip(fields, row))) + '\n' for row in zip(*columns.values()))
+
+
+def encode_csv(columns, header=False):
+    # CSV rows, list values joined with spaces, with the header row first if asked for
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator='\n')
+    if header:
+        writer.writerow(list(columns))
+    cells = [[' '.join(v) if isinstance(v, list) else ('' if v is None else v) for v in values]
+             for values in columns.values()]
+    writer.writerows(zip(*cells))
+    return out.getvalue()
+
+
+class TextWriter:
+    # NDJSON or CSV; chunks arrive as columns (in-process) or already encoded (from workers)
+    def __init__(self, stream, output_format):
+        self.stream = stream
+        self.output_format = output_format
+        self.header = True
+
+    def write(self, columns):
+        if self.output_format == 'csv':
+            self.write_encoded(encode_csv(columns, self.header))
+        else:
+            self.write_encoded(encode_ndjson(columns))
+
+    def write_encoded(self, text):
+        self.stream.write(text)
+        self.header = False
+
+    def close(self):
+        self.stream.flush()
+
+
+class ParquetWriter:
+    # One row group per chunk; the schema is taken from the first chunk
+    def __init__(self, path):
+        if pa is None:
+            raise RuntimeError("Parquet output requires pyarrow")
+        self.path = path
+        self.writer = None
+
+    def write(self, columns):
+        if self.writer is None:
+            table = pa.table(columns)
+            # Columns that are all None in the first chunk (error, passthrough fields) have
+            # no type yet; they hold strings
+            schema = pa.schema([pa.field(f.name, pa.string()) if pa.types.is_null(f.type) else f
+                                for f in table.schema])
+            table = pa.table(columns, schema=schema)
+            self.writer = pq.ParquetWriter(self.path, schema)
+        else:
+            table = pa.table(columns, schema=self.writer.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def iter_blocks(stream, chunk_size, quoted=False, initial=b'', read_size=1 << 20):
+    # Raw byte blocks of about chunk_size lines from a binary stream (after `initial`), each
+    # ending after a newline. With quoted=True (CSV) a block never ends inside a quoted
+    # field: the cut moves to a later newline until the block has an even number of '"'.
+    buffer = initial
+    eof = False
+    while True:
+        while not eof and buffer.count(b'\n') < chunk_size:
+            data = stream.read(read_size)
+            eof = not data
+            buffer += data
+        if not buffer:
+            return
+
+        newlines = np.flatnonzero(np.frombuffer(buffer, dtype=np.uint8) == 0x0A)
+        cut = None
+        for position in newlines[chunk_size - 1:]:
+            if not quoted or buffer.count(b'"', 0, int(position) + 1) % 2 == 0:
+                cut = int(position) + 1
+                break
+        if cut is None:
+            if not eof:
+                # Every newline so far is inside a quoted field; read on
+                data = stream.read(read_size)
+                eof = not data
+                buffer += data
+                continue
+            cut = len(buffer)
+        yield buffer[:cut]
+        buffer = buffer[cut:]
+
+
+def process_block(columns, args, input_format, column, fieldnames, output_format, header):
+    # Worker side of a sharded run: parse a raw input block from shared memory, process it
+    # and encode the output there too, so only (rows, output) is pickled back
+    text = columns['block'].tobytes().decode('utf-8')
+    chunk = list(iter_records(io.StringIO(text, newline=''), input_format, column, fieldnames))
+    result = process_chunk(COMMANDS[args.command][0], chunk, args)
+    if output_format == 'parquet':
+        return len(chunk), result
+    return len(chunk), encode_csv(result, header) if output_format == 'csv' else encode_ndjson(result)
+
+
+def shard_tasks(stream, path, args, output_format, header):
+    # (columns, args) per block of one input for map_sharded. The CSV header and the
+    # NDJSON color field are read here, once, and passed to every block.
+    input_format = args.input_format
+    if input_format == 'auto':
+        input_format = detect_format(path, 'lines')
+    column, fieldnames, first = args.column, None, b''
+    if input_format == 'csv':
+        fieldnames = next(csv.reader([stream.readline().decode('utf-8')]), [])
+        column = _color_field(fieldnames or [''], column)
+    elif input_format == 'ndjson' and column is None:
+        while not first.strip():
+            first = stream.readline()
+            if not first:
+                break
+        if first.strip():
+            column = _color_field(list(json.loads(first)), None)
+
+    for block in iter_blocks(stream, args.chunk_size, quoted=input_format == 'csv', initial=first):
+        yield {'block': np.frombuffer(block, dtype=np.uint8)}, (
+            args, input_format, column, fieldnames, output_format, header)
+        header = False
+
+
+def open_inputs(paths, binary=False):
+    # (stream, path) per input; '-' or no paths reads stdin
+    for path in paths or ['-']:
+        if path == '-':
+            yield (sys.stdin.buffer if binary else io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8', newline='')), None
+        elif binary:
+            with open(path, 'rb') as f:
+                yield f, path
+        else:
+            with open(path, encoding='utf-8', newline='') as f:
+                yield f, path
+
+
+def add_batch_commands(subparsers):
+    for command, (_, help_text) in COMMANDS.items():
+        sub = subparsers.add_parser(command, help=help_text, description=f"Stream colors and output {help_text}.")
+        sub.add_argument('inputs', nargs='*', metavar='FILE', help="input files (default: stdin, also '-')")
+        sub.add_argument('--input-format', choices=INPUT_FORMATS, default='auto',
+                         help="default: from the file extension, one color per line for stdin")
+        sub.add_argument('--column', help=f"CSV/NDJSON field holding the color (default: {' or '.join(COLOR_FIELDS)})")
+        sub.add_argument('--keep', action='append', default=[], metavar='FIELD',
+                         help="copy an input field to the output, e.g. a customer id (repeatable)")
+        sub.add_argument('-o', '--output', help="output file (default: stdout)")
+        sub.add_argument('--format', choices=OUTPUT_FORMATS, default='auto',
+                         help="default: from the output extension, NDJSON for stdout")
+        sub.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="colors per chunk")
+        sub.add_argument('--workers', dest='shard_workers', type=int, default=None,
+                         help="worker processes; chunks go through shared memory (default: all cores, 1 runs in-process)")
+        if command == 'palette':
+            sub.add_argument('--harmony', choices=HARMONIES + ['all'], default='all')
+        elif command == 'contrast':
+            sub.add_argument('--against', action='append', metavar='HEX',
+                             help="background color (repeatable, default: #FFFFFF and #000000)")
+        elif command == 'name':
+            sub.add_argument('--metric', choices=['rgb'] + list(METRICS), default='rgb',
+                             help="rgb matches ColorNamer; ΔE metrics name perceptually")
+        elif command == 'simulate':
+            sub.add_argument('--type', action='append', metavar='TYPE',
+                             help="colorBlindnessTypes id, e.g. deuteranopia (repeatable, default: all)")
+        sub.set_defaults(run=run_batch_command, unit='colors')
+
+
+def run_batch_command(args):
+    # Returns the number of rows written
+    command = COMMANDS[args.command][0]
+    if args.command == 'contrast' and not args.against:
+        args.against = ['#FFFFFF', '#000000']
+
+    output_format = args.format
+    if output_format == 'auto':
+        output_format = detect_format(args.output, 'ndjson')
+    if output_format == 'parquet':
+        if not args.output:
+            raise ValueError("Parquet output needs --output")
+        writer = ParquetWriter(args.output)
+        out = None
+    else:
+        out = open(args.output, 'w', encoding='utf-8', newline='') if args.output else sys.stdout
+        writer = TextWriter(out, output_format)
+
+    rows = 0
+    workers = args.shard_workers or os.cpu_count() or 1
+    try:
+        if workers > 1:
+            def tasks():
+                # Blocks of every input in order; only the first block of the output gets a CSV header
+                header = True
+                for stream, path in open_inputs(args.inputs, binary=True):
+                    for task in shard_tasks(stream, path, args, output_format, header):
+                        header = False
+                        yield task
+
+            for count, result in map_sharded(process_block, tasks(), workers):
+                rows += count
+                if output_format == 'parquet':
+                    writer.write(result)
+                else:
+                    writer.write_encoded(result)
+        else:
+            for stream, path in open_inputs(args.inputs):
+                input_format = args.input_format
+                if input_format == 'auto':
+                    input_format = detect_format(path, 'lines')
+                for chunk in iter_chunks(iter_records(stream, input_format, args.column), args.chunk_size):
+                    writer.write(process_chunk(command, chunk, args))
+                    rows += len(chunk)
+    finally:
+        writer.close()
+        if out is not None and out is not sys.stdout:
+            out.close()
+    return rows
@@ -0,0 +1,520 @@
+# Benchmarks for the color algorithms the generated components run, with regression gates
+#
+# JS cases run the shipped code under Node: lib/*.js copied to a scratch directory as ES
+# modules, plus functions cut out of the component templates in colors_update.py (so a
+# regenerated template is what gets measured). Python cases run the color_*.py mirrors.
+# Every case works through fixed, seeded corpora (random colors and synthetic 4K/12MP/24MP
+# RGBA images) and records ops/sec, p50/p99 batch latency and peak memory. Results are
+# compared with a JSON baseline; a case fails when its throughput drops or its peak memory
+# grows by more than the threshold.
+#
+# Peak memory is the largest RSS of the Node process sampled between batches for JS cases
+# (corpus included) and the tracemalloc peak of one batch for Python cases, so only
+# compare a case with itself.
+
+import argparse
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from color_blindness import simulate, simulate_palette
+from color_contrast import relative_luminance
+from color_core import format_hex_bulk, hex_to_rgb_bulk, hsl_arrays_to_rgb, rgb_to_hsl_arrays
+from color_data import load_named_colors
+from color_extract import ColorHistogram
+from color_index import NamedColorIndex
+from color_wheel import encode_png, render_color_wheel
+
+BASELINE_FILE = 'color_bench.json'
+BASELINE_VERSION = 1
+
+SEED = 1234
+
+# Random colors per run, processed in batches; one batch is one latency sample
+COLOR_CORPUS_SIZE = 1_000_000
+QUICK_COLOR_CORPUS_SIZE = 100_000
+COLOR_BATCH = 10_000
+
+# The pure-Python k-d tree walk is ~10 µs per color, so it only sees a prefix of the corpus
+NEAREST_NAME_LIMIT = 100_000
+
+IMAGE_SIZES = {'4k': (3840, 2160), '12mp': (4000, 3000), '24mp': (6000, 4000)}
+QUICK_IMAGE_SIZES = ('4k',)
+IMAGE_REPEATS = 5
+QUICK_IMAGE_REPEATS = 3
+
+# Allowed relative slowdown or memory growth before a case counts as a regression
+DEFAULT_THRESHOLD = 0.25
+
+# Memory growth below this is noise (allocator and GC timing), whatever the ratio
+MEMORY_SLACK_KB = 1024
+
+SIMULATED_TYPE = 'deuteranopia'
+
+# Functions cut out of the component templates: (template path, function name)
+TEMPLATE_FUNCTIONS = [
+    ('components/ColorWheel.js', 'hslToHex'),
+]
+
+# Runs one JS case and prints its timings as JSON. argv: case, data directory, then the
+# batch size (color cases) or image name and repeat count (image cases).
+JS_RUNNER = '''
+import fs from 'fs';
+import { performance } from 'perf_hooks';
+
+const [caseName, dataDir, arg1, arg2] = process.argv.slice(2);
+const lib = (name) => import(`./lib/${name}.mjs`);
+let sink = 0;
+
+const readBytes = (file) => {
+  const buf = fs.readFileSync(`${dataDir}/${file}`);
+  return new Uint8Array(buf.buffer, buf.byteOffset, buf.byteLength);
+};
+const colors = () => {
+  const bytes = readBytes('colors.u32');
+  return new Uint32Array(bytes.buffer, bytes.byteOffset, bytes.byteLength / 4);
+};
+const hexes = (values) => Array.from(values, c => '#' + (c + 0x1000000).toString(16).slice(1));
+const hslInputs = async (values) => {
+  const { rgbToHsl } = await lib('colorUtils');
+  return Array.from(values, c => rgbToHsl(c >> 16, (c >> 8) & 0xff, c & 0xff));
+};
+
+const COLOR_CASES = {
+  'js.hexToHsl': async (values) => {
+    const { hexToHsl } = await lib('colorUtils');
+    const input = hexes(values);
+    return (i) => { sink += hexToHsl(input[i]).h; };
+  },
+  'js.hslToHex': async (values) => {
+    const { hslToHex } = await lib('colorUtils');
+    const input = await hslInputs(values);
+    return (i) => { sink += hslToHex(input[i].h, input[i].s, input[i].l).length; };
+  },
+  'js.ColorWheel.hslToHex': async (values) => {
+    const { hslToHex } = await import('./templates/ColorWheel.mjs');
+    const input = await hslInputs(values);
+    return (i) => { sink += hslToHex(input[i]).length; };
+  },
+  'js.getContrastRatio': async (values) => {
+    const { getContrastRatio } = await lib('contrastUtils');
+    const input = hexes(values);
+    return (i) => { sink += getContrastRatio(input[i], input[(i + 1) % input.length]); };
+  },
+  'js.simulateColorBlindness': async (values) => {
+    const { simulateColorBlindness } = await lib('colorBlindness');
+    const input = hexes(values);
+    return (i) => { sink += simulateColorBlindness(input[i], 'SIMULATED_TYPE').length; };
+  },
+  'js.findNearestColors': async (values) => {
+    const { decodeColorNameIndex, findNearestColors } = await lib('colorNameIndex');
+    const index = decodeColorNameIndex(JSON.parse(fs.readFileSync(`${dataDir}/color-name-index.json`, 'utf8')));
+    return (i) => {
+      const c = values[i];
+      sink += findNearestColors(index, c >> 16, (c >> 8) & 0xff, c & 0xff)[0].name.length;
+    };
+  },
+  'js.getColorModel': async (values) => {
+    const { getColorModel } = await lib('colorModel');
+    const input = hexes(values);
+    return (i) => { sink += getColorModel(input[i]).luminance; };
+  }
+};
+
+const IMAGE_CASES = {
+  'js.extract': async () => {
+    const { addPixels, createHistogram, medianCut } = await lib('colorQuantize');
+    return (data) => { sink += medianCut(addPixels(createHistogram(), data), 5).length; };
+  },
+  'js.simulatePixels': async () => {
+    const { simulatePixels } = await lib('colorBlindness');
+    return (data) => { sink += simulatePixels(data, 'SIMULATED_TYPE')[0]; };
+  }
+};
+
+// ru_maxrss survives exec, so it would report the Python parent's peak; RSS is sampled
+// after setup and after every batch instead
+let peakRss = 0;
+const sampleRss = () => {
+  peakRss = Math.max(peakRss, process.memoryUsage.rss());
+};
+
+const timeIt = (fn) => {
+  const start = performance.now();
+  fn();
+  const elapsed = performance.now() - start;
+  sampleRss();
+  return elapsed;
+};
+
+const main = async () => {
+  const times = [];
+  let items;
+  const imageCase = Object.keys(IMAGE_CASES).find(name => caseName.startsWith(name + '.'));
+
+  if (imageCase) {
+    const run = await IMAGE_CASES[imageCase]();
+    const bytes = readBytes(`${arg1}.rgba`);
+    const data = new Uint8ClampedArray(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+    sampleRss();
+    run(data); // warm-up
+    for (let r = 0; r < Number(arg2); r++) times.push(timeIt(() => run(data)));
+    items = times.length;
+  } else {
+    const values = colors();
+    const batch = Number(arg1);
+    const run = await COLOR_CASES[caseName](values);
+    sampleRss();
+    for (let i = 0; i < Math.min(batch, values.length); i++) run(i); // warm-up
+    for (let start = 0; start < values.length; start += batch) {
+      const end = Math.min(start + batch, values.length);
+      times.push(timeIt(() => { for (let i = start; i < end; i++) run(i); }));
+    }
+    items = values.length;
+  }
+
+  console.log(JSON.stringify({ times, items, peakKb: Math.round(peakRss / 1024), sink: Number.isFinite(sink) }));
+};
+
+main().catch(error => {
+  console.error(error);
+  process.exit(1);
+});
+'''.replace('SIMULATED_TYPE', SIMULATED_TYPE)
+
+JS_COLOR_CASES = ['js.hexToHsl', 'js.hslToHex', 'js.ColorWheel.hslToHex', 'js.getContrastRatio',
+                  'js.simulateColorBlindness', 'js.findNearestColors', 'js.getColorModel']
+JS_IMAGE_CASES = ['js.extract', 'js.simulatePixels']
+
+
+def color_corpus(size):
+    # Seeded 24-bit colors, the same on every run and machine
+    return np.random.default_rng(SEED).integers(0, 1 << 24, size, dtype=np.uint32)
+
+
+def synthetic_image(width, height):
+    # RGBA photo stand-in: smooth gradients, blocky hue regions and low-bit noise, so the
+    # histogram has thousands of occupied bins without being uniform
+    rng = np.random.default_rng(SEED)
+    y, x = np.ogrid[0:height, 0:width]
+    image = np.empty((height, width, 4), dtype=np.uint8)
+    image[..., 0] = x * 255 // (width - 1)
+    image[..., 1] = y * 255 // (height - 1)
+    image[..., 2] = (x // 97 + y // 89) * 37 % 256
+    image[..., :3] ^= rng.integers(0, 16, (height, width, 3), dtype=np.uint8)
+    image[..., 3] = 255
+    return image
+
+
+def _colors_rgb(colors):
+    return np.stack([colors >> 16, (colors >> 8) & 0xFF, colors & 0xFF], axis=1).astype(np.uint8)
+
+
+def _hex_strings(colors):
+    return ['#%06x' % c for c in colors.tolist()]
+
+
+def _python_color_cases(colors):
+    # name -> (run(start, end), number of corpus colors it covers)
+    rgb = _colors_rgb(colors)
+    hexes = _hex_strings(colors)
+    h, s, l = rgb_to_hsl_arrays(rgb)
+    name_index = NamedColorIndex.build(load_named_colors())
+    next_rgb = np.roll(rgb, -1, axis=0)
+
+    def contrast(start, end):
+        lum1 = relative_luminance(rgb[start:end])
+        lum2 = relative_luminance(next_rgb[start:end])
+        return (np.maximum(lum1, lum2) + 0.05) / (np.minimum(lum1, lum2) + 0.05)
+
+    def nearest_name(start, end):
+        return [name_index.query(c)[0][1] for c in rgb[start:end].tolist()]
+
+    return {
+        'py.hex_to_hsl': (lambda start, end: rgb_to_hsl_arrays(hex_to_rgb_bulk(hexes[start:end], as_numpy=True)), len(colors)),
+        'py.hsl_to_hex': (lambda start, end: format_hex_bulk(hsl_arrays_to_rgb(h[start:end], s[start:end], l[start:end])), len(colors)),
+        'py.contrast_ratio': (contrast, len(colors)),
+        'py.simulate_palette': (lambda start, end: simulate_palette(hexes[start:end], SIMULATED_TYPE), len(colors)),
+        'py.nearest_name': (nearest_name, min(len(colors), NEAREST_NAME_LIMIT)),
+    }
+
+
+def _extract(image):
+    histogram = ColorHistogram()
+    histogram.add_pixels(image.reshape(-1, 4))
+    return histogram.dominant_colors(5)
+
+
+PYTHON_IMAGE_CASES = {
+    'py.extract': _extract,
+    'py.simulate': lambda image: simulate(image, SIMULATED_TYPE),
+}
+
+
+def summarize(times_ms, items, peak_kb):
+    # Throughput over all batches (items processed in total) and latency percentiles of one batch
+    times = np.asarray(times_ms, dtype=np.float64)
+    return {
+        'ops_per_sec': round(items / (times.sum() / 1000), 1),
+        'p50_ms': round(float(np.percentile(times, 50)), 4),
+        'p99_ms': round(float(np.percentile(times, 99)), 4),
+        'peak_kb': int(peak_kb),
+        'batches': len(times),
+    }
+
+
+def _time_python(run, batches):
+    run(*batches[0])  # warm-up (table builds, caches)
+    times = []
+    for batch in batches:
+        start = time.perf_counter()
+        run(*batch)
+        times.append((time.perf_counter() - start) * 1000)
+
+    # Peak memory from a separate pass, since tracemalloc slows the timed code down
+    tracemalloc.start()
+    try:
+        run(*batches[0])
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return times, peak // 1024
+
+
+def run_python_cases(colors, images, repeats, selected):
+    results = {}
+    cases = _python_color_cases(colors)
+    for name, (run, count) in cases.items():
+        if not selected(name):
+            continue
+        batches = [(start, min(start + COLOR_BATCH, count)) for start in range(0, count, COLOR_BATCH)]
+        times, peak_kb = _time_python(run, batches)
+        results[name] = summarize(times, count, peak_kb)
+        print_result(name, results[name])
+
+    wheel = lambda: encode_png(render_color_wheel())
+    if selected('py.wheel.render'):
+        times, peak_kb = _time_python(wheel, [()] * repeats)
+        results['py.wheel.render'] = summarize(times, repeats, peak_kb)
+        print_result('py.wheel.render', results['py.wheel.render'])
+
+    for size, image in images.items():
+        for case, run in PYTHON_IMAGE_CASES.items():
+            name = f'{case}.{size}'
+            if not selected(name):
+                continue
+            times, peak_kb = _time_python(run, [(image,)] * repeats)
+            results[name] = summarize(times, repeats, peak_kb)
+            print_result(name, results[name])
+    return results
+
+
+def extract_function(source, name):
+    # Text of `function name(...) { ... }` in a template, found by brace matching
+    match = re.search(r'function\s+' + re.escape(name) + r'\s*\(', source)
+    if not match:
+        raise ValueError(f"function {name} not found in template")
+    # Skip the parameter list first; it may hold destructuring braces
+    depth = 1
+    pos = match.end()
+    while depth:
+        depth += {'(': 1, ')': -1}.get(source[pos], 0)
+        pos += 1
+    for pos in range(source.index('{', pos), len(source)):
+        if source[pos] == '{':
+            depth += 1
+        elif source[pos] == '}':
+            depth -= 1
+            if depth == 0:
+                return source[match.start():pos + 1]
+    raise ValueError(f"Unbalanced braces in function {name}")
+
+
+def prepare_js(directory, colors, images):
+    # Scratch tree for the JS runner: lib/*.js as .mjs with explicit import extensions,
+    # template functions as modules, and the corpora as raw little-endian files
+    from colors_update import plan_components
+
+    os.makedirs(os.path.join(directory, 'lib'))
+    for filename in os.listdir('lib'):
+        if not filename.endswith('.js'):
+            continue
+        with open(os.path.join('lib', filename), encoding='utf-8') as f:
+            source = f.read()
+        source = re.sub(r"""from '\./([\w.]+)'""", r"from './\1.mjs'", source)
+        with open(os.path.join(directory, 'lib', filename[:-3] + '.mjs'), 'w', encoding='utf-8') as f:
+            f.write(source)
+
+    templates = dict(plan_components())
+    os.makedirs(os.path.join(directory, 'templates'))
+    modules = {}
+    for path, name in TEMPLATE_FUNCTIONS:
+        modules.setdefault(path, []).append('export ' + extract_function(templates[path], name))
+    for path, functions in modules.items():
+        module = os.path.splitext(os.path.basename(path))[0] + '.mjs'
+        with open(os.path.join(directory, 'templates', module), 'w', encoding='utf-8') as f:
+            f.write('\n\n'.join(functions) + '\n')
+
+    with open(os.path.join(directory, 'runner.mjs'), 'w', encoding='utf-8') as f:
+        f.write(JS_RUNNER)
+    colors.astype('<u4').tofile(os.path.join(directory, 'colors.u32'))
+    for size, image in images.items():
+        image.tofile(os.path.join(directory, f'{size}.rgba'))
+    with open(os.path.join(directory, 'color-name-index.json'), 'w', encoding='utf-8') as f:
+        f.write(NamedColorIndex.build(load_named_colors()).to_json())
+
+
+def run_js_case(node, directory, name, args):
+    output = subprocess.run(
+        [node, os.path.join(directory, 'runner.mjs'), name, directory, *map(str, args)],
+        capture_output=True, text=True, check=False,
+    )
+    if output.returncode != 0:
+        raise RuntimeError(f"{name} failed:\n{output.stderr.strip()}")
+    data = json.loads(output.stdout.strip().splitlines()[-1])
+    return summarize(data['times'], data['items'], data['peakKb'])
+
+
+def run_js_cases(node, colors, images, repeats, selected):
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='color-bench-') as directory:
+        prepare_js(directory, colors, images)
+        for name in JS_COLOR_CASES:
+            if selected(name):
+                results[name] = run_js_case(node, directory, name, [COLOR_BATCH])
+                print_result(name, results[name])
+        for size in images:
+            for case in JS_IMAGE_CASES:
+                name = f'{case}.{size}'
+                if selected(name):
+                    results[name] = run_js_case(node, directory, name, [size, repeats])
+                    print_result(name, results[name])
+    return results
+
+
+def print_result(name, result):
+    print(f"  {name:32} {result['ops_per_sec']:>14,.1f} ops/s  p50 {result['p50_ms']:9.3f} ms"
+          f"  p99 {result['p99_ms']:9.3f} ms  peak {result['peak_kb']:>9,} KB")
+
+
+def environment():
+    node = shutil.which('node')
+    node_version = subprocess.run([node, '--version'], capture_output=True, text=True).stdout.strip() if node else None
+    return {
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpus': os.cpu_count(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'node': node_version,
+    }
+
+
+def compare(results, baseline, threshold):
+    # Regression messages for cases that got slower or use more memory than allowed
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        slowdown = 1 - result['ops_per_sec'] / previous['ops_per_sec']
+        if slowdown > threshold:
+            regressions.append(f"{name}: {previous['ops_per_sec']:,.1f} -> {result['ops_per_sec']:,.1f} ops/s ({slowdown:.0%} slower)")
+        growth = result['peak_kb'] - previous['peak_kb']
+        if growth > MEMORY_SLACK_KB and growth > threshold * previous['peak_kb']:
+            regressions.append(f"{name}: peak memory {previous['peak_kb']:,} -> {result['peak_kb']:,} KB")
+    return regressions
+
+
+def load_baseline(path):
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data if data.get('version') == BASELINE_VERSION else None
+
+
+def save_baseline(path, env, cases):
+    data = {'version': BASELINE_VERSION, 'environment': env, 'cases': dict(sorted(cases.items()))}
+    with open(path, 'w') as f:
+        f.write(json.dumps(data, indent=2) + '\n')
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Benchmark the Color Explorer color algorithms against a JSON baseline.")
+    parser.add_argument('--baseline', default=BASELINE_FILE, help=f"baseline file (default: {BASELINE_FILE})")
+    parser.add_argument('--update', action='store_true', help="record the results as the new baseline for the cases run")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f"allowed relative regression (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument('--quick', action='store_true',
+                        help=f"{QUICK_COLOR_CORPUS_SIZE:,} colors and the {', '.join(QUICK_IMAGE_SIZES)} image only")
+    parser.add_argument('--runtime', choices=('all', 'js', 'python'), default='all')
+    parser.add_argument('--only', action='append', default=[], metavar='TEXT',
+                        help="run only cases whose name contains TEXT (repeatable)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    # The JS cases read lib/ relative to the project root
+    if not os.path.exists('lib') or not os.path.exists('components'):
+        print("Error: Make sure you run this script from the root of your color-explorer project.")
+        return 2
+
+    def selected(name):
+        return not args.only or any(text in name for text in args.only)
+
+    colors = color_corpus(QUICK_COLOR_CORPUS_SIZE if args.quick else COLOR_CORPUS_SIZE)
+    sizes = QUICK_IMAGE_SIZES if args.quick else tuple(IMAGE_SIZES)
+    # Images are only generated for sizes some selected case uses
+    image_cases = []
+    if args.runtime in ('all', 'python'):
+        image_cases += list(PYTHON_IMAGE_CASES)
+    if args.runtime in ('all', 'js'):
+        image_cases += JS_IMAGE_CASES
+    images = {size: synthetic_image(*IMAGE_SIZES[size]) for size in sizes
+              if any(selected(f'{case}.{size}') for case in image_cases)}
+    repeats = QUICK_IMAGE_REPEATS if args.quick else IMAGE_REPEATS
+    print(f"Corpora: {len(colors):,} colors, images {', '.join(images) or 'none'}, seed {SEED}")
+
+    results = {}
+    if args.runtime in ('all', 'python'):
+        results.update(run_python_cases(colors, images, repeats, selected))
+    if args.runtime in ('all', 'js'):
+        node = shutil.which('node')
+        if node:
+            results.update(run_js_cases(node, colors, images, repeats, selected))
+        else:
+            print("Node not found; skipping JS cases")
+
+    env = environment()
+    baseline = load_baseline(args.baseline)
+    if baseline is None or args.update:
+        cases = dict(baseline['cases']) if baseline else {}
+        cases.update(results)
+        save_baseline(args.baseline, env, cases)
+        print(f"Baseline written: {args.baseline} ({len(results)} cases)")
+        return 0
+
+    if baseline['environment'] != env:
+        print("Warning: baseline was recorded in a different environment; timings may not be comparable")
+    regressions = compare(results, baseline['cases'], args.threshold)
+    for message in regressions:
+        print(f"Regression: {message}")
+    print(f"{len(results)} cases, {len(regressions)} regressions (threshold {args.threshold:.0%})")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
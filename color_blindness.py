@@ -0,0 +1,112 @@
+# Table-driven color blindness simulation for palettes and images
+#
+# lib/colorBlindness.js computes round((r/255*m0 + g/255*m1 + b/255*m2) * 255) per channel.
+# Each product only depends on one input channel, so it is precomputed into separable
+# tables of 256 doubles; summing them in the same order reproduces the JS results
+# exactly. For images, a full 24-bit LUT per type (64MB of packed uint32, built from the
+# same tables) turns an RGBA frame into one mask, one gather and one OR.
+
+import functools
+
+import numpy as np
+
+from color_core import hex_to_rgb_bulk, rgb_to_hex_bulk
+from color_data import COLOR_BLINDNESS_FILE, load_color_blindness_matrices
+
+# Pixels per step when building full LUTs or simulating large images
+CHUNK_PIXELS = 1 << 22
+
+
+@functools.lru_cache(maxsize=None)
+def color_blindness_types(path=COLOR_BLINDNESS_FILE):
+    # Ids from colorBlindnessTypes, 'normal' included
+    return load_color_blindness_matrices(path)[1]
+
+
+@functools.lru_cache(maxsize=None)
+def separable_tables(type_id, path=COLOR_BLINDNESS_FILE):
+    # (3, 3, 256) float64: [output channel][input channel][value] = value / 255 * m
+    # None for types without a matrix ('normal'), which leave colors unchanged
+    matrices, _ = load_color_blindness_matrices(path)
+    if type_id not in matrices:
+        return None
+    m = np.array(matrices[type_id], dtype=np.float64)
+    values = np.arange(256, dtype=np.float64) / 255
+    tables = values[None, None, :] * m[:, :, None]
+    tables.flags.writeable = False
+    return tables
+
+
+def _apply_tables(tables, r, g, b):
+    out = np.empty(r.shape + (3,), dtype=np.uint8)
+    for c in range(3):
+        x = (tables[c, 0][r] + tables[c, 1][g] + tables[c, 2][b]) * 255
+        floor = np.floor(x)
+        out[..., c] = np.clip(floor + (x - floor >= 0.5), 0, 255)
+    return out
+
+
+@functools.lru_cache(maxsize=None)
+def full_lut(type_id, path=COLOR_BLINDNESS_FILE):
+    # (2**24,) uint32 of packed little-endian pixels (R | G << 8 | B << 16), indexed the
+    # same way, so an RGBA image viewed as uint32 maps through one gather. None for 'normal'.
+    tables = separable_tables(type_id, path)
+    if tables is None:
+        return None
+    lut = np.empty(1 << 24, dtype=np.uint32)
+    for start in range(0, 1 << 24, CHUNK_PIXELS):
+        packed = np.arange(start, start + CHUNK_PIXELS, dtype=np.uint32)
+        rgb = _apply_tables(tables, packed & 0xFF, (packed >> 8) & 0xFF, packed >> 16)
+        lut[start:start + CHUNK_PIXELS] = _pack(rgb)
+    lut.flags.writeable = False
+    return lut
+
+
+def _pack(rgb):
+    return rgb[:, 0].astype(np.uint32) | (rgb[:, 1].astype(np.uint32) << 8) | (rgb[:, 2].astype(np.uint32) << 16)
+
+
+def simulate(pixels, type_id, method='tables', path=COLOR_BLINDNESS_FILE):
+    # Any (..., 3) RGB or (..., 4) RGBA uint8 array: a palette, a row, or an H×W image.
+    # Alpha is copied through. method='lut' builds (once, ~1s) and gathers from the 24-bit
+    # LUT, which pays off for repeated multi-megapixel images.
+    pixels = np.ascontiguousarray(pixels, dtype=np.uint8)
+    if separable_tables(type_id, path) is None:
+        return pixels.copy()
+
+    if method == 'lut':
+        lut = full_lut(type_id, path)
+        if pixels.shape[-1] == 4 and np.little_endian:
+            packed = pixels.view(np.uint32).reshape(-1)
+            out = np.take(lut, packed & 0xFFFFFF)
+            out |= packed & 0xFF000000
+            return out.view(np.uint8).reshape(pixels.shape)
+    else:
+        lut = None
+
+    out = pixels.copy()
+    flat_in = pixels.reshape(-1, pixels.shape[-1])
+    flat_out = out.reshape(-1, pixels.shape[-1])
+    tables = separable_tables(type_id, path)
+    for start in range(0, len(flat_in), CHUNK_PIXELS):
+        chunk = flat_in[start:start + CHUNK_PIXELS]
+        if lut is not None:
+            mapped = np.take(lut, _pack(chunk))
+            rgb = np.stack([mapped & 0xFF, (mapped >> 8) & 0xFF, mapped >> 16], axis=1)
+        else:
+            rgb = _apply_tables(tables, chunk[:, 0], chunk[:, 1], chunk[:, 2])
+        flat_out[start:start + CHUNK_PIXELS, :3] = rgb
+    return out
+
+
+def simulate_all(pixels, types=None, method='tables', path=COLOR_BLINDNESS_FILE):
+    # {type: simulated array} for every colorBlindnessTypes entry in one pass over the types
+    return {t: simulate(pixels, t, method, path) for t in (types or color_blindness_types(path))}
+
+
+def simulate_palette(hex_colors, type_id, path=COLOR_BLINDNESS_FILE):
+    # Same output as simulatePalette() in lib/colorBlindness.js for valid 6-digit hex colors
+    rgb = hex_to_rgb_bulk(hex_colors, as_numpy=True)
+    if separable_tables(type_id, path) is None:
+        return list(hex_colors)
+    return rgb_to_hex_bulk(simulate(rgb, type_id, path=path))
@@ -0,0 +1,159 @@
+# WCAG 2.x contrast ratios and levels for whole palettes, mirroring lib/contrastUtils.js
+#
+# Relative luminance only depends on three 8-bit channels, so the sRGB linearization is a
+# 256-entry table and a palette of N colors needs N lookups instead of 3 pow() calls per
+# color per pair. The N×M ratio matrix is then a single broadcast over the luminances.
+
+import base64
+import json
+
+import numpy as np
+
+from color_core import hex_to_rgb, hsl_arrays_to_rgb, js_round, rgb_to_hsl_arrays
+
+# Linearized channel for every 8-bit value, with the WCAG 2.x 0.03928 cutoff
+LUMINANCE_LINEAR = np.array([
+    v / 12.92 if v <= 0.03928 else ((v + 0.055) / 1.055) ** 2.4
+    for v in (c / 255 for c in range(256))
+])
+
+LUMINANCE_WEIGHTS = (0.2126, 0.7152, 0.0722)
+
+# Level codes are indices into WCAG_LEVELS; a ratio at or above WCAG_THRESHOLDS[i]
+# reaches level i + 1, matching getWCAGLevel
+WCAG_LEVELS = ('Fail', 'AA Large', 'AA', 'AAA')
+WCAG_THRESHOLDS = np.array([3.0, 4.5, 7.0])
+
+CONTRAST_ASSET_VERSION = 1
+
+# Bisection steps on HSL lightness (0..100); 20 halvings resolve 1e-4, well below the
+# ~0.2 lightness units between neighboring 8-bit colors
+LIGHTNESS_STEPS = 20
+
+
+def relative_luminance(rgb):
+    # (N, 3) uint8 -> (N,) float64, summed in the same order as getRelativeLuminance
+    rgb = np.asarray(rgb, dtype=np.uint8).reshape(-1, 3)
+    linear = LUMINANCE_LINEAR[rgb]
+    r, g, b = LUMINANCE_WEIGHTS
+    return r * linear[:, 0] + g * linear[:, 1] + b * linear[:, 2]
+
+
+def contrast_matrix(rgb1, rgb2=None):
+    # (N, M) contrast ratios between every pair; rgb2 defaults to rgb1
+    lum1 = relative_luminance(rgb1)
+    lum2 = lum1 if rgb2 is None else relative_luminance(rgb2)
+    lighter = np.maximum(lum1[:, None], lum2[None, :])
+    darker = np.minimum(lum1[:, None], lum2[None, :])
+    return (lighter + 0.05) / (darker + 0.05)
+
+
+def wcag_levels(ratios):
+    # Level codes (uint8, same shape as ratios) for an array of contrast ratios
+    return np.searchsorted(WCAG_THRESHOLDS, ratios, side='right').astype(np.uint8)
+
+
+def _palette_rgb(hex_colors):
+    return np.array([hex_to_rgb(h) or (0, 0, 0) for h in hex_colors], dtype=np.uint8).reshape(-1, 3)
+
+
+def accessible_pairs(hex_colors, min_level='AA'):
+    # [(i, j, ratio, level)] for i < j reaching min_level, highest contrast first
+    ratios = contrast_matrix(_palette_rgb(hex_colors))
+    i, j = np.triu_indices(len(ratios), 1)
+    pair_ratios = ratios[i, j]
+    levels = wcag_levels(pair_ratios)
+    keep = np.nonzero(levels >= WCAG_LEVELS.index(min_level))[0]
+    keep = keep[np.argsort(-pair_ratios[keep], kind='stable')]
+    return [(int(i[k]), int(j[k]), float(pair_ratios[k]), WCAG_LEVELS[levels[k]]) for k in keep]
+
+
+def contrast_matrix_json(names, hex_colors):
+    # Matrix asset for lib/contrastMatrix.js. Pairs i < j are stored row by row
+    # (the condensed upper triangle): `ratios` as little-endian uint16 hundredths and
+    # `levels` as uint8 codes, both base64. Levels come from the unrounded ratios.
+    ratios = contrast_matrix(_palette_rgb(hex_colors))
+    i, j = np.triu_indices(len(ratios), 1)
+    pair_ratios = ratios[i, j]
+    hundredths = np.array([js_round(r * 100) for r in pair_ratios.tolist()], dtype='<u2')
+    return json.dumps({
+        'version': CONTRAST_ASSET_VERSION,
+        'names': list(names),
+        'colors': list(hex_colors),
+        'ratios': base64.b64encode(hundredths.tobytes()).decode('ascii'),
+        'levels': base64.b64encode(wcag_levels(pair_ratios).tobytes()).decode('ascii'),
+    }, separators=(',', ':'))
+
+
+def _passes(h, s, l, bg_lum, target):
+    rgb = np.clip(hsl_arrays_to_rgb(h, s, l), 0, 255).astype(np.uint8)
+    lum = relative_luminance(rgb)
+    ratio = (np.maximum(lum, bg_lum) + 0.05) / (np.minimum(lum, bg_lum) + 0.05)
+    return ratio >= target, rgb, ratio
+
+
+def _bisect_lightness(h, s, l0, bound, bg_lum, target):
+    # Lightness between l0 (failing) and bound (passing) closest to l0 that passes; the
+    # quantized luminance is monotonic in lightness for a fixed hue and saturation
+    lo, hi = l0.copy(), bound.copy()
+    for _ in range(LIGHTNESS_STEPS):
+        mid = (lo + hi) / 2
+        ok = _passes(h, s, mid, bg_lum, target)[0]
+        hi = np.where(ok, mid, hi)
+        lo = np.where(ok, lo, mid)
+    return hi
+
+
+def accessible_colors(fg_rgb, bg_rgb, target=4.5):
+    # For every foreground × background pair, the foreground with the smallest HSL
+    # lightness change (same hue and saturation) whose contrast reaches target, like
+    # suggestAccessibleColor. Returns (suggested (N, M, 3) uint8, ratios (N, M),
+    # found (N, M) bool); pairs that cannot reach target keep the original foreground.
+    fg_rgb = np.asarray(fg_rgb, dtype=np.uint8).reshape(-1, 3)
+    bg_rgb = np.asarray(bg_rgb, dtype=np.uint8).reshape(-1, 3)
+    n, m = len(fg_rgb), len(bg_rgb)
+    fg = np.repeat(fg_rgb, m, axis=0)
+    bg_lum = np.tile(relative_luminance(bg_rgb), n)
+
+    h, s, l0 = rgb_to_hsl_arrays(fg)
+    lum = relative_luminance(fg)
+    ratio = (np.maximum(lum, bg_lum) + 0.05) / (np.minimum(lum, bg_lum) + 0.05)
+    already = ratio >= target
+
+    candidates = []
+    for bound in (100.0, 0.0):
+        bound = np.full_like(l0, bound)
+        reachable = _passes(h, s, bound, bg_lum, target)[0] & ~already
+        l = _bisect_lightness(h, s, l0, bound, bg_lum, target)
+        candidates.append((np.where(reachable, np.abs(l - l0), np.inf), l))
+    (lighter_delta, lighter), (darker_delta, darker) = candidates
+    best = np.where(lighter_delta <= darker_delta, lighter, darker)
+    found = np.isfinite(np.minimum(lighter_delta, darker_delta))
+
+    _, rgb, best_ratio = _passes(h, s, best, bg_lum, target)
+    suggested = np.where((found & ~already)[:, None], rgb, fg)
+    ratios = np.where(found & ~already, best_ratio, ratio)
+    return suggested.reshape(n, m, 3), ratios.reshape(n, m), (found | already).reshape(n, m)
+
+
+def accessible_suggestions_json(pairs, target=4.5):
+    # Suggestion asset for lib/contrastMatrix.js: {"FG|BG": [suggested hex, ratio]} for
+    # the (fg, bg) hex pairs that fall short of target and can be fixed by lightness
+    fgs = sorted({fg.upper() for fg, _ in pairs})
+    bgs = sorted({bg.upper() for _, bg in pairs})
+    suggested, ratios, found = accessible_colors(_palette_rgb(fgs), _palette_rgb(bgs), target)
+    current = contrast_matrix(_palette_rgb(fgs), _palette_rgb(bgs))
+    fg_pos = {hex_color: i for i, hex_color in enumerate(fgs)}
+    bg_pos = {hex_color: j for j, hex_color in enumerate(bgs)}
+
+    suggestions = {}
+    for fg, bg in pairs:
+        i, j = fg_pos[fg.upper()], bg_pos[bg.upper()]
+        if current[i, j] < target and found[i, j]:
+            r, g, b = suggested[i, j].tolist()
+            suggestions[f"{fg.upper()}|{bg.upper()}"] = [f"#{r:02X}{g:02X}{b:02X}", js_round(ratios[i, j] * 100) / 100]
+    return json.dumps({
+        'version': CONTRAST_ASSET_VERSION,
+        'target': target,
+        'suggestions': suggestions,
+    }, separators=(',', ':'))
@@ -0,0 +1,186 @@
+# Color conversion core mirroring the functions embedded in the generated components
+#
+# hex_to_hsl/hsl_to_hex follow the ColorExplorer/ColorSchemeGenerator templates
+# (including the 3-digit hex branch and Math.round semantics), hex_to_rgb/rgb_to_hex
+# follow the regex/bit-shift helpers used everywhere else. Results are identical to
+# the JS for the same inputs, so build jobs can precompute what the browser shows.
+
+import math
+import re
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HEX_RE = re.compile(r'^#?([a-f\d]{2})([a-f\d]{2})([a-f\d]{2})$', re.IGNORECASE)
+
+
+def js_round(x):
+    # Math.round: round half towards +Infinity (floor(x + 0.5) is wrong for 0.49999999999999994)
+    r = math.floor(x)
+    return r + 1 if x - r >= 0.5 else r
+
+
+def hex_to_rgb(hex_color):
+    match = HEX_RE.match(hex_color)
+    if not match:
+        return None
+    return tuple(int(part, 16) for part in match.groups())
+
+
+def rgb_to_hex(r, g, b):
+    return '#' + format((1 << 24) + (int(r) << 16) + (int(g) << 8) + int(b), 'x')[1:]
+
+
+def parse_hex(hex_color):
+    # The templates' hexToHsl parser: '#rgb' or '#rrggbb', anything else is black
+    if len(hex_color) == 4:
+        return tuple(int(c + c, 16) for c in hex_color[1:4])
+    if len(hex_color) == 7:
+        return int(hex_color[1:3], 16), int(hex_color[3:5], 16), int(hex_color[5:7], 16)
+    return 0, 0, 0
+
+
+def rgb_to_hsl(r, g, b):
+    r /= 255
+    g /= 255
+    b /= 255
+    mx = max(r, g, b)
+    mn = min(r, g, b)
+    l = (mx + mn) / 2
+
+    if mx == mn:
+        h = s = 0
+    else:
+        d = mx - mn
+        s = d / (2 - mx - mn) if l > 0.5 else d / (mx + mn)
+        if mx == r:
+            h = (g - b) / d + (6 if g < b else 0)
+        elif mx == g:
+            h = (b - r) / d + 2
+        else:
+            h = (r - g) / d + 4
+        h /= 6
+
+    return h * 360, s * 100, l * 100
+
+
+def hex_to_hsl(hex_color):
+    return rgb_to_hsl(*parse_hex(hex_color))
+
+
+def hsl_to_rgb(h, s, l):
+    # Unclamped like the JS: lightness above 100 (monochromatic * 1.3) can leave 0..255
+    l /= 100
+    a = s * min(l, 1 - l) / 100
+
+    def f(n):
+        k = math.fmod(n + h / 30, 12)
+        return js_round(255 * (l - a * max(min(k - 3, 9 - k, 1), -1)))
+
+    return f(0), f(8), f(4)
+
+
+def hsl_to_hex(h, s, l):
+    return '#' + ''.join(format(c, 'x').rjust(2, '0') for c in hsl_to_rgb(h, s, l))
+
+
+# Bulk versions over flat buffers of RGB triples (array('B'), bytes, or NumPy uint8).
+# NumPy inputs stay NumPy and take the vectorized path; everything else uses array.
+
+def _is_numpy(buf):
+    return np is not None and isinstance(buf, np.ndarray)
+
+
+def rgb_to_hsl_bulk(rgb):
+    if _is_numpy(rgb):
+        return _rgb_to_hsl_np(np.asarray(rgb, dtype=np.uint8).reshape(-1, 3))
+    view = memoryview(rgb).cast('B')
+    out = array('d')
+    for i in range(0, len(view), 3):
+        out.extend(rgb_to_hsl(view[i], view[i + 1], view[i + 2]))
+    return out
+
+
+def hsl_to_rgb_bulk(hsl):
+    # Out-of-range channels are clamped to 0..255 so they fit a uint8 buffer
+    if _is_numpy(hsl):
+        return _hsl_to_rgb_np(np.asarray(hsl, dtype=np.float64).reshape(-1, 3))
+    out = array('B')
+    for i in range(0, len(hsl), 3):
+        out.extend(min(255, max(0, c)) for c in hsl_to_rgb(hsl[i], hsl[i + 1], hsl[i + 2]))
+    return out
+
+
+def hex_to_rgb_bulk(hex_colors, as_numpy=False):
+    # Invalid entries become black, matching the parse-or-zero behaviour of parse_hex
+    out = array('B')
+    for hex_color in hex_colors:
+        out.extend(hex_to_rgb(hex_color) or (0, 0, 0))
+    if as_numpy:
+        return np.frombuffer(out, dtype=np.uint8).reshape(-1, 3)
+    return out
+
+
+def rgb_to_hex_bulk(rgb):
+    data = bytes(np.ascontiguousarray(rgb, dtype=np.uint8)) if _is_numpy(rgb) else bytes(memoryview(rgb).cast('B'))
+    return ['#' + data[i:i + 3].hex() for i in range(0, len(data), 3)]
+
+
+def rgb_to_hsl_arrays(rgb):
+    # (N, 3) uint8 -> h, s, l float64 columns, operation for operation like hexToHsl
+    channels = np.asarray(rgb, dtype=np.uint8).reshape(-1, 3).astype(np.float64) / 255
+    r, g, b = channels[:, 0], channels[:, 1], channels[:, 2]
+    mx = channels.max(axis=1)
+    mn = channels.min(axis=1)
+    l = (mx + mn) / 2
+    d = mx - mn
+    chromatic = d != 0
+    safe_d = np.where(chromatic, d, 1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        s = np.where(l > 0.5, d / (2 - mx - mn), d / (mx + mn))
+    h = np.where(
+        mx == r, (g - b) / safe_d + np.where(g < b, 6, 0),
+        np.where(mx == g, (b - r) / safe_d + 2, (r - g) / safe_d + 4),
+    ) / 6
+
+    h = np.where(chromatic, h, 0)
+    s = np.where(chromatic, s, 0)
+    return h * 360, s * 100, l * 100
+
+
+def _js_round_np(x):
+    floor = np.floor(x)
+    return floor + (x - floor >= 0.5)
+
+
+def hsl_arrays_to_rgb(h, s, l):
+    # Like hslToHex: returns unclamped int64 channels, (N, 3); clamp before casting to uint8
+    l = l / 100
+    a = s * np.minimum(l, 1 - l) / 100
+    channels = []
+    for n in (0, 8, 4):
+        k = np.fmod(n + h / 30, 12)
+        color = l - a * np.maximum(np.minimum(np.minimum(k - 3, 9 - k), 1), -1)
+        channels.append(_js_round_np(255 * color))
+    return np.stack(channels, axis=-1).astype(np.int64)
+
+
+def _rgb_to_hsl_np(rgb):
+    return np.stack(rgb_to_hsl_arrays(rgb), axis=1)
+
+
+def _hsl_to_rgb_np(hsl):
+    return np.clip(hsl_arrays_to_rgb(hsl[:, 0], hsl[:, 1], hsl[:, 2]), 0, 255).astype(np.uint8)
+
+
+HEX_BYTES = [format(i, '02x') for i in range(256)]
+
+
+def format_hex_bulk(channels):
+    # Rows of (r, g, b) ints -> '#rrggbb', with padStart/toString(16) behaviour for out-of-range values
+    return ['#' + ''.join(HEX_BYTES[c] if 0 <= c < 256 else format(c, 'x').rjust(2, '0') for c in row)
+            for row in np.asarray(channels).reshape(-1, 3).tolist()]
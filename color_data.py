@@ -0,0 +1,60 @@
+# Loaders for the color tables kept as JS object literals in lib/
+
+import os
+import re
+
+# The tables ship next to this module, so batch commands work from any directory
+LIB_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lib')
+
+NAMED_COLORS_FILE = os.path.join(LIB_DIR, 'namedColors.js')
+
+NAMED_COLOR_RE = re.compile(
+    r"\{\s*name:\s*'([^']*)',\s*hex:\s*'(#[0-9A-Fa-f]{6})',\s*category:\s*'([^']*)'\s*\}"
+)
+
+
+def load_named_colors(path=NAMED_COLORS_FILE):
+    # [{'name', 'hex', 'category'}] in table order, like the namedColors export
+    with open(path, encoding='utf-8') as f:
+        source = f.read()
+    return [
+        {'name': name, 'hex': hex_color, 'category': category}
+        for name, hex_color, category in NAMED_COLOR_RE.findall(source)
+    ]
+
+
+COLOR_BLINDNESS_FILE = os.path.join(LIB_DIR, 'colorBlindness.js')
+
+MATRIX_RE = re.compile(r"(\w+): \[ //[^\n]*\n((?:\s*\[[^\]]*\],?\n)+)\s*\]")
+MATRIX_ROW_RE = re.compile(r'\[([^\[\]]+)\]')
+TYPE_ID_RE = re.compile(r"id:\s*'([^']+)'")
+
+
+def load_color_blindness_matrices(path=COLOR_BLINDNESS_FILE):
+    # {type: 3x3 rows} from colorBlindnessMatrices, and the ids of colorBlindnessTypes in order
+    with open(path, encoding='utf-8') as f:
+        source = f.read()
+    matrices = {
+        name: [[float(x) for x in row.split(',')] for row in MATRIX_ROW_RE.findall(rows)]
+        for name, rows in MATRIX_RE.findall(source)
+    }
+    types_source = source[source.index('colorBlindnessTypes'):]
+    return matrices, TYPE_ID_RE.findall(types_source)
+
+
+BRAND_COLORS_FILE = os.path.join(LIB_DIR, 'brandColors.js')
+
+BRAND_RE = re.compile(
+    r"brand:\s*'((?:[^'\\]|\\.)*)',\s*colors:\s*\[([^\]]*)\],\s*category:\s*'([^']*)'"
+)
+HEX_LITERAL_RE = re.compile(r"'(#[0-9A-Fa-f]{6})'")
+
+
+def load_brand_colors(path=BRAND_COLORS_FILE):
+    # [{'brand', 'colors', 'category'}] in table order, like the brandColors export
+    with open(path, encoding='utf-8') as f:
+        source = f.read()
+    return [
+        {'brand': re.sub(r"\\(.)", r"\1", brand), 'colors': HEX_LITERAL_RE.findall(colors), 'category': category}
+        for brand, colors, category in BRAND_RE.findall(source)
+    ]
@@ -0,0 +1,395 @@
+# Dominant color extraction with bounded memory, mirroring lib/colorQuantize.js
+#
+# Rows are streamed from the source and sampled on a stride so at most max_pixels are
+# looked at, then accumulated into a 5-bit-per-channel histogram (32768 bins, with
+# per-bin channel sums for accurate averages). Median cut over the occupied bins (cutting
+# at the largest between-class variance) gives the top-k colors and the share of sampled
+# pixels each one covers.
+#
+# PPM and raw RGB/RGBA files are read through a read-only mmap and counted in row blocks,
+# so a frame larger than RAM is processed in constant memory even at full resolution.
+# Multi-frame inputs (concatenated PPMs or raw video from ffmpeg, animated images,
+# numbered image sequences) give one histogram per frame, merged as they arrive.
+
+import json
+import math
+import mmap
+import os
+import sys
+
+import numpy as np
+
+from color_core import js_round, rgb_to_hex
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+HISTOGRAM_BITS = 5
+HISTOGRAM_SIZE = 1 << (3 * HISTOGRAM_BITS)
+
+# Same default budget as the browser extractor: 256×256 sampled pixels
+DEFAULT_MAX_PIXELS = 256 * 256
+
+# Pixels with alpha below this are treated as background and skipped
+MIN_ALPHA = 128
+
+# Sampled pixels counted per block of a mapped frame; bounds add_pixels' temporaries (~10 MB)
+BLOCK_PIXELS = 1 << 18
+
+PPM_WHITESPACE = b' \t\n\v\f\r'
+
+
+def sample_stride(width, height, max_pixels=DEFAULT_MAX_PIXELS):
+    # Row/column step that keeps width/stride × height/stride within the budget
+    if not max_pixels or width * height <= max_pixels:
+        return 1
+    return math.ceil(math.sqrt(width * height / max_pixels))
+
+
+class ColorHistogram:
+    def __init__(self):
+        self.counts = np.zeros(HISTOGRAM_SIZE, dtype=np.int64)
+        self.sums = np.zeros((HISTOGRAM_SIZE, 3), dtype=np.float64)
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    def add_pixels(self, pixels):
+        # (N, 3) RGB or (N, 4) RGBA uint8; RGBA pixels below MIN_ALPHA are skipped
+        pixels = np.asarray(pixels, dtype=np.uint8).reshape(-1, np.shape(pixels)[-1])
+        if pixels.shape[1] == 4:
+            pixels = pixels[pixels[:, 3] >= MIN_ALPHA]
+        rgb = pixels[:, :3]
+        shift = 8 - HISTOGRAM_BITS
+        bins = ((rgb[:, 0].astype(np.int64) >> shift) << (2 * HISTOGRAM_BITS)
+                | (rgb[:, 1].astype(np.int64) >> shift) << HISTOGRAM_BITS
+                | rgb[:, 2].astype(np.int64) >> shift)
+        self.counts += np.bincount(bins, minlength=HISTOGRAM_SIZE)
+        for c in range(3):
+            self.sums[:, c] += np.bincount(bins, weights=rgb[:, c], minlength=HISTOGRAM_SIZE)
+
+    def merge(self, other):
+        self.counts += other.counts
+        self.sums += other.sums
+        return self
+
+    def dominant_colors(self, count=5):
+        return median_cut(self.counts, self.sums, count)
+
+    def average(self):
+        # Mean of every counted pixel, exact from the per-bin sums; None when empty
+        total = self.total
+        if not total:
+            return None
+        r, g, b = (js_round(v) for v in self.sums.sum(axis=0) / total)
+        return rgb_to_hex(r, g, b)
+
+    def coverage(self, count=5):
+        # [(hex, percent)] for the dominant colors, percentages that add up to exactly 100
+        palette = self.dominant_colors(count)
+        return list(zip([hex_color for hex_color, _ in palette],
+                        coverage_percentages([weight for _, weight in palette])))
+
+    def summary(self, count=5):
+        return {
+            'pixels': self.total,
+            'average': self.average(),
+            'palette': [{'hex': hex_color, 'coverage': percent} for hex_color, percent in self.coverage(count)],
+        }
+
+
+def median_cut(counts, sums, count=5):
+    # [(hex, weight)] for up to `count` boxes, heaviest first; weights sum to 1
+    occupied = np.nonzero(counts)[0]
+    total = counts[occupied].sum()
+    if total == 0:
+        return []
+    colors = sums[occupied] / counts[occupied, None]
+    weights = counts[occupied].astype(np.float64)
+
+    boxes = [np.arange(len(occupied))]
+    while len(boxes) < count:
+        # Split the box with the largest weight × widest channel span
+        priorities = [weights[box].sum() * np.ptp(colors[box], axis=0).max() for box in boxes]
+        target = int(np.argmax(priorities))
+        if priorities[target] == 0:
+            break
+        box = boxes.pop(target)
+
+        # Cut along the widest channel where the between-class variance is largest,
+        # which lands in gaps between color clusters rather than inside a noisy one
+        axis = int(np.ptp(colors[box], axis=0).argmax())
+        box = box[np.argsort(colors[box, axis], kind='stable')]
+        w = np.cumsum(weights[box])[:-1]
+        s = np.cumsum(weights[box] * colors[box, axis])[:-1]
+        total_w, total_s = w[-1] + weights[box[-1]], s[-1] + weights[box[-1]] * colors[box[-1], axis]
+        between = (s * total_w - w * total_s) ** 2 / (w * (total_w - w))
+        split = int(between.argmax()) + 1
+        boxes.extend([box[:split], box[split:]])
+
+    result = []
+    for box in boxes:
+        weight = weights[box].sum()
+        mean = (colors[box] * weights[box, None]).sum(axis=0) / weight
+        r, g, b = (js_round(v) for v in mean)
+        result.append((rgb_to_hex(r, g, b), float(weight / total)))
+    result.sort(key=lambda item: -item[1])
+    return result
+
+
+def coverage_percentages(weights, decimals=1):
+    # Largest-remainder rounding of weights (summing to 1) to percentages summing to 100
+    scale = 100 * 10 ** decimals
+    raw = [weight * scale for weight in weights]
+    units = [math.floor(value) for value in raw]
+    short = round(sum(raw)) - sum(units)
+    for i in sorted(range(len(raw)), key=lambda i: units[i] - raw[i])[:short]:
+        units[i] += 1
+    return [unit / 10 ** decimals for unit in units]
+
+
+def histogram_from_rows(rows, width, height, channels=3, max_pixels=DEFAULT_MAX_PIXELS):
+    # rows: iterable of `height` row buffers (bytes or arrays of width × channels uint8).
+    # Only every stride-th row and column is kept, so memory stays at one row at a time.
+    stride = sample_stride(width, height, max_pixels)
+    histogram = ColorHistogram()
+    for y, row in enumerate(rows):
+        if y % stride:
+            continue
+        pixels = np.frombuffer(row, dtype=np.uint8).reshape(width, channels)
+        histogram.add_pixels(pixels[::stride])
+    return histogram
+
+
+def read_ppm_header(f, first_line=b''):
+    # Binary PPM (P6) header -> (width, height); leaves f at the first pixel byte
+    tokens = first_line.split(b'#')[0].split()
+    while len(tokens) < 4:
+        line = f.readline()
+        if not line:
+            raise ValueError("Truncated PPM header")
+        tokens.extend(line.split(b'#')[0].split())
+    if tokens[0] != b'P6' or int(tokens[3]) != 255:
+        raise ValueError("Only 8-bit binary PPM (P6) files are supported")
+    return int(tokens[1]), int(tokens[2])
+
+
+def parse_ppm_header(buf, offset=0):
+    # P6 header at buf[offset:] -> (width, height, pixel offset). Exactly one whitespace
+    # byte follows maxval, so pixel data that starts with a whitespace value is kept.
+    tokens = []
+    pos = offset
+    end = len(buf)
+    while len(tokens) < 4:
+        while pos < end and buf[pos] in PPM_WHITESPACE:
+            pos += 1
+        if pos < end and buf[pos] == ord('#'):
+            newline = buf.find(b'\n', pos)
+            pos = end if newline < 0 else newline + 1
+            continue
+        start = pos
+        while pos < end and buf[pos] not in PPM_WHITESPACE and buf[pos] != ord('#'):
+            pos += 1
+        if pos >= end:
+            raise ValueError("Truncated PPM header")
+        tokens.append(bytes(buf[start:pos]))
+    if tokens[0] != b'P6' or int(tokens[3]) != 255:
+        raise ValueError("Only 8-bit binary PPM (P6) files are supported")
+    return int(tokens[1]), int(tokens[2]), pos + 1
+
+
+def iter_rows(f, row_bytes, height):
+    for _ in range(height):
+        row = f.read(row_bytes)
+        if len(row) != row_bytes:
+            raise ValueError("Truncated pixel data")
+        yield row
+
+
+def add_frame(histogram, pixels, max_pixels=DEFAULT_MAX_PIXELS, mapping=None, offset=0):
+    # pixels: (height, width, channels) uint8, e.g. a view into a mapped file. Sampled rows
+    # are counted in blocks of about BLOCK_PIXELS; given the mmap under pixels (starting at
+    # byte offset), each block's pages are dropped from the resident set once counted.
+    height, width, channels = pixels.shape
+    stride = sample_stride(width, height, max_pixels)
+    rows = max(1, BLOCK_PIXELS // max(1, -(-width // stride))) * stride
+    row_bytes = width * channels
+    released = offset - offset % mmap.PAGESIZE
+    for y in range(0, height, rows):
+        block = pixels[y:y + rows:stride, ::stride]
+        histogram.add_pixels(block.reshape(-1, channels))
+        del block
+        if mapping is not None and hasattr(mapping, 'madvise'):
+            end = offset + min(y + rows, height) * row_bytes
+            end -= end % mmap.PAGESIZE
+            if end > released:
+                mapping.madvise(mmap.MADV_DONTNEED, released, end - released)
+                released = end
+    return histogram
+
+
+def _mapped_frames(buf, size=None, channels=3):
+    # (offset, width, height, channels) of every frame in buf: concatenated P6 images, or
+    # raw packed frames of the given (width, height)
+    offset = 0
+    while offset < len(buf):
+        if size:
+            (width, height), data_offset = size, offset
+        else:
+            if not bytes(buf[offset:offset + 64]).strip(PPM_WHITESPACE):
+                break
+            width, height, data_offset = parse_ppm_header(buf, offset)
+            channels = 3
+        frame_bytes = width * height * channels
+        if data_offset + frame_bytes > len(buf):
+            raise ValueError("Truncated pixel data")
+        yield data_offset, width, height, channels
+        offset = data_offset + frame_bytes
+
+
+def iter_mapped_histograms(path, size=None, channels=3, max_pixels=DEFAULT_MAX_PIXELS):
+    # One histogram per frame of a PPM file, or of a raw RGB/RGBA file when size=(width,
+    # height) is given (ffmpeg -f image2pipe -c:v ppm, or -f rawvideo -pix_fmt rgb24/rgba)
+    with open(path, 'rb') as f:
+        if not os.fstat(f.fileno()).st_size:
+            raise ValueError(f"{path}: empty file")
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        if hasattr(mapping, 'madvise'):
+            mapping.madvise(mmap.MADV_SEQUENTIAL)
+        for offset, width, height, frame_channels in _mapped_frames(mapping, size, channels):
+            pixels = np.ndarray((height, width, frame_channels), np.uint8, mapping, offset)
+            histogram = add_frame(ColorHistogram(), pixels, max_pixels, mapping, offset)
+            del pixels
+            yield histogram
+    finally:
+        mapping.close()
+
+
+def iter_stream_histograms(f, size=None, channels=3, max_pixels=DEFAULT_MAX_PIXELS):
+    # Same frames from a stream that cannot be mapped (a pipe from ffmpeg), read row by row
+    while True:
+        if size:
+            width, height = size
+            first_row = f.read(width * channels)
+            if not first_row:
+                return
+        else:
+            line = f.readline()
+            if not line:
+                return
+            if not line.strip():
+                continue
+            width, height = read_ppm_header(f, line)
+            channels = 3
+            first_row = f.read(width * channels)
+        if len(first_row) != width * channels:
+            raise ValueError("Truncated pixel data")
+        rows = iter_rows(f, width * channels, height - 1)
+        yield histogram_from_rows(_chain_row(first_row, rows), width, height, channels, max_pixels)
+
+
+def _chain_row(first_row, rows):
+    yield first_row
+    yield from rows
+
+
+def iter_image_histograms(path, max_pixels=DEFAULT_MAX_PIXELS):
+    # Frames of any format Pillow reads (animated GIF/WebP/PNG give one per frame); JPEGs
+    # are decoded in draft mode, already downscaled towards the sampling budget
+    if Image is None:
+        raise RuntimeError(f"{path}: only PPM (P6) and raw input are supported without Pillow")
+    with Image.open(path) as image:
+        stride = sample_stride(image.width, image.height, max_pixels)
+        image.draft('RGB', (image.width // stride, image.height // stride))
+        for index in range(getattr(image, 'n_frames', 1)):
+            image.seek(index)
+            yield add_frame(ColorHistogram(), np.asarray(image.convert('RGBA')), max_pixels)
+
+
+def iter_histograms(path, size=None, channels=3, max_pixels=DEFAULT_MAX_PIXELS):
+    # Per-frame histograms of one input: '-' is stdin, PPM and raw files are mapped
+    if path == '-':
+        yield from iter_stream_histograms(sys.stdin.buffer, size, channels, max_pixels)
+        return
+    if not size:
+        with open(path, 'rb') as f:
+            magic = f.read(2)
+    if size or magic == b'P6':
+        yield from iter_mapped_histograms(path, size, channels, max_pixels)
+    else:
+        yield from iter_image_histograms(path, max_pixels)
+
+
+def histogram_from_files(paths, size=None, channels=3, max_pixels=DEFAULT_MAX_PIXELS):
+    # Merged histogram of an image sequence (or any set of inputs), one frame in memory at a time
+    histogram = ColorHistogram()
+    for path in paths:
+        for frame in iter_histograms(path, size, channels, max_pixels):
+            histogram.merge(frame)
+    return histogram
+
+
+def extract_dominant_colors(path, count=5, max_pixels=DEFAULT_MAX_PIXELS):
+    # Dominant colors over every frame of the file
+    return histogram_from_files([path], max_pixels=max_pixels).dominant_colors(count)
+
+
+def _frame_size(text):
+    try:
+        width, height = (int(v) for v in text.lower().split('x'))
+    except ValueError:
+        raise ValueError(f"Frame size must look like 1920x1080, got {text!r}") from None
+    return width, height
+
+
+def add_extract_command(subparsers):
+    sub = subparsers.add_parser('extract', help="image palettes",
+                                description="Average color, dominant palette and coverage of images and video frames.")
+    sub.add_argument('inputs', nargs='*', metavar='FILE',
+                     help="PPM, raw (with --size) or, with Pillow, other image files (default: stdin, also '-')")
+    sub.add_argument('--size', metavar='WxH', help="read raw packed frames of this size, e.g. from ffmpeg -f rawvideo")
+    sub.add_argument('--channels', type=int, choices=[3, 4], default=3, help="bytes per raw pixel (rgb24 or rgba)")
+    sub.add_argument('--count', type=int, default=5, help="palette size")
+    sub.add_argument('--max-pixels', type=int, default=DEFAULT_MAX_PIXELS,
+                     help="pixels sampled per frame (0 counts every pixel)")
+    sub.add_argument('--per-frame', action='store_true', help="one record per frame instead of per file")
+    sub.add_argument('--merge', action='store_true', help="one record for all inputs, e.g. a numbered image sequence")
+    sub.add_argument('-o', '--output', help="output file (default: stdout)")
+    sub.set_defaults(run=run_extract_command, unit='frames')
+
+
+def run_extract_command(args):
+    # NDJSON records per file, per frame (--per-frame) and/or for all inputs (--merge);
+    # returns the number of frames read
+    size = _frame_size(args.size) if args.size else None
+    paths = args.inputs or ['-']
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    merged = ColorHistogram()
+    frames = 0
+
+    def emit(record, histogram):
+        record.update(histogram.summary(args.count))
+        out.write(json.dumps(record, separators=(',', ':')) + '\n')
+
+    try:
+        for path in paths:
+            histogram = ColorHistogram()
+            file_frames = 0
+            for frame in iter_histograms(path, size, args.channels, args.max_pixels):
+                if args.per_frame:
+                    emit({'file': path, 'frame': file_frames}, frame)
+                (merged if args.merge else histogram).merge(frame)
+                file_frames += 1
+            frames += file_frames
+            if not args.per_frame and not args.merge:
+                emit({'file': path, 'frames': file_frames}, histogram)
+        if args.merge:
+            emit({'files': len(paths), 'frames': frames}, merged)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return frames
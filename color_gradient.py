@@ -0,0 +1,230 @@
+# Perceptual gradients, mirroring lib/colorGradient.js
+#
+# Anchors are interpolated in OKLab (or OKLCH along the shorter hue arc) instead of
+# gamma-encoded sRGB, which keeps midpoints from going grey. Browsers interpolate CSS
+# stops in sRGB, so the curve is sampled densely and reduced to the fewest stops whose
+# sRGB segments stay within a ΔE tolerance of it; a blue-to-yellow gradient needs a handful
+# of stops instead of hundreds. Sampling is vectorized over whole batches of gradients.
+
+import json
+
+import numpy as np
+
+from color_core import js_round, rgb_to_hex
+
+INTERPOLATION_SPACES = ('oklab', 'oklch', 'srgb')
+
+# Largest allowed ΔE between the CSS stops and the true curve: Euclidean OKLab distance ×100,
+# where 2 is about one just-noticeable difference
+DEFAULT_TOLERANCE = 1.0
+
+# Samples of the true curve checked against the stops
+DEFAULT_RESOLUTION = 256
+
+# Below this OKLCH chroma a color has no meaningful hue and takes the other anchor's
+ACHROMATIC_CHROMA = 1e-4
+
+LINEAR_TO_LMS = np.array([
+    [0.4122214708, 0.5363325363, 0.0514459929],
+    [0.2119034982, 0.6806995451, 0.1073969566],
+    [0.0883024619, 0.2817188376, 0.6299787005],
+])
+LMS_TO_OKLAB = np.array([
+    [0.2104542553, 0.7936177850, -0.0040720468],
+    [1.9779984951, -2.4285922050, 0.4505937099],
+    [0.0259040371, 0.7827717662, -0.8086757660],
+])
+OKLAB_TO_LMS = np.array([
+    [1.0, 0.3963377774, 0.2158037573],
+    [1.0, -0.1055613458, -0.0638541728],
+    [1.0, -0.0894841775, -1.2914855480],
+])
+LMS_TO_LINEAR = np.array([
+    [4.0767416621, -3.3077115913, 0.2309699292],
+    [-1.2684380046, 2.6097574011, -0.3413193965],
+    [-0.0041960863, -0.7034186147, 1.7076147010],
+])
+
+
+def srgb_to_oklab(rgb):
+    # (..., 3) sRGB 0-255, integer or float -> (..., 3) OKLab
+    v = np.asarray(rgb, dtype=np.float64) / 255
+    linear = np.where(v <= 0.04045, v / 12.92, ((v + 0.055) / 1.055) ** 2.4)
+    return np.cbrt(linear @ LINEAR_TO_LMS.T) @ LMS_TO_OKLAB.T
+
+
+def oklab_to_linear(lab):
+    # (..., 3) OKLab -> (..., 3) linear-light sRGB 0-1, unclipped, so out-of-gamut shows
+    return (np.asarray(lab, dtype=np.float64) @ OKLAB_TO_LMS.T) ** 3 @ LMS_TO_LINEAR.T
+
+
+def oklab_to_srgb(lab):
+    # (..., 3) OKLab -> (..., 3) float sRGB 0-255, clipped to the gamut in linear light
+    linear = np.clip(oklab_to_linear(lab), 0, 1)
+    v = np.where(linear <= 0.0031308, linear * 12.92, 1.055 * linear ** (1 / 2.4) - 0.055)
+    return v * 255
+
+
+def oklab_to_oklch(lab):
+    # Hue in degrees 0-360
+    L, a, b = np.moveaxis(np.asarray(lab, dtype=np.float64), -1, 0)
+    return np.stack([L, np.hypot(a, b), np.degrees(np.arctan2(b, a)) % 360], axis=-1)
+
+
+def oklch_to_oklab(lch):
+    L, C, h = np.moveaxis(np.asarray(lch, dtype=np.float64), -1, 0)
+    h = np.radians(h)
+    return np.stack([L, C * np.cos(h), C * np.sin(h)], axis=-1)
+
+
+def _js_round(x):
+    return np.floor(x + 0.5)
+
+
+def _mix(start, end, u):
+    # start + (end - start) × u, the same operations as the JS, so samples round alike
+    return start + (end - start) * u
+
+
+def _segments(positions, t):
+    # Anchor segment and local 0-1 parameter for every sample position
+    segment = np.clip(np.searchsorted(positions, t, side='right') - 1, 0, len(positions) - 2)
+    span = positions[segment + 1] - positions[segment]
+    u = np.divide(t - positions[segment], span, out=np.zeros_like(t), where=span > 0)
+    return segment, np.clip(u, 0, 1)
+
+
+def sample_curves(anchors, t, space='oklab', positions=None):
+    # (G, A, 3) anchor RGB -> (G, len(t), 3) float sRGB of each gradient at positions t
+    # (0-1). Anchor positions default to evenly spaced; every gradient in a batch shares them.
+    anchors = np.asarray(anchors, dtype=np.float64)
+    count = anchors.shape[1]
+    positions = np.linspace(0, 1, count) if positions is None else np.asarray(positions, dtype=np.float64)
+    segment, u = _segments(positions, np.asarray(t, dtype=np.float64))
+    u = u[None, :, None]
+
+    if space == 'srgb':
+        return _mix(anchors[:, segment], anchors[:, segment + 1], u)
+    lab = srgb_to_oklab(anchors)
+    if space == 'oklab':
+        return oklab_to_srgb(_mix(lab[:, segment], lab[:, segment + 1], u))
+    if space != 'oklch':
+        raise ValueError(f"Unknown interpolation space: {space}")
+
+    lch = oklab_to_oklch(lab)
+    start, end = lch[:, segment], lch[:, segment + 1]
+    # An achromatic end takes the other end's hue, so grey-to-color does not swing round the wheel
+    start_hue = np.where(start[..., 1] < ACHROMATIC_CHROMA, end[..., 2], start[..., 2])
+    end_hue = np.where(end[..., 1] < ACHROMATIC_CHROMA, start_hue, end[..., 2])
+    hue_delta = (end_hue - start_hue + 180) % 360 - 180
+    u = u[..., 0]
+    mixed = np.stack([_mix(start[..., 0], end[..., 0], u), _mix(start[..., 1], end[..., 1], u),
+                      start_hue + hue_delta * u], axis=-1)
+    return oklab_to_srgb(oklch_to_oklab(mixed))
+
+
+def sample_gradients(anchors, count, space='oklab', positions=None):
+    # (G, A, 3) anchor RGB -> (G, count, 3) uint8, `count` evenly spaced samples per gradient
+    return _js_round(sample_curves(anchors, np.linspace(0, 1, count), space, positions)).astype(np.uint8)
+
+
+def _sample_grid(resolution, positions):
+    # Evenly spaced sample positions plus the anchors themselves, where the curve has corners
+    return np.union1d(np.linspace(0, 1, resolution), positions)
+
+
+def minimal_stop_indices(curves, t, tolerance=DEFAULT_TOLERANCE):
+    # (G, S, 3) densely sampled float sRGB curves -> per curve, the indices of the fewest
+    # stops (greedily, each reaching as far as it can) whose rounded colors, joined by sRGB
+    # lines, stay within tolerance of the curve. Every curve gallops out from its last stop
+    # and then bisects, all in lockstep, so each step is one vectorized error check.
+    curves = np.asarray(curves, dtype=np.float64)
+    stop_rgb = _js_round(curves)
+    curve_lab = srgb_to_oklab(curves)
+    count, last = len(curves), len(t) - 1
+    placed_curves, placed_stops = [np.arange(0)], [np.arange(0)]
+    start = np.zeros(count, dtype=np.int64)
+    good = np.ones(count, dtype=np.int64)
+    bad = np.full(count, -1, dtype=np.int64)
+    step = np.ones(count, dtype=np.int64)
+    active = np.arange(count) if last > 0 else np.arange(0)
+
+    while len(active):
+        i, g, b = start[active], good[active], bad[active]
+        galloping = b < 0
+        probe = np.where(galloping, np.minimum(i + step[active] * 2, last), (g + b) // 2)
+        # Interior samples of every (start, probe) segment, flattened into one ragged batch
+        lengths = probe - i - 1
+        owner = np.repeat(np.arange(len(active)), lengths)
+        first = np.cumsum(lengths) - lengths
+        k = np.arange(lengths.sum()) - np.repeat(first, lengths) + i[owner] + 1
+        curve = active[owner]
+        u = ((t[k] - t[i[owner]]) / (t[probe[owner]] - t[i[owner]]))[:, None]
+        chord = _mix(stop_rgb[curve, i[owner]], stop_rgb[curve, probe[owner]], u)
+        error = np.sqrt(((srgb_to_oklab(chord) - curve_lab[curve, k]) ** 2).sum(axis=-1)) * 100
+        worst = np.zeros(len(active))
+        nonempty = lengths > 0
+        if nonempty.any():
+            worst[nonempty] = np.maximum.reduceat(error, first[nonempty])
+        fits = worst <= tolerance
+
+        good[active] = np.where(fits, probe, g)
+        bad[active] = np.where(fits, b, probe)
+        step[active] = np.where(galloping & fits, step[active] * 2, step[active])
+        # A stop is placed once the bisection closes or the gallop reaches the end
+        settled = np.where(bad[active] < 0, good[active] == last, bad[active] - good[active] <= 1)
+        placed = active[settled]
+        placed_curves.append(placed)
+        placed_stops.append(good[placed])
+        start[placed] = good[placed]
+        good[placed] = start[placed] + 1
+        bad[placed] = -1
+        step[placed] = 1
+        active = active[start[active] < last]
+
+    # Stops were placed left to right, so a stable sort by curve keeps each curve's in order
+    curves_of, stops = np.concatenate(placed_curves), np.concatenate(placed_stops)
+    order = np.argsort(curves_of, kind='stable')
+    split = np.cumsum(np.bincount(curves_of, minlength=count))[:-1]
+    return [[0] + part.tolist() for part in np.split(stops[order], split)]
+
+
+def gradient_stops_batch(anchors, space='oklab', tolerance=DEFAULT_TOLERANCE,
+                         resolution=DEFAULT_RESOLUTION, positions=None):
+    # (G, A, 3) anchor RGB -> [[(hex, percent)]] per gradient; the curves are sampled in one pass
+    anchors = np.asarray(anchors)
+    positions = np.linspace(0, 1, anchors.shape[1]) if positions is None else np.asarray(positions, dtype=np.float64)
+    t = _sample_grid(resolution, positions)
+    curves = sample_curves(anchors, t, space, positions)
+    result = []
+    for curve, indices in zip(curves, minimal_stop_indices(curves, t, tolerance)):
+        colors = _js_round(curve[indices]).astype(int)
+        result.append([(rgb_to_hex(*rgb), js_round(float(t[i]) * 10000) / 100) for rgb, i in zip(colors.tolist(), indices)])
+    return result
+
+
+def gradient_stops(hex_anchors, space='oklab', tolerance=DEFAULT_TOLERANCE,
+                   resolution=DEFAULT_RESOLUTION, positions=None):
+    # Minimal [(hex, percent)] stops for one gradient through '#rrggbb' anchors
+    anchors = np.array([[int(h[i:i + 2], 16) for i in (1, 3, 5)] for h in hex_anchors])
+    return gradient_stops_batch(anchors[None], space, tolerance, resolution, positions)[0]
+
+
+def gradient_css(stops, angle=90):
+    return 'linear-gradient({}deg, {})'.format(angle, ', '.join(f"{hex_color} {position:g}%" for hex_color, position in stops))
+
+
+def palette_gradients_json(palettes, space='oklab', tolerance=DEFAULT_TOLERANCE):
+    # {name: ['#rrggbb', ...]} -> JSON of minimal stops per palette, for lib/colorGradient.js.
+    # Palettes with the same number of colors are sampled together.
+    by_size = {}
+    for name, colors in palettes.items():
+        if len(colors) >= 2:
+            by_size.setdefault(len(colors), []).append(name)
+    gradients = {}
+    for size, names in by_size.items():
+        anchors = np.array([[[int(h[i:i + 2], 16) for i in (1, 3, 5)] for h in palettes[name]] for name in names])
+        for name, stops in zip(names, gradient_stops_batch(anchors, space, tolerance)):
+            gradients[name] = [[hex_color, position] for hex_color, position in stops]
+    ordered = {name: gradients[name] for name in palettes if name in gradients}
+    return json.dumps({'space': space, 'tolerance': tolerance, 'gradients': ordered}, separators=(',', ':'))
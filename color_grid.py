@@ -0,0 +1,112 @@
+# Precomputed color pages for a quantized grid of base colors
+#
+# Every base color on a grid with `levels` values per channel gets the data its static page
+# shows: the generatePalette harmonies, the ColorSchemeGenerator lightness ramp, contrast
+# against white and black, and every colorBlindnessTypes simulation. Records are grouped
+# into one shard per red level and written under content-addressed names, so a shard's
+# URL only changes with its data. Shards are built in a process pool; each worker
+# regenerates its own slice of the grid, so nothing but the JSON text crosses processes.
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from color_blindness import color_blindness_types, separable_tables, simulate
+from color_contrast import WCAG_LEVELS, contrast_matrix, wcag_levels
+from color_core import format_hex_bulk, hsl_arrays_to_rgb, js_round, rgb_to_hsl_arrays
+from color_harmony import harmony_palettes
+
+GRID_LEVELS = 16
+GRID_DIR = 'public/data/grid'
+GRID_INDEX_VERSION = 1
+
+# Lightness stops of ColorSchemeGenerator, lightest first
+SCHEME_LIGHTNESS = (90, 70, 50, 30, 10)
+
+CONTRAST_REFERENCES = (('white', (255, 255, 255)), ('black', (0, 0, 0)))
+
+
+def grid_values(levels=GRID_LEVELS):
+    # Evenly spaced channel values from 0 to 255; 16 levels gives multiples of 0x11
+    return [js_round(i * 255 / (levels - 1)) for i in range(levels)]
+
+
+def grid_colors(levels=GRID_LEVELS, red=None):
+    # (levels³, 3) uint8 in r, g, b order, or only the levels² colors of one red level
+    values = np.array(grid_values(levels), dtype=np.uint8)
+    reds = values if red is None else values[red:red + 1]
+    r, g, b = np.meshgrid(reds, values, values, indexing='ij')
+    return np.stack([r.ravel(), g.ravel(), b.ravel()], axis=1)
+
+
+def scheme_ramps(rgb):
+    # (N, 5, 3) uint8: the base hue and saturation at each SCHEME_LIGHTNESS stop
+    h, s, _ = rgb_to_hsl_arrays(rgb)
+    ramps = [hsl_arrays_to_rgb(h, s, np.full_like(h, l)) for l in SCHEME_LIGHTNESS]
+    return np.clip(np.stack(ramps, axis=1), 0, 255).astype(np.uint8)
+
+
+def _hex_rows(colors):
+    # (N, k, 3) -> N lists of k hex strings
+    n, k, _ = colors.shape
+    flat = format_hex_bulk(colors)
+    return [flat[i * k:(i + 1) * k] for i in range(n)]
+
+
+def grid_records(rgb):
+    # One JSON-ready record per base color. Harmonies are clamped to valid colors, unlike
+    # the template, whose monochromatic * 1.3 can format channels above 255.
+    rgb = np.asarray(rgb, dtype=np.uint8).reshape(-1, 3)
+    hexes = format_hex_bulk(rgb)
+    harmonies = {name: _hex_rows(p) for name, p in harmony_palettes(rgb).items()}
+    schemes = _hex_rows(scheme_ramps(rgb))
+
+    references = np.array([c for _, c in CONTRAST_REFERENCES], dtype=np.uint8)
+    ratios = contrast_matrix(rgb, references)
+    levels = wcag_levels(ratios)
+
+    simulated = {
+        t: format_hex_bulk(simulate(rgb, t))
+        for t in color_blindness_types() if separable_tables(t) is not None
+    }
+
+    return [{
+        'hex': hex_color,
+        'harmonies': {name: rows[i] for name, rows in harmonies.items()},
+        'scheme': schemes[i],
+        'contrast': {
+            name: {'ratio': js_round(ratios[i, j] * 100) / 100, 'level': WCAG_LEVELS[levels[i, j]]}
+            for j, (name, _) in enumerate(CONTRAST_REFERENCES)
+        },
+        'colorBlindness': {t: simulated_hexes[i] for t, simulated_hexes in simulated.items()},
+    } for i, hex_color in enumerate(hexes)]
+
+
+def build_shard(levels, red):
+    # (content-addressed file name, JSON text) for the colors with the given red level
+    text = json.dumps(grid_records(grid_colors(levels, red)), separators=(',', ':'))
+    digest = hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+    return f'{digest}.json', text
+
+
+def build_grid(levels=GRID_LEVELS, workers=None, directory=GRID_DIR):
+    # [(path, text)] for every shard plus index.json, which maps each red level to its shard
+    workers = workers or os.cpu_count() or 1
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, levels)) as executor:
+            shards = list(executor.map(build_shard, [levels] * levels, range(levels)))
+    else:
+        shards = [build_shard(levels, red) for red in range(levels)]
+
+    index = {
+        'version': GRID_INDEX_VERSION,
+        'levels': levels,
+        'values': grid_values(levels),
+        'shards': [name for name, _ in shards],
+    }
+    files = [(f'{directory}/{name}', text) for name, text in shards]
+    files.append((f'{directory}/index.json', json.dumps(index, separators=(',', ':'))))
+    return files
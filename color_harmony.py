@@ -0,0 +1,74 @@
+# Batch palette generation for every harmony in ColorExplorer.generatePalette
+#
+# Each harmony is the base color followed by HSL hue/lightness variations, computed with
+# the same floating-point operations in the same order as the template, so the results
+# are identical to what the browser renders.
+
+import numpy as np
+
+from color_core import format_hex_bulk, hsl_arrays_to_rgb, parse_hex, rgb_to_hsl_arrays
+
+HARMONIES = ['complementary', 'analogous', 'triadic', 'tetradic', 'monochromatic', 'split-complementary']
+
+# Default batch size for harmony_palettes_chunked: 1M colors peaks at roughly 600MB
+CHUNK_SIZE = 1 << 20
+
+
+def _complementary(h):
+    return np.fmod(h + 180, 360)
+
+
+def _analogous(h, angle):
+    return np.fmod(h + angle + 360, 360)
+
+
+def _variations(harmony, h, s, l):
+    # (h, s, l) column triples for the colors generatePalette pushes after the base color
+    if harmony == 'complementary':
+        return [(_complementary(h), s, l)]
+    if harmony == 'analogous':
+        return [(_analogous(h, 30), s, l), (_analogous(h, -30), s, l)]
+    if harmony == 'triadic':
+        return [(_analogous(h, 120), s, l), (_analogous(h, -120), s, l)]
+    if harmony == 'tetradic':
+        return [(_analogous(h, 90), s, l), (_complementary(h), s, l), (_analogous(h, -90), s, l)]
+    if harmony == 'monochromatic':
+        return [(h, s, l * 0.7), (h, s, l * 1.3)]
+    if harmony == 'split-complementary':
+        return [(_analogous(_complementary(h), 30), s, l), (_analogous(_complementary(h), -30), s, l)]
+    raise ValueError(f"Unknown harmony: {harmony}")
+
+
+def harmony_palettes(rgb, harmonies=HARMONIES, clamp=True):
+    # (N, 3) uint8 base colors -> {harmony: (N, k, 3)} with the base color at index 0.
+    # clamp=False keeps the raw int64 channels the JS formats; monochromatic * 1.3 can push
+    # light colors outside 0..255, which the template turns into a malformed hex string.
+    rgb = np.asarray(rgb, dtype=np.uint8).reshape(-1, 3)
+    h, s, l = rgb_to_hsl_arrays(rgb)
+
+    palettes = {}
+    for harmony in harmonies:
+        variations = [hsl_arrays_to_rgb(vh, vs, vl) for vh, vs, vl in _variations(harmony, h, s, l)]
+        palette = np.stack([rgb.astype(np.int64)] + variations, axis=1)
+        palettes[harmony] = np.clip(palette, 0, 255).astype(np.uint8) if clamp else palette
+    return palettes
+
+
+def harmony_palettes_chunked(rgb, harmonies=HARMONIES, chunk_size=CHUNK_SIZE):
+    # Yields (offset, palettes) so callers can stream all 16.7M colors with bounded memory
+    rgb = np.asarray(rgb, dtype=np.uint8).reshape(-1, 3)
+    for offset in range(0, len(rgb), chunk_size):
+        yield offset, harmony_palettes(rgb[offset:offset + chunk_size], harmonies)
+
+
+def all_rgb_colors(start=0, stop=1 << 24):
+    # Every 24-bit color in 0xRRGGBB order as an (N, 3) uint8 array
+    values = np.arange(start, stop, dtype=np.uint32)
+    return np.stack([values >> 16, (values >> 8) & 0xFF, values & 0xFF], axis=1).astype(np.uint8)
+
+
+def generate_palette(hex_color, harmony):
+    # Scalar convenience with the template's output: [baseColor, ...lowercase hex strings]
+    rgb = np.array([parse_hex(hex_color)], dtype=np.uint8)
+    palette = harmony_palettes(rgb, [harmony], clamp=False)[harmony][0]
+    return [hex_color] + format_hex_bulk(palette[1:])
@@ -0,0 +1,124 @@
+# k-d tree over a named-color table for nearest-name lookups
+#
+# The tree is implicit: points are stored in tree order, the node for a range [lo, hi) is
+# at (lo + hi) >> 1 with its left subtree in [lo, mid) and right subtree in (mid, hi).
+# Only the split axis per node and each point's original table position are stored, so
+# the JSON asset is a few bytes per color and lib/colorNameIndex.js can walk it directly.
+# Ties resolve to the earlier table entry, like the linear scan in ColorNamer did.
+
+import base64
+import heapq
+import json
+import time
+from array import array
+
+from color_core import hex_to_rgb
+
+INDEX_VERSION = 1
+
+
+class NamedColorIndex:
+    def __init__(self, names, points, axes, order):
+        self.names = names      # tree order
+        self.points = points    # array('B'), flat RGB triples in tree order
+        self.axes = axes        # array('B'), split axis per node
+        self.order = order      # array('I'), original table position per node
+        self.build_ms = 0.0
+
+    def __len__(self):
+        return len(self.names)
+
+    @classmethod
+    def build(cls, colors):
+        # colors: [{'name', 'hex', ...}] as returned by color_data.load_named_colors
+        start = time.perf_counter()
+        nodes = [(hex_to_rgb(c['hex']), i) for i, c in enumerate(colors)]
+        axes = array('B', bytes(len(nodes)))
+        _build(nodes, axes, 0, len(nodes))
+
+        index = cls(
+            [colors[i]['name'] for _, i in nodes],
+            array('B', [channel for rgb, _ in nodes for channel in rgb]),
+            axes,
+            array('I', [i for _, i in nodes]),
+        )
+        index.build_ms = (time.perf_counter() - start) * 1000
+        return index
+
+    def query(self, rgb, k=1):
+        # k nearest entries to an (r, g, b) triple: [(distance, name, hex)], closest first
+        r, g, b = rgb
+        points, axes, order = self.points, self.axes, self.order
+        heap = []  # max-heap on (distance², table position) via negation
+
+        def search(lo, hi):
+            if lo >= hi:
+                return
+            mid = (lo + hi) >> 1
+            p = mid * 3
+            dr, dg, db = points[p] - r, points[p + 1] - g, points[p + 2] - b
+            key = (-(dr * dr + dg * dg + db * db), -order[mid])
+            if len(heap) < k:
+                heapq.heappush(heap, (key, mid))
+            elif key > heap[0][0]:
+                heapq.heapreplace(heap, (key, mid))
+
+            axis = axes[mid]
+            diff = rgb[axis] - points[p + axis]
+            near, far = ((lo, mid), (mid + 1, hi)) if diff < 0 else ((mid + 1, hi), (lo, mid))
+            search(*near)
+            if len(heap) < k or diff * diff <= -heap[0][0][0]:
+                search(*far)
+
+        search(0, len(self.names))
+        results = sorted(heap, reverse=True)
+        return [
+            ((-key[0]) ** 0.5, self.names[mid], '#' + bytes(points[mid * 3:mid * 3 + 3]).hex())
+            for key, mid in results
+        ]
+
+    def nearest_name(self, hex_color):
+        rgb = hex_to_rgb(hex_color)
+        return self.query(rgb)[0][1] if rgb else None
+
+    def to_json(self):
+        return json.dumps({
+            'version': INDEX_VERSION,
+            'names': self.names,
+            'points': base64.b64encode(self.points.tobytes()).decode('ascii'),
+            'axes': base64.b64encode(self.axes.tobytes()).decode('ascii'),
+            'order': base64.b64encode(_little_endian(self.order)).decode('ascii'),
+        }, separators=(',', ':'))
+
+    @classmethod
+    def from_json(cls, text):
+        data = json.loads(text)
+        if data.get('version') != INDEX_VERSION:
+            raise ValueError(f"Unsupported color name index version: {data.get('version')}")
+        raw_order = base64.b64decode(data['order'])
+        return cls(
+            data['names'],
+            array('B', base64.b64decode(data['points'])),
+            array('B', base64.b64decode(data['axes'])),
+            array('I', [int.from_bytes(raw_order[i:i + 4], 'little') for i in range(0, len(raw_order), 4)]),
+        )
+
+
+def _build(nodes, axes, lo, hi):
+    if hi - lo <= 0:
+        return
+    # Split on the axis with the widest spread, median by (coordinate, table position)
+    segment = nodes[lo:hi]
+    axis = max(range(3), key=lambda a: max(n[0][a] for n in segment) - min(n[0][a] for n in segment))
+    segment.sort(key=lambda n: (n[0][axis], n[1]))
+    nodes[lo:hi] = segment
+
+    mid = (lo + hi) >> 1
+    axes[mid] = axis
+    _build(nodes, axes, lo, mid)
+    _build(nodes, axes, mid + 1, hi)
+
+
+def _little_endian(values):
+    # array('I') is native-endian and may be 8 bytes wide; the asset is always little-endian uint32
+    return b''.join(int(v).to_bytes(4, 'little') for v in values)
@@ -0,0 +1,339 @@
+# Search index over the named and brand colors, mirroring lib/colorSearch.js
+#
+# Text queries are lowercased and reduced to letters and digits, then matched in tiers:
+# exact name, name prefix, word prefix (from a sorted array of word starts, binary
+# searched), substring and fuzzy (both from trigram postings, fuzzy by Dice similarity).
+# Color queries ('#3b82f6', 'rgb(59, 130, 246)', 'near 59,130,246') go to a uniform RGB
+# grid instead: points are bucketed into 32-level cells and searched in growing shells of
+# cells until the k nearest are settled. Documents are the named colors in table order,
+# then the brands; a brand matches a color query through any of its colors.
+
+import base64
+import json
+import math
+import re
+import struct
+import time
+import unicodedata
+
+from color_data import load_brand_colors, load_named_colors
+
+INDEX_VERSION = 1
+
+MATCH_TIERS = ('exact', 'prefix', 'word', 'substring', 'fuzzy')
+
+# Smallest trigram Dice similarity for a fuzzy match
+FUZZY_THRESHOLD = 0.4
+
+# Results for a color query when no limit is given
+NEAR_COUNT = 24
+
+# Grid cells are 2^CELL_BITS levels wide on each channel
+CELL_BITS = 5
+CELLS_PER_AXIS = 256 >> CELL_BITS
+
+# Word offsets share a uint32 with the document number
+MAX_WORD_OFFSET = 255
+
+COLOR_QUERY_RE = re.compile(
+    r'^\s*(?:near\s+(?P<near>\S.*?)|(?P<color>#[0-9a-f]{3}(?:[0-9a-f]{3})?|rgb\s*\(.*\)))\s*$', re.IGNORECASE)
+HEX_QUERY_RE = re.compile(r'^#?([0-9a-f]{3}|[0-9a-f]{6})$', re.IGNORECASE)
+RGB_QUERY_RE = re.compile(r'^(?:rgb\s*\()?\s*(\d{1,3})\s*[,\s]\s*(\d{1,3})\s*[,\s]\s*(\d{1,3})\s*\)?$', re.IGNORECASE)
+
+
+def normalize_name(text):
+    # Lowercase letters and digits only, accents folded: 'Coca-Cola' -> 'cocacola'
+    return re.sub(r'[^a-z0-9]', '', unicodedata.normalize('NFKD', text).lower())
+
+
+def word_offsets(text):
+    # Offsets in normalize_name(text) where each word of text starts
+    offsets, length = [], 0
+    for word in re.findall(r'[a-z0-9]+', unicodedata.normalize('NFKD', text).lower()):
+        offsets.append(length)
+        length += len(word)
+    return offsets
+
+
+def trigrams(key):
+    # Distinct trigrams of a normalized name, in order of first occurrence
+    return list(dict.fromkeys(key[i:i + 3] for i in range(len(key) - 2)))
+
+
+def parse_color_query(query):
+    # (r, g, b) for '#rgb', '#rrggbb', 'rgb(r, g, b)' or 'near <any of those, or r,g,b>'; else None
+    match = COLOR_QUERY_RE.match(query)
+    if not match:
+        return None
+    spec = (match.group('near') or match.group('color')).strip()
+    hex_match = HEX_QUERY_RE.match(spec)
+    if hex_match:
+        digits = hex_match.group(1)
+        if len(digits) == 3:
+            digits = ''.join(c * 2 for c in digits)
+        return tuple(int(digits[i:i + 2], 16) for i in (0, 2, 4))
+    rgb_match = RGB_QUERY_RE.match(spec)
+    if rgb_match:
+        rgb = tuple(int(v) for v in rgb_match.groups())
+        if all(v <= 255 for v in rgb):
+            return rgb
+    return None
+
+
+def _cell(r, g, b):
+    return ((r >> CELL_BITS) * CELLS_PER_AXIS + (g >> CELL_BITS)) * CELLS_PER_AXIS + (b >> CELL_BITS)
+
+
+class ColorSearchIndex:
+    def __init__(self, labels, named, prefixes, postings, cells, points, point_docs):
+        self.labels = labels            # named colors in table order, then brands
+        self.named = named              # documents before this are named colors
+        self.keys = [normalize_name(label) for label in labels]
+        self.prefixes = prefixes        # doc << 8 | word offset, sorted by the key from there on
+        self.postings = postings        # {trigram: ascending docs whose key contains it}
+        self.cells = cells              # start of each grid cell in points, plus the end
+        self.points = points            # bytes, flat RGB triples sorted by cell
+        self.point_docs = point_docs    # document of each point
+        self.build_ms = 0.0
+
+    def __len__(self):
+        return len(self.labels)
+
+    @classmethod
+    def build(cls, named_colors, brand_colors):
+        # named_colors, brand_colors: as returned by color_data.load_named_colors/load_brand_colors
+        start = time.perf_counter()
+        labels = [c['name'] for c in named_colors] + [b['brand'] for b in brand_colors]
+        keys = [normalize_name(label) for label in labels]
+
+        entries = [(doc << 8) | offset
+                   for doc, label in enumerate(labels)
+                   for offset in word_offsets(label) if offset <= MAX_WORD_OFFSET]
+        entries.sort(key=lambda entry: (keys[entry >> 8][entry & 0xFF:], entry))
+
+        postings = {}
+        for doc, key in enumerate(keys):
+            for gram in trigrams(key):
+                postings.setdefault(gram, []).append(doc)
+
+        colors = [(doc, c['hex']) for doc, c in enumerate(named_colors)]
+        colors += [(len(named_colors) + i, hex_color) for i, b in enumerate(brand_colors)
+                   for hex_color in dict.fromkeys(h.upper() for h in b['colors'])]
+        nodes = []
+        for doc, hex_color in colors:
+            rgb = tuple(int(hex_color[i:i + 2], 16) for i in (1, 3, 5))
+            nodes.append((_cell(*rgb), doc, rgb))
+        nodes.sort()
+        cells = [0] * (CELLS_PER_AXIS ** 3 + 1)
+        for cell, _, _ in nodes:
+            cells[cell + 1] += 1
+        for i in range(1, len(cells)):
+            cells[i] += cells[i - 1]
+
+        index = cls(labels, len(named_colors), entries, postings, cells,
+                    bytes(channel for _, _, rgb in nodes for channel in rgb), [doc for _, doc, _ in nodes])
+        index.build_ms = (time.perf_counter() - start) * 1000
+        return index
+
+    def _doc_range(self, kind):
+        if kind == 'named':
+            return 0, self.named
+        if kind == 'brand':
+            return self.named, len(self.labels)
+        if kind is None:
+            return 0, len(self.labels)
+        raise ValueError(f"Unknown search kind: {kind}")
+
+    def _result(self, doc, match, **extra):
+        return {'doc': doc, 'kind': 'named' if doc < self.named else 'brand',
+                'name': self.labels[doc], 'match': match, **extra}
+
+    def search(self, query, kind=None, limit=None):
+        # Best matches first: [{'doc', 'kind', 'name', 'match'}], plus 'distance' for color queries
+        rgb = parse_color_query(query)
+        if rgb is not None:
+            return self.near(rgb, kind, limit or NEAR_COUNT)
+        lo, hi = self._doc_range(kind)
+        q = normalize_name(query)
+        if not q:
+            return []
+        keys = self.keys
+        ranked = {}  # doc -> (tier, -similarity)
+
+        # Word starts whose remaining key begins with q form one run of the sorted array
+        first, last = 0, len(self.prefixes)
+        while first < last:
+            mid = (first + last) >> 1
+            entry = self.prefixes[mid]
+            if keys[entry >> 8][entry & 0xFF:] < q:
+                first = mid + 1
+            else:
+                last = mid
+        for entry in self.prefixes[first:]:
+            doc, offset = entry >> 8, entry & 0xFF
+            if not keys[doc].startswith(q, offset):
+                break
+            if lo <= doc < hi:
+                tier = (0 if len(keys[doc]) == len(q) else 1) if offset == 0 else 2
+                if tier < ranked.get(doc, (3,))[0]:
+                    ranked[doc] = (tier, 0)
+
+        grams = trigrams(q)
+        if grams:
+            shared = {}
+            for gram in grams:
+                for doc in self.postings.get(gram, ()):
+                    if lo <= doc < hi:
+                        shared[doc] = shared.get(doc, 0) + 1
+            for doc, count in shared.items():
+                if doc in ranked:
+                    continue
+                if count == len(grams) and q in keys[doc]:
+                    ranked[doc] = (3, 0)
+                else:
+                    similarity = 2 * count / (len(grams) + len(keys[doc]) - 2)
+                    if similarity >= FUZZY_THRESHOLD:
+                        ranked[doc] = (4, -similarity)
+
+        order = sorted(ranked, key=lambda doc: (ranked[doc], doc))
+        return [self._result(doc, MATCH_TIERS[ranked[doc][0]]) for doc in order[:limit or len(order)]]
+
+    def near(self, rgb, kind=None, k=NEAR_COUNT, radius=None):
+        # Up to k documents closest to an (r, g, b) color, each at its nearest point; with a
+        # radius, only those within it
+        lo, hi = self._doc_range(kind)
+        r, g, b = rgb
+        center = (r >> CELL_BITS, g >> CELL_BITS, b >> CELL_BITS)
+        cells, points, point_docs = self.cells, self.points, self.point_docs
+        best = {}
+        # Once k documents are within the searched cells' bound, only those can rank
+        cutoff = math.inf if radius is None else radius * radius
+        top = CELLS_PER_AXIS - 1
+        size = 1 << CELL_BITS
+
+        ring = 0
+        while True:
+            # Cells at Chebyshev distance `ring` from the query's cell
+            ranges = [range(max(c - ring, 0), min(c + ring, top) + 1) for c in center]
+            for x in ranges[0]:
+                for y in ranges[1]:
+                    for z in ranges[2]:
+                        if max(abs(x - center[0]), abs(y - center[1]), abs(z - center[2])) != ring:
+                            continue
+                        cell = (x * CELLS_PER_AXIS + y) * CELLS_PER_AXIS + z
+                        for i in range(cells[cell], cells[cell + 1]):
+                            doc = point_docs[i]
+                            if not lo <= doc < hi:
+                                continue
+                            dr, dg, db = points[i * 3] - r, points[i * 3 + 1] - g, points[i * 3 + 2] - b
+                            distance = dr * dr + dg * dg + db * db
+                            if distance < best.get(doc, distance + 1):
+                                best[doc] = distance
+
+            # Every point outside the cells searched so far is at least `bound` away
+            gaps = []
+            for value, c in zip(rgb, center):
+                if c - ring > 0:
+                    gaps.append(value - (c - ring) * size + 1)
+                if c + ring < top:
+                    gaps.append((c + ring + 1) * size - value)
+            if not gaps:
+                break
+            bound = min(gaps)
+            if radius is not None and bound > radius:
+                break
+            if sum(1 for distance in best.values() if distance <= bound * bound) >= k:
+                cutoff = min(cutoff, bound * bound)
+                break
+            ring += 1
+
+        found = sorted((distance, doc) for doc, distance in best.items() if distance <= cutoff)
+        return [self._result(doc, 'near', distance=math.sqrt(distance)) for distance, doc in found[:k]]
+
+    def to_json(self):
+        return json.dumps({
+            'version': INDEX_VERSION,
+            'named': self.named,
+            'labels': self.labels,
+            'prefixes': _encode_uint32(self.prefixes),
+            'trigrams': {gram: _encode_deltas(self.postings[gram]) for gram in sorted(self.postings)},
+            'cells': _encode_uint32(self.cells),
+            'points': base64.b64encode(self.points).decode('ascii'),
+            'pointDocs': _encode_uint32(self.point_docs),
+        }, separators=(',', ':'))
+
+    @classmethod
+    def from_json(cls, text):
+        data = json.loads(text)
+        if data.get('version') != INDEX_VERSION:
+            raise ValueError(f"Unsupported color search index version: {data.get('version')}")
+        return cls(
+            data['labels'],
+            data['named'],
+            _decode_uint32(data['prefixes']),
+            {gram: _decode_deltas(encoded) for gram, encoded in data['trigrams'].items()},
+            _decode_uint32(data['cells']),
+            base64.b64decode(data['points']),
+            _decode_uint32(data['pointDocs']),
+        )
+
+
+def _encode_uint32(values):
+    return base64.b64encode(struct.pack(f'<{len(values)}I', *values)).decode('ascii')
+
+
+def _decode_uint32(encoded):
+    raw = base64.b64decode(encoded)
+    return list(struct.unpack(f'<{len(raw) // 4}I', raw))
+
+
+def _encode_deltas(docs):
+    # Ascending docs as LEB128 varints of the gaps between them
+    out = bytearray()
+    previous = 0
+    for doc in docs:
+        gap = doc - previous
+        previous = doc
+        while gap >= 0x80:
+            out.append((gap & 0x7F) | 0x80)
+            gap >>= 7
+        out.append(gap)
+    return base64.b64encode(bytes(out)).decode('ascii')
+
+
+def _decode_deltas(encoded):
+    docs, doc, gap, shift = [], 0, 0, 0
+    for byte in base64.b64decode(encoded):
+        gap |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            doc += gap
+            docs.append(doc)
+            gap, shift = 0, 0
+    return docs
+
+
+def add_search_command(subparsers):
+    sub = subparsers.add_parser('search', help="search named and brand colors",
+                                description="Search the named and brand colors by name, or by color with "
+                                            "'#3b82f6', 'rgb(59, 130, 246)' or 'near 59,130,246'.")
+    sub.add_argument('query', help="name, prefix or color")
+    sub.add_argument('--kind', choices=['named', 'brand'], help="only this collection (default: both)")
+    sub.add_argument('--limit', type=int, default=None, help=f"most results (default: all, {NEAR_COUNT} for colors)")
+    sub.add_argument('--index', metavar='FILE',
+                     help="index JSON written by the generator (default: built from the tables in lib/)")
+    sub.set_defaults(run=run_search_command, unit='results')
+
+
+def run_search_command(args):
+    # Prints one JSON result per line; returns the number of results
+    if args.index:
+        with open(args.index, encoding='utf-8') as f:
+            index = ColorSearchIndex.from_json(f.read())
+    else:
+        index = ColorSearchIndex.build(load_named_colors(), load_brand_colors())
+    results = index.search(args.query, args.kind, args.limit)
+    for result in results:
+        print(json.dumps(result, ensure_ascii=False))
+    return len(results)
@@ -0,0 +1,152 @@
+# Batch shade scales, mirroring lib/colorUtils.js and lib/shadeScales.js
+#
+# Tailwind-style 50-950 scales, tints and shades for whole collections in one array pass
+# instead of one color and one HSL round trip at a time. The HSL ramps reproduce
+# generateShadeScale, generateTints and generateShades exactly, integer HSL included. The
+# perceptual ramp keeps the color at 500 and moves OKLCH lightness towards fixed ends
+# with the hue held and chroma tapered, so the steps look evenly spaced across hues.
+
+import json
+
+import numpy as np
+
+from color_core import format_hex_bulk
+from color_gradient import oklab_to_linear, oklab_to_srgb, srgb_to_oklab
+
+SHADE_STEPS = (50, 100, 200, 300, 400, 500, 600, 700, 800, 900, 950)
+
+SHADE_RAMPS = ('hsl', 'oklch')
+
+# Tints and shades either side of the base color on the /colors/[name] pages
+DEFAULT_TINT_STEPS = 5
+
+# OKLCH lightness of the 50 and 950 steps
+OKLCH_LIGHTEST = 0.97
+OKLCH_DARKEST = 0.27
+
+# Share of the base chroma dropped at 50 and 950, easing in quadratically from 500
+CHROMA_TAPER = 0.7
+
+# Chroma bisection steps when a step falls outside sRGB; 2^-16 of the chroma is far below
+# one 8-bit level
+GAMUT_ITERATIONS = 16
+GAMUT_EPSILON = 1e-6
+
+
+def _js_round(x):
+    return np.floor(x + 0.5)
+
+
+def _utils_rgb_to_hsl(rgb):
+    # (N, 3) ints -> integer h, s, l arrays, as colorUtils.rgbToHsl rounds them
+    r, g, b = np.moveaxis(np.asarray(rgb, dtype=np.float64) / 255, -1, 0)
+    high = np.maximum(np.maximum(r, g), b)
+    low = np.minimum(np.minimum(r, g), b)
+    d = high - low
+    l = (high + low) / 2
+    chromatic = d > 0
+    safe_d = np.where(chromatic, d, 1)
+    s = np.where(l > 0.5, d / np.where(chromatic, 2 - high - low, 1), d / np.where(chromatic, high + low, 1))
+    h = np.where(high == r, ((g - b) / safe_d + np.where(g < b, 6, 0)) / 6,
+                 np.where(high == g, ((b - r) / safe_d + 2) / 6, ((r - g) / safe_d + 4) / 6))
+    h = np.where(chromatic, h, 0)
+    s = np.where(chromatic, s, 0)
+    return _js_round(h * 360), _js_round(s * 100), _js_round(l * 100)
+
+
+def _hue_to_rgb(p, q, t):
+    t = np.where(t < 0, t + 1, t)
+    t = np.where(t > 1, t - 1, t)
+    return np.where(t < 1 / 6, p + (q - p) * 6 * t,
+                    np.where(t < 1 / 2, q, np.where(t < 2 / 3, p + (q - p) * (2 / 3 - t) * 6, p)))
+
+
+def _utils_hsl_to_rgb(h, s, l):
+    # Broadcast h (0-360), s, l (0-100) -> (..., 3) uint8, as colorUtils.hslToRgb
+    h, s, l = np.broadcast_arrays(np.asarray(h, dtype=np.float64) / 360,
+                                  np.asarray(s, dtype=np.float64) / 100,
+                                  np.asarray(l, dtype=np.float64) / 100)
+    q = np.where(l < 0.5, l * (1 + s), l + s - l * s)
+    p = 2 * l - q
+    channels = [np.where(s == 0, l, _hue_to_rgb(p, q, h + offset)) for offset in (1 / 3, 0, -1 / 3)]
+    return _js_round(np.stack(channels, axis=-1) * 255).astype(np.uint8)
+
+
+def hsl_shade_scales(rgb):
+    # (N, 3) base colors -> (N, 11, 3) uint8, colorUtils.generateShadeScale for each
+    h, s, l = (channel[:, None] for channel in _utils_rgb_to_hsl(rgb))
+    steps = np.array(SHADE_STEPS, dtype=np.float64)
+    lighter = 95 - (steps / 500) * (95 - l)
+    darker = l - ((steps - 500) / 500) * l * 0.9
+    lightness = np.clip(np.where(steps <= 500, lighter, darker), 0, 100)
+    return _utils_hsl_to_rgb(h, s, lightness)
+
+
+def tints_and_shades(rgb, steps=DEFAULT_TINT_STEPS):
+    # (N, 3) base colors -> two (N, steps, 3) uint8 arrays, generateTints and generateShades
+    h, s, l = (channel[:, None] for channel in _utils_rgb_to_hsl(rgb))
+    i = np.arange(1, steps + 1, dtype=np.float64)
+    tints = np.minimum(100, l + (i * (100 - l) / (steps + 1)))
+    shades = np.maximum(0, l - (i * l / (steps + 1)))
+    return _utils_hsl_to_rgb(h, s, tints), _utils_hsl_to_rgb(h, s, shades)
+
+
+def _in_gamut(lab):
+    linear = oklab_to_linear(lab)
+    return ((linear >= -GAMUT_EPSILON) & (linear <= 1 + GAMUT_EPSILON)).all(axis=-1)
+
+
+def oklch_shade_scales(rgb):
+    # (N, 3) base colors -> (N, 11, 3) uint8 perceptual scales. Chroma is scaled along the
+    # base color's own a/b direction, so the hue never goes through a trig round trip, and
+    # steps outside sRGB keep the largest chroma that fits at their lightness.
+    lab = srgb_to_oklab(rgb)[:, None, :]
+    steps = np.array(SHADE_STEPS, dtype=np.float64)
+    u = np.where(steps <= 500, (500 - steps) / 450, (steps - 500) / 450)
+    end = np.where(steps <= 500, OKLCH_LIGHTEST, OKLCH_DARKEST)
+    lightness = lab[..., 0] + (end - lab[..., 0]) * u
+    taper = np.broadcast_to(1 - CHROMA_TAPER * u * u, lightness.shape)
+
+    def at(scale):
+        return np.stack([lightness, lab[..., 1] * scale, lab[..., 2] * scale], axis=-1)
+
+    fits = _in_gamut(at(taper))
+    low, high = np.zeros_like(taper), taper.copy()
+    for _ in range(GAMUT_ITERATIONS):
+        mid = (low + high) / 2
+        ok = _in_gamut(at(mid))
+        low = np.where(ok, mid, low)
+        high = np.where(ok, high, mid)
+    return _js_round(oklab_to_srgb(at(np.where(fits, taper, low)))).astype(np.uint8)
+
+
+def shade_scales(rgb, ramp='hsl'):
+    if ramp == 'hsl':
+        return hsl_shade_scales(rgb)
+    if ramp == 'oklch':
+        return oklch_shade_scales(rgb)
+    raise ValueError(f"Unknown shade ramp: {ramp}")
+
+
+def _packed(colors):
+    # (N, K, 3) -> one string of K concatenated 'rrggbb' per color, for compact JSON
+    hexes = format_hex_bulk(colors)
+    per = colors.shape[1]
+    return [''.join(hex_color[1:] for hex_color in hexes[i:i + per]) for i in range(0, len(hexes), per)]
+
+
+def shade_scales_json(hex_colors, tint_steps=DEFAULT_TINT_STEPS):
+    # ['#RRGGBB'] -> JSON for lib/shadeScales.js: parallel arrays of packed ramps, one
+    # entry per distinct color (keys uppercase, like the color tables)
+    colors = list(dict.fromkeys(hex_color.upper() for hex_color in hex_colors))
+    rgb = np.array([[int(h[i:i + 2], 16) for i in (1, 3, 5)] for h in colors], dtype=np.uint8).reshape(-1, 3)
+    tints, shades = tints_and_shades(rgb, tint_steps)
+    return json.dumps({
+        'steps': list(SHADE_STEPS),
+        'tintSteps': tint_steps,
+        'colors': colors,
+        'hsl': _packed(hsl_shade_scales(rgb)),
+        'oklch': _packed(oklch_shade_scales(rgb)),
+        'tints': _packed(tints),
+        'shades': _packed(shades),
+    }, separators=(',', ':'))
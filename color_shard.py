@@ -0,0 +1,122 @@
+# Sharded multi-process execution for batch color jobs
+#
+# Each chunk of work is packed into one multiprocessing.shared_memory block (numpy arrays
+# as raw bytes, string columns as UTF-8 data plus an offset table) and only its name and a
+# small layout dict are sent to the worker, so a chunk costs one memcpy instead of pickling
+# a list of hex strings. Results come back in submission order, and at most max_pending
+# chunks are in flight, which bounds memory however long the input is.
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Chunks in flight per worker: one running, one queued so no worker waits on the reader
+PENDING_PER_WORKER = 2
+
+
+def _align(offset):
+    return (offset + 7) & ~7
+
+
+def pack_columns(columns):
+    # {name: ndarray or list of str} -> (SharedMemory, layout); the caller unlinks the block
+    parts = []
+    layout = {}
+    size = 0
+    for name, values in columns.items():
+        if isinstance(values, np.ndarray):
+            data = np.ascontiguousarray(values)
+            size = _align(size)
+            layout[name] = ('array', data.dtype.str, data.shape, size)
+            parts.append((size, data.reshape(-1).view(np.uint8)))
+            size += data.nbytes
+        else:
+            encoded = [value.encode('utf-8') for value in values]
+            offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+            np.cumsum([len(value) for value in encoded], out=offsets[1:])
+            size = _align(size)
+            offsets_at = size
+            size += offsets.nbytes
+            layout[name] = ('strings', len(encoded), offsets_at, size)
+            parts.append((offsets_at, offsets.view(np.uint8)))
+            parts.append((size, np.frombuffer(b''.join(encoded), dtype=np.uint8)))
+            size += int(offsets[-1])
+
+    shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    buffer = np.ndarray(shm.size, dtype=np.uint8, buffer=shm.buf)
+    for offset, data in parts:
+        buffer[offset:offset + len(data)] = data
+    del buffer
+    return shm, layout
+
+
+def unpack_columns(buf, layout):
+    # Inverse of pack_columns: arrays are read-only views of buf, strings are decoded copies
+    columns = {}
+    for name, entry in layout.items():
+        if entry[0] == 'array':
+            _, dtype, shape, offset = entry
+            array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=buf, offset=offset)
+            array.flags.writeable = False
+            columns[name] = array
+        else:
+            _, count, offsets_at, data_at = entry
+            offsets = np.ndarray(count + 1, dtype=np.int64, buffer=buf, offset=offsets_at).tolist()
+            data = bytes(buf[data_at:data_at + offsets[-1]])
+            columns[name] = [data[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(count)]
+    return columns
+
+
+def _run_shard(fn, name, layout, args):
+    # Worker side: attach, run, and release every view before closing the block
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        columns = unpack_columns(shm.buf, layout)
+        result = fn(columns, *args)
+        del columns
+    finally:
+        shm.close()
+    return result
+
+
+def map_sharded(fn, tasks, workers=None, max_pending=None):
+    # tasks: iterable of (columns, args). Yields fn(columns, *args) for each task, in order.
+    # fn must be a module-level function; array columns are views of shared memory, so
+    # results must not reference them (return new arrays, lists or strings).
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * PENDING_PER_WORKER
+    pending = deque()
+
+    def finish_oldest():
+        future, shm = pending.popleft()
+        try:
+            return future.result()
+        finally:
+            shm.close()
+            shm.unlink()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        try:
+            for columns, args in tasks:
+                shm, layout = pack_columns(columns)
+                try:
+                    future = executor.submit(_run_shard, fn, shm.name, layout, args)
+                except BaseException:
+                    shm.close()
+                    shm.unlink()
+                    raise
+                pending.append((future, shm))
+                if len(pending) >= max_pending:
+                    yield finish_oldest()
+            while pending:
+                yield finish_oldest()
+        finally:
+            # On an error or an abandoned generator, free the blocks still in flight
+            for future, shm in pending:
+                future.cancel()
+                shm.close()
+                shm.unlink()
+            pending.clear()
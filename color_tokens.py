@@ -0,0 +1,429 @@
+# Design-token export for colors_update.py: palettes, shade scales and gradients to every
+# format the design system consumes
+#
+# Token sets are read from NDJSON (one set per line) or JSON (a list of sets):
+#
+#   {"name": "brand", "colors": ["#3B82F6", "#1E40AF"]}          -> brand-1, brand-2
+#   {"name": "blue", "scale": {"50": "#EFF6FF", "900": "#1E3A8A"}} -> blue-50, blue-900
+#   {"name": "sunset", "gradient": ["#F97316", "#DB2777"], "angle": 90}
+#
+# Each format is written by its own worker process, which streams the inputs again and
+# writes through a large buffer to a temp file that replaces the target when complete, so
+# memory stays flat however many tokens there are and a failed export leaves the old files.
+
+import json
+import math
+import os
+import re
+import shutil
+import struct
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+# Output buffer per format; every token set is one write
+WRITE_BUFFER = 1 << 20
+
+TOKEN_HEX_RE = re.compile(r'^#?([0-9a-f]{3}|[0-9a-f]{6})$', re.IGNORECASE)
+
+# Gradient angles in a string form, e.g. "45deg"; numbers are accepted as they are
+ANGLE_RE = re.compile(r'^([0-9]+(?:\.[0-9]+)?)deg$')
+
+# Gradient angle when a set does not give one, as in ExportOptions
+DEFAULT_ANGLE = 90
+
+HEADER = 'Design tokens generated by colors_update.py; do not edit'
+
+
+class TokenSet:
+    __slots__ = ('name', 'kind', 'colors', 'angle')
+
+    def __init__(self, name, kind, colors, angle=None):
+        self.name = name      # slug, e.g. 'brand'
+        self.kind = kind      # 'palette', 'scale' or 'gradient'
+        self.colors = colors  # [(key slug, '#RRGGBB')]; gradient stops are keyed 1..n
+        self.angle = angle
+
+    @property
+    def token_count(self):
+        # A gradient is one token; palettes and scales have one per color
+        return 1 if self.kind == 'gradient' else len(self.colors)
+
+
+def slug(text, separator='-'):
+    return re.sub(r'[^a-z0-9]+', separator, str(text).lower()).strip(separator)
+
+
+def normalize_hex(value):
+    # '#rgb' or '#rrggbb', with or without '#' -> '#RRGGBB', or None
+    match = TOKEN_HEX_RE.match(str(value).strip())
+    if not match:
+        return None
+    digits = match.group(1)
+    if len(digits) == 3:
+        digits = ''.join(c + c for c in digits)
+    return '#' + digits.upper()
+
+
+def normalize_angle(value):
+    # Degrees as an int or float, from a number or a 'NNdeg' string, or None; the value is
+    # written into CSS and JS sources, so nothing else gets through
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, str):
+        match = ANGLE_RE.match(value.strip())
+        if not match:
+            return None
+        value = float(match.group(1))
+    if not isinstance(value, (int, float)) or not math.isfinite(value):
+        return None
+    return int(value) if value == int(value) else value
+
+
+def parse_token_set(record, where):
+    # Input record -> TokenSet; errors name the file and line
+    if not isinstance(record, dict) or not slug(record.get('name', '')):
+        raise ValueError(f"{where}: token set needs a name")
+    name = slug(record['name'])
+    if not name[:1].isalpha():
+        # SCSS variables and most other targets need a leading letter, as android_name does
+        name = 'color-' + name
+    if 'colors' in record:
+        kind, items = 'palette', [(i + 1, value) for i, value in enumerate(record['colors'])]
+    elif 'scale' in record:
+        kind, items = 'scale', list(record['scale'].items())
+    elif 'gradient' in record:
+        kind, items = 'gradient', [(i + 1, value) for i, value in enumerate(record['gradient'])]
+    else:
+        raise ValueError(f"{where}: '{name}' needs colors, scale or gradient")
+
+    colors = []
+    for key, value in items:
+        hex_color = normalize_hex(value)
+        if hex_color is None:
+            raise ValueError(f"{where}: invalid color {value!r} in '{name}'")
+        colors.append((slug(key) or str(len(colors) + 1), hex_color))
+    if not colors or (kind == 'gradient' and len(colors) < 2):
+        raise ValueError(f"{where}: '{name}' has too few colors")
+    angle = None
+    if kind == 'gradient':
+        angle = normalize_angle(record.get('angle', DEFAULT_ANGLE))
+        if angle is None:
+            raise ValueError(f"{where}: invalid angle {record['angle']!r} in '{name}'")
+    return TokenSet(name, kind, colors, angle)
+
+
+def iter_token_sets(paths, labels=None):
+    # Token sets of every input in order; NDJSON is read line by line. labels maps a
+    # path to the name used in errors (stdin is read from a spooled copy).
+    for path in paths:
+        label = (labels or {}).get(path, path)
+        with open(path, encoding='utf-8') as f:
+            if path.endswith('.json'):
+                for i, record in enumerate(json.load(f)):
+                    yield parse_token_set(record, f"{label}[{i}]")
+                continue
+            for line_number, line in enumerate(f, 1):
+                if line.strip():
+                    yield parse_token_set(json.loads(line), f"{label}:{line_number}")
+
+
+def gradient_css(token_set):
+    # linear-gradient() with evenly spaced stops
+    last = len(token_set.colors) - 1
+    stops = ', '.join(f"{hex_color} {i * 100 / last:g}%" for i, (_, hex_color) in enumerate(token_set.colors))
+    return f"linear-gradient({token_set.angle}deg, {stops})"
+
+
+@contextmanager
+def open_output(path, binary=False):
+    # Buffered temp file next to path, renamed over it only if the block completes
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        mode = 'wb' if binary else 'w'
+        with os.fdopen(fd, mode, buffering=WRITE_BUFFER, **({} if binary else {'encoding': 'utf-8'})) as f:
+            yield f
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def write_css(path, read_sets):
+    count = 0
+    with open_output(path) as out:
+        out.write(f"/* {HEADER} */\n:root {{\n")
+        for token_set in read_sets():
+            count += token_set.token_count
+            if token_set.kind == 'gradient':
+                out.write(f"  --{token_set.name}: {gradient_css(token_set)};\n")
+            else:
+                out.write(''.join(f"  --{token_set.name}-{key}: {hex_color};\n" for key, hex_color in token_set.colors))
+        out.write("}\n")
+    return count
+
+
+def write_scss(path, read_sets):
+    # A variable per token plus a map per palette or scale, for @each loops
+    count = 0
+    with open_output(path) as out:
+        out.write(f"// {HEADER}\n")
+        for token_set in read_sets():
+            count += token_set.token_count
+            name = token_set.name
+            if token_set.kind == 'gradient':
+                out.write(f"${name}: {gradient_css(token_set)};\n")
+                continue
+            lines = [f"${name}-{key}: {hex_color};\n" for key, hex_color in token_set.colors]
+            lines.append(f"${name}: (" + ', '.join(f"'{key}': ${name}-{key}" for key, _ in token_set.colors) + ");\n")
+            out.write(''.join(lines))
+    return count
+
+
+def write_tailwind(path, read_sets):
+    # Spread into theme.extend: colors first, then gradients as backgroundImage (two passes)
+    count = 0
+    with open_output(path) as out:
+        out.write(f"// {HEADER}\n// theme: {{ extend: require('./{os.path.basename(path)}') }}\nmodule.exports = {{\n  colors: {{\n")
+        for token_set in read_sets():
+            if token_set.kind == 'gradient':
+                continue
+            count += token_set.token_count
+            lines = [f"    '{token_set.name}': {{\n"]
+            lines.extend(f"      '{key}': '{hex_color}',\n" for key, hex_color in token_set.colors)
+            lines.append("    },\n")
+            out.write(''.join(lines))
+        out.write("  },\n  backgroundImage: {\n")
+        for token_set in read_sets():
+            if token_set.kind == 'gradient':
+                count += 1
+                out.write(f"    '{token_set.name}': '{gradient_css(token_set)}',\n")
+        out.write("  },\n}\n")
+    return count
+
+
+def write_style_dictionary(path, read_sets):
+    # Style Dictionary source JSON: {color: {set: {key: {value, type}}}, gradient: {...}}
+    count = 0
+    with open_output(path) as out:
+        for category, gradients in (('color', False), ('gradient', True)):
+            out.write('{\n  "color": {' if not gradients else '\n  },\n  "gradient": {')
+            separator = '\n'
+            for token_set in read_sets():
+                if (token_set.kind == 'gradient') != gradients:
+                    continue
+                count += token_set.token_count
+                if gradients:
+                    entry = json.dumps({'value': gradient_css(token_set), 'type': 'gradient'})
+                    out.write(f"{separator}    {json.dumps(token_set.name)}: {entry}")
+                else:
+                    entries = ',\n'.join(f"      {json.dumps(key)}: {json.dumps({'value': hex_color, 'type': 'color'})}"
+                                         for key, hex_color in token_set.colors)
+                    out.write(f"{separator}    {json.dumps(token_set.name)}: {{\n{entries}\n    }}")
+                separator = ',\n'
+        out.write('\n  }\n}\n')
+    return count
+
+
+def android_name(*parts):
+    # Resource names are [a-z0-9_] and must start with a letter
+    name = '_'.join(slug(part, '_') for part in parts)
+    return name if name[:1].isalpha() else 'color_' + name
+
+
+def write_android(path, read_sets):
+    # res/values colors; a gradient's stops become <name>_1..n
+    count = 0
+    with open_output(path) as out:
+        out.write(f'<?xml version="1.0" encoding="utf-8"?>\n<!-- {HEADER} -->\n<resources>\n')
+        for token_set in read_sets():
+            count += token_set.token_count
+            out.write(''.join(f'    <color name="{android_name(token_set.name, key)}">{hex_color}</color>\n'
+                              for key, hex_color in token_set.colors))
+        out.write('</resources>\n')
+    return count
+
+
+XCASSETS_INFO = {'author': 'xcode', 'version': 1}
+
+
+# Contents.json of a colorset, formatted as Xcode writes it (filled in per color rather
+# than through json.dumps, which dominated the export time)
+COLORSET_JSON = """{
+  "colors" : [
+    {
+      "color" : {
+        "color-space" : "srgb",
+        "components" : {
+          "alpha" : "1.000",
+          "blue" : "0x%s",
+          "green" : "0x%s",
+          "red" : "0x%s"
+        }
+      },
+      "idiom" : "universal"
+    }
+  ],
+  "info" : {
+    "author" : "xcode",
+    "version" : 1
+  }
+}
+"""
+
+
+def write_ios(path, read_sets):
+    # Asset catalog with a namespaced folder per set (Color("brand/1")), built next to the
+    # target and swapped in once complete
+    count = 0
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = tempfile.mkdtemp(dir=directory, prefix='.' + os.path.basename(path) + '.')
+    try:
+        with open(os.path.join(tmp_path, 'Contents.json'), 'w', encoding='utf-8') as f:
+            json.dump({'info': XCASSETS_INFO}, f, indent=2)
+        group_json = json.dumps({'info': XCASSETS_INFO, 'properties': {'provides-namespace': True}}, indent=2)
+        for token_set in read_sets():
+            count += token_set.token_count
+            group = os.path.join(tmp_path, token_set.name)
+            os.makedirs(group, exist_ok=True)
+            with open(os.path.join(group, 'Contents.json'), 'w', encoding='utf-8') as f:
+                f.write(group_json)
+            for key, hex_color in token_set.colors:
+                colorset = os.path.join(group, f"{key}.colorset")
+                os.makedirs(colorset, exist_ok=True)
+                with open(os.path.join(colorset, 'Contents.json'), 'w', encoding='utf-8') as f:
+                    f.write(COLORSET_JSON % (hex_color[5:7], hex_color[3:5], hex_color[1:3]))
+        os.chmod(tmp_path, 0o755)
+        old_path = None
+        if os.path.exists(path):
+            old_path = tmp_path + '.old'
+            os.replace(path, old_path)
+        os.replace(tmp_path, path)
+        if old_path:
+            shutil.rmtree(old_path)
+    except BaseException:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise
+    return count
+
+
+ASE_GROUP_START = 0xC001
+ASE_GROUP_END = 0xC002
+ASE_COLOR = 0x0001
+ASE_NORMAL = 2
+
+
+def _ase_name(name):
+    encoded = (name + '\0').encode('utf-16-be')
+    return struct.pack('>H', len(encoded) // 2) + encoded
+
+
+def _ase_block(block_type, payload=b''):
+    return struct.pack('>HI', block_type, len(payload)) + payload
+
+
+def write_ase(path, read_sets):
+    # Adobe Swatch Exchange: a group per set; the block count in the header is patched in
+    # at the end so the swatches can be streamed
+    count = 0
+    blocks = 0
+    with open_output(path, binary=True) as out:
+        out.write(b'ASEF' + struct.pack('>HHI', 1, 0, 0))
+        for token_set in read_sets():
+            count += token_set.token_count
+            parts = [_ase_block(ASE_GROUP_START, _ase_name(token_set.name))]
+            for key, hex_color in token_set.colors:
+                rgb = (int(hex_color[i:i + 2], 16) / 255 for i in (1, 3, 5))
+                payload = _ase_name(f"{token_set.name}-{key}") + b'RGB ' + struct.pack('>fffH', *rgb, ASE_NORMAL)
+                parts.append(_ase_block(ASE_COLOR, payload))
+            parts.append(_ase_block(ASE_GROUP_END))
+            blocks += len(parts)
+            out.write(b''.join(parts))
+        out.seek(8)
+        out.write(struct.pack('>I', blocks))
+    return count
+
+
+# format -> (output path under the export directory, writer)
+FORMATS = {
+    'css': ('tokens.css', write_css),
+    'scss': ('_tokens.scss', write_scss),
+    'tailwind': ('tailwind.tokens.js', write_tailwind),
+    'style-dictionary': ('tokens.json', write_style_dictionary),
+    'android': (os.path.join('android', 'values', 'colors.xml'), write_android),
+    'ios': ('Colors.xcassets', write_ios),
+    'ase': ('tokens.ase', write_ase),
+}
+
+
+def check_token_names(token_sets):
+    # Names that slug alike would be written twice (CSS, JSON keys, colorsets) or clash as
+    # Android resources, which also catches '<set>-<key>' collisions across sets
+    set_names = set()
+    android_names = {}
+    for token_set in token_sets:
+        if token_set.name in set_names:
+            raise ValueError(f"two token sets are named '{token_set.name}'")
+        set_names.add(token_set.name)
+        for key, _ in token_set.colors:
+            resource = android_name(token_set.name, key)
+            if resource in android_names:
+                raise ValueError(f"'{token_set.name}' {key} and {android_names[resource]} are both "
+                                 f"written as '{resource}'")
+            android_names[resource] = f"'{token_set.name}' {key}"
+
+
+def export_format(output_format, paths, out_dir):
+    # Worker entry point: one format, inputs streamed again for every pass; returns the token count
+    filename, writer = FORMATS[output_format]
+    return writer(os.path.join(out_dir, filename), lambda: iter_token_sets(paths))
+
+
+def export_tokens(paths, out_dir, formats=None, workers=None):
+    # {format: token count}; with more than one worker each format runs in its own process
+    formats = list(formats or FORMATS)
+    workers = min(workers or os.cpu_count() or 1, len(formats))
+    # Every pass re-reads the input, so stdin is spooled to a file first
+    spooled = None
+    if '-' in paths:
+        with tempfile.NamedTemporaryFile('wb', suffix='.ndjson', delete=False) as f:
+            shutil.copyfileobj(sys.stdin.buffer, f)
+            spooled = f.name
+        paths = [spooled if path == '-' else path for path in paths]
+    try:
+        # Fail on bad input before any worker starts writing
+        check_token_names(iter_token_sets(paths, {spooled: '<stdin>'}))
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {fmt: executor.submit(export_format, fmt, paths, out_dir) for fmt in formats}
+                return {fmt: future.result() for fmt, future in futures.items()}
+        return {fmt: export_format(fmt, paths, out_dir) for fmt in formats}
+    finally:
+        if spooled:
+            os.unlink(spooled)
+
+
+def add_tokens_command(subparsers):
+    sub = subparsers.add_parser('tokens', help="design tokens",
+                                description="Export palettes, shade scales and gradients as design tokens.")
+    sub.add_argument('inputs', nargs='*', metavar='FILE', help="NDJSON or JSON token sets (default: stdin, also '-')")
+    sub.add_argument('-o', '--output', default='tokens', metavar='DIR', help="export directory (default: tokens)")
+    sub.add_argument('--format', dest='formats', action='append', choices=list(FORMATS),
+                     help="format to write (repeatable, default: all)")
+    sub.add_argument('--workers', dest='format_workers', type=int, default=None,
+                     help="processes, one format each (default: all cores)")
+    sub.set_defaults(run=run_tokens_command, unit='tokens')
+
+
+def run_tokens_command(args):
+    # Returns the number of tokens exported
+    counts = export_tokens(args.inputs or ['-'], args.output, args.formats, args.format_workers)
+    for output_format in counts:
+        print(f"  {output_format}: {os.path.join(args.output, FORMATS[output_format][0])}", file=sys.stderr)
+    return max(counts.values(), default=0)
@@ -0,0 +1,48 @@
+# Build-time rendering of the ColorWheel image
+#
+# Pixel (x, y) shows hslToHex({ h, s, l: 50 }) for the hue/saturation the component's
+# pointer handler computes at that point (hue counter-clockwise from +x, saturation
+# growing with the distance from the center), so picking needs no pixel readback.
+
+import struct
+import zlib
+
+import numpy as np
+
+from color_core import hsl_arrays_to_rgb
+
+WHEEL_SIZE = 300
+WHEEL_MARGIN = 5
+
+
+def render_color_wheel(size=WHEEL_SIZE, margin=WHEEL_MARGIN):
+    # (size, size, 4) uint8 RGBA with an anti-aliased transparent outside
+    radius = size / 2 - margin
+    y, x = np.mgrid[0:size, 0:size] + 0.5
+    dx = x - size / 2
+    dy = y - size / 2
+    distance = np.hypot(dx, dy)
+
+    hue = np.degrees(np.arctan2(-dy, dx)) % 360
+    saturation = np.minimum(distance / radius, 1) * 100
+    rgb = np.clip(hsl_arrays_to_rgb(hue.ravel(), saturation.ravel(), np.full(size * size, 50.0)), 0, 255)
+    alpha = np.clip(radius + 0.5 - distance, 0, 1) * 255
+
+    rgba = np.empty((size, size, 4), dtype=np.uint8)
+    rgba[..., :3] = rgb.reshape(size, size, 3)
+    rgba[..., 3] = np.rint(alpha)
+    return rgba
+
+
+def encode_png(rgba):
+    # Minimal RGBA8 PNG encoder; output is deterministic for the same pixels
+    height, width, _ = rgba.shape
+    raw = b''.join(b'\x00' + rgba[row].tobytes() for row in range(height))
+
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+    return (b'\x89PNG\r\n\x1a\n'
+            + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(raw, 9))
+            + chunk(b'IEND', b''))
@@ -1,15 +1,183 @@
+import argparse
+import difflib
+import hashlib
+import json
 import os
-
-def update_file(path, content):
-    with open(path, 'w') as f:
-        f.write(content)
-    print(f"Updated file: {path}")
-
-def main():
-    # Ensure we're in the project directory
-    if not os.path.exists('pages') or not os.path.exists('components'):
-        print("Error: Make sure you run this script from the root of your color-explorer project.")
-        return
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from color_batch import add_batch_commands
+from color_contrast import accessible_suggestions_json, contrast_matrix_json
+from color_data import load_brand_colors, load_named_colors
+from color_distance import similar_named_colors
+from color_extract import add_extract_command
+from color_gradient import palette_gradients_json
+from color_grid import GRID_LEVELS, build_grid
+from color_index import NamedColorIndex
+from color_search import ColorSearchIndex, add_search_command
+from color_shades import shade_scales_json
+from color_tokens import add_tokens_command
+from color_wheel import encode_png, render_color_wheel
+
+# Sidecar manifest of content digests, so unchanged files are skipped without a read
+MANIFEST_FILE = '.colors_update_manifest.json'
+
+# Bounded pool for the apply phase; file writes are I/O bound
+DEFAULT_WORKERS = min(8, os.cpu_count() or 1)
+
+# Neighbor table imported by app/colors/[name]/page.js at build time, so it is committed
+SIMILAR_COLORS_FILE = 'lib/similarColors.json'
+SIMILAR_COLORS_COUNT = 5
+
+# ΔE76 shortlist per color before ranking by ΔE2000: exact for the current table, and at
+# 30k names ~30x faster than the exact self-join with ~0.2% of lists ordered differently
+SIMILAR_COLORS_CANDIDATES = 128
+
+# Contrast ratio the pre-baked accessible-color suggestions aim for (WCAG AA, normal text)
+ACCESSIBLE_TARGET = 4.5
+
+# Read the process umask once so atomic writes get the same mode a plain open() would
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+def content_digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+def file_digest(path):
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(65536), b''):
+            sha.update(block)
+    return sha.hexdigest()
+
+def load_manifest(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(path, manifest):
+    write_atomic(path, (json.dumps(manifest, indent=2, sort_keys=True) + '\n').encode('utf-8'))
+
+def write_atomic(path, data):
+    # Write to a temp file in the target directory, then rename over the target
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        try:
+            mode = os.stat(path).st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+def encode_content(content):
+    # Templates are text; generated assets such as images are already bytes
+    return content if isinstance(content, bytes) else content.encode('utf-8')
+
+def update_file(path, content, manifest=None):
+    # Returns 'written', 'skipped' (manifest hit, file not read) or 'unchanged' (same bytes on disk)
+    data = encode_content(content)
+    digest = content_digest(data)
+    entry = manifest.get(path) if manifest is not None else None
+    status = None
+
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        stat = None
+
+    if stat is not None:
+        if (entry and entry['sha256'] == digest and entry['size'] == stat.st_size
+                and entry['mtime_ns'] == stat.st_mtime_ns):
+            status = 'skipped'
+        elif stat.st_size == len(data) and file_digest(path) == digest:
+            status = 'unchanged'
+
+    if status is None:
+        write_atomic(path, data)
+        stat = os.stat(path)
+        status = 'written'
+
+    if manifest is not None:
+        manifest[path] = {'sha256': digest, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    return status
+
+def print_write_summary(statuses):
+    counts = {status: statuses.count(status) for status in ('written', 'skipped', 'unchanged')}
+    print(f"Files: {counts['written']} written, {counts['skipped']} skipped, {counts['unchanged']} unchanged")
+
+def apply_plan(plan, manifest=None, workers=None):
+    # Runs the write operations on a bounded thread pool; results keep plan order
+    def run(op):
+        path, content = op
+        start = time.perf_counter()
+        status = update_file(path, content, manifest)
+        return path, status, (time.perf_counter() - start) * 1000
+
+    with ThreadPoolExecutor(max_workers=workers or DEFAULT_WORKERS) as executor:
+        results = list(executor.map(run, plan))
+
+    for path, status, elapsed_ms in results:
+        label = 'Updated file' if status == 'written' else f"{status.capitalize()} file"
+        print(f"{label}: {path} ({elapsed_ms:.2f} ms)")
+    return [status for _, status, _ in results]
+
+def print_plan(plan):
+    # Dry run: list every planned write and show a unified diff against what is on disk
+    print(f"Plan: {len(plan)} files")
+    diffs = []
+    for path, content in plan:
+        data = encode_content(content)
+        try:
+            with open(path, 'rb') as f:
+                current = f.read()
+        except FileNotFoundError:
+            current = None
+
+        if current is None:
+            action = 'create'
+        elif current == data:
+            action = 'unchanged'
+        else:
+            action = 'modify'
+        print(f"  {action:9} {path} ({len(data)} bytes)")
+
+        if action == 'unchanged':
+            continue
+        if isinstance(content, bytes):
+            diffs.append(f"Binary files {'/dev/null' if current is None else f'a/{path}'} and b/{path} differ\n")
+            continue
+        diffs.extend(difflib.unified_diff(
+            (current or b'').decode('utf-8', errors='replace').splitlines(keepends=True),
+            content.splitlines(keepends=True),
+            fromfile='/dev/null' if current is None else f"a/{path}",
+            tofile=f"b/{path}",
+        ))
+
+    if diffs:
+        print()
+        for line in diffs:
+            print(line, end='' if line.endswith('\n') else '\n')
+
+def plan_updates(grid_levels=GRID_LEVELS, processes=None):
+    plan = plan_components()
+    plan.extend(plan_data_assets(grid_levels, processes))
+    return plan
+
+def plan_components():
+    # Component and page templates only; cheap, so color_bench.py can read them
+    plan = []
 
     # Update favicon SVG
     favicon_svg = '''
@@ -18,11 +186,15 @@ def main():
   <text x="50" y="50" font-family="Arial, sans-serif" font-size="60" text-anchor="middle" dominant-baseline="central">🎨</text>
 </svg>
     '''
-    update_file('public/favicon.svg', favicon_svg)
+    plan.append(('public/favicon.svg', favicon_svg))
 
     # Update ColorExplorer component
     color_explorer_js = '''
-import { useState, useEffect } from 'react'
+import { useState, useEffect, useRef } from 'react'
+import { requestColorDerivation } from '@/lib/colorDerivationClient'
+import { addToHistory, getColorHistory, HISTORY_SETTLE_MS } from '@/lib/storage'
+import { ColorModelProvider } from './ColorModelContext'
+import ColorModelDebug from './ColorModelDebug'
 import ColorPicker from './ColorPicker'
 import ColorPalette from './ColorPalette'
 import ColorHarmony from './ColorHarmony'
@@ -39,135 +211,139 @@ import ColorImageExtractor from './ColorImageExtractor'
 
 export default function ColorExplorer() {
   const [baseColor, setBaseColor] = useState('#3B82F6')
-  const [palette, setPalette] = useState([])
   const [harmony, setHarmony] = useState('complementary')
-  const [gradient, setGradient] = useState({ start: '#3B82F6', end: '#ffffff' })
+  const [derived, setDerived] = useState(null)
+  const [gradient, setGradient] = useState({ start: '#3B82F6', end: '#ffffff', space: 'oklab' })
   const [colorHistory, setColorHistory] = useState([])
+  const [debug, setDebug] = useState(false)
+  const mountedRef = useRef(true)
 
   useEffect(() => {
-    generatePalette()
-    addToHistory(baseColor)
+    mountedRef.current = true
+    // Cache statistics overlay, opt-in with ?debug
+    setDebug(new URLSearchParams(window.location.search).has('debug'))
+    return () => {
+      mountedRef.current = false
+    }
+  }, [])
+
+  // One worker message per color change; results for colors the user has already moved
+  // past are still shown (they are the newest finished), only queued ones are dropped
+  useEffect(() => {
+    requestColorDerivation(baseColor, harmony)
+      .then(result => {
+        if (result && mountedRef.current) setDerived(result)
+      })
+      .catch(error => console.error('Color derivation failed:', error))
   }, [baseColor, harmony])
 
-  const generatePalette = () => {
-    const newPalette = [baseColor]
-    const hsl = hexToHsl(baseColor)
-
-    switch (harmony) {
-      case 'complementary':
-        newPalette.push(hslToHex(getComplementaryColor(hsl)))
-        break
-      case 'analogous':
-        newPalette.push(hslToHex(getAnalogousColor(hsl, 30)))
-        newPalette.push(hslToHex(getAnalogousColor(hsl, -30)))
-        break
-      case 'triadic':
-        newPalette.push(hslToHex(getAnalogousColor(hsl, 120)))
-        newPalette.push(hslToHex(getAnalogousColor(hsl, -120)))
-        break
-      case 'tetradic':
-        newPalette.push(hslToHex(getAnalogousColor(hsl, 90)))
-        newPalette.push(hslToHex(getComplementaryColor(hsl)))
-        newPalette.push(hslToHex(getAnalogousColor(hsl, -90)))
-        break
-      case 'monochromatic':
-        newPalette.push(hslToHex({ ...hsl, l: hsl.l * 0.7 }))
-        newPalette.push(hslToHex({ ...hsl, l: hsl.l * 1.3 }))
-        break
-      case 'split-complementary':
-        newPalette.push(hslToHex(getAnalogousColor(getComplementaryColor(hsl), 30)))
-        newPalette.push(hslToHex(getAnalogousColor(getComplementaryColor(hsl), -30)))
-        break
-    }
+  useEffect(() => {
+    setColorHistory(getColorHistory().slice(0, 10))
+  }, [])
 
-    setPalette(newPalette)
-  }
+  // Recorded once the color settles, so dragging across the wheel adds one entry; the
+  // storage write itself is batched until the browser is idle
+  useEffect(() => {
+    const timer = setTimeout(() => {
+      setColorHistory(addToHistory(baseColor).slice(0, 10)) // Show only the last 10 colors
+    }, HISTORY_SETTLE_MS)
+    return () => clearTimeout(timer)
+  }, [baseColor])
 
-  const addToHistory = (color) => {
-    setColorHistory(prev => {
-      const newHistory = [color, ...prev.filter(c => c !== color)]
-      return newHistory.slice(0, 10) // Keep only the last 10 colors
-    })
-  }
+  const palette = derived ? derived.palette : [baseColor]
 
-  const getComplementaryColor = (hsl) => {
-    return { ...hsl, h: (hsl.h + 180) % 360 }
-  }
+  // The base color is parsed once here; children read the model and derivation from context
+  return (
+    <ColorModelProvider color={baseColor} derived={derived}>
+      <div className="space-y-8 max-w-6xl mx-auto">
+        <div className="grid grid-cols-1 md:grid-cols-2 gap-8">
+          <div>
+            <ColorPicker color={baseColor} onChange={setBaseColor} />
+            <ColorInfo />
+            <ColorNamer />
+          </div>
+          <div>
+            <ColorWheel onChange={setBaseColor} />
+            <ColorHarmony harmony={harmony} onChange={setHarmony} />
+          </div>
+        </div>
+        <ColorPalette palette={palette} />
+        <ColorSchemeGenerator />
+        <GradientGenerator gradient={gradient} setGradient={setGradient} />
+        <ColorAccessibility />
+        <ColorBlindnessSimulator />
+        <ColorImageExtractor onColorExtract={setBaseColor} />
+        <ColorHistory history={colorHistory} onSelect={setBaseColor} />
+        <ExportOptions palette={palette} gradient={gradient} />
+      </div>
+      {debug && <ColorModelDebug />}
+    </ColorModelProvider>
+  )
+}
+    '''
+    plan.append(('components/ColorExplorer.js', color_explorer_js))
 
-  const getAnalogousColor = (hsl, angle) => {
-    return { ...hsl, h: (hsl.h + angle + 360) % 360 }
-  }
+    # Create ColorModelContext: the parsed base color shared by ColorExplorer's children
+    color_model_context_js = '''
+import { createContext, useContext, useMemo } from 'react'
+import { getColorModel } from '@/lib/colorModel'
 
-  const hexToHsl = (hex) => {
-    let r = 0, g = 0, b = 0
-    if (hex.length === 4) {
-      r = parseInt(hex[1] + hex[1], 16)
-      g = parseInt(hex[2] + hex[2], 16)
-      b = parseInt(hex[3] + hex[3], 16)
-    } else if (hex.length === 7) {
-      r = parseInt(hex.slice(1, 3), 16)
-      g = parseInt(hex.slice(3, 5), 16)
-      b = parseInt(hex.slice(5, 7), 16)
-    }
-    r /= 255
-    g /= 255
-    b /= 255
-    const max = Math.max(r, g, b), min = Math.min(r, g, b)
-    let h, s, l = (max + min) / 2
-
-    if (max === min) {
-      h = s = 0
-    } else {
-      const d = max - min
-      s = l > 0.5 ? d / (2 - max - min) : d / (max + min)
-      switch (max) {
-        case r: h = (g - b) / d + (g < b ? 6 : 0); break
-        case g: h = (b - r) / d + 2; break
-        case b: h = (r - g) / d + 4; break
-      }
-      h /= 6
-    }
+const ColorModelContext = createContext({ model: null, derived: null })
 
-    return { h: h * 360, s: s * 100, l: l * 100 }
-  }
+export function ColorModelProvider({ color, derived, children }) {
+  // getColorModel is memoized by color, so this is one parse per distinct color
+  const value = useMemo(() => ({ model: getColorModel(color), derived }), [color, derived])
+  return <ColorModelContext.Provider value={value}>{children}</ColorModelContext.Provider>
+}
 
-  const hslToHex = ({ h, s, l }) => {
-    l /= 100
-    const a = s * Math.min(l, 1 - l) / 100
-    const f = n => {
-      const k = (n + h / 30) % 12
-      const color = l - a * Math.max(Math.min(k - 3, 9 - k, 1), -1)
-      return Math.round(255 * color).toString(16).padStart(2, '0')
-    }
-    return `#${f(0)}${f(8)}${f(4)}`
+// { model, derived }: model is { key, hex, rgb, hsl, luminance, lab } of the base color
+// (lib/colorModel), derived the latest colorDerivations result or null while it is pending
+export function useColorModel() {
+  return useContext(ColorModelContext)
+}
+    '''
+    plan.append(('components/ColorModelContext.js', color_model_context_js))
+
+    # Create ColorModelDebug overlay (ColorExplorer shows it with ?debug)
+    color_model_debug_js = '''
+import { useEffect, useState } from 'react'
+import { getColorModelStats } from '@/lib/colorModel'
+import { getDerivationCacheStats } from '@/lib/colorDerivationClient'
+
+const REFRESH_MS = 1000
+
+function StatsRow({ label, stats }) {
+  if (!stats) {
+    return <div>{label}: waiting</div>
   }
+  return (
+    <div>
+      {label}: {(stats.hitRate * 100).toFixed(1)}% hits ({stats.hits}/{stats.hits + stats.misses}),
+      {' '}{stats.size}/{stats.capacity} cached, {stats.evictions} evicted
+    </div>
+  )
+}
+
+export default function ColorModelDebug() {
+  const [stats, setStats] = useState({ main: null, derivation: null })
+
+  useEffect(() => {
+    const refresh = () => setStats({ main: getColorModelStats(), derivation: getDerivationCacheStats() })
+    refresh()
+    const timer = setInterval(refresh, REFRESH_MS)
+    return () => clearInterval(timer)
+  }, [])
 
   return (
-    <div className="space-y-8 max-w-6xl mx-auto">
-      <div className="grid grid-cols-1 md:grid-cols-2 gap-8">
-        <div>
-          <ColorPicker color={baseColor} onChange={setBaseColor} />
-          <ColorInfo color={baseColor} />
-          <ColorNamer color={baseColor} />
-        </div>
-        <div>
-          <ColorWheel color={baseColor} onChange={setBaseColor} />
-          <ColorHarmony harmony={harmony} onChange={setHarmony} />
-        </div>
-      </div>
-      <ColorPalette palette={palette} />
-      <ColorSchemeGenerator baseColor={baseColor} />
-      <GradientGenerator gradient={gradient} setGradient={setGradient} />
-      <ColorAccessibility color1={baseColor} color2={palette[1] || '#ffffff'} />
-      <ColorBlindnessSimulator color={baseColor} />
-      <ColorImageExtractor onColorExtract={setBaseColor} />
-      <ColorHistory history={colorHistory} onSelect={setBaseColor} />
-      <ExportOptions palette={palette} gradient={gradient} />
+    <div className="fixed bottom-4 right-4 z-50 rounded-md bg-black/80 px-3 py-2 font-mono text-xs text-white shadow-lg">
+      <div className="font-bold">Color model cache</div>
+      <StatsRow label="main" stats={stats.main} />
+      <StatsRow label="derivation" stats={stats.derivation} />
     </div>
   )
 }
     '''
-    update_file('components/ColorExplorer.js', color_explorer_js)
+    plan.append(('components/ColorModelDebug.js', color_model_debug_js))
 
     # Update ColorPicker component
     color_picker_js = '''
@@ -217,13 +393,17 @@ export default function ColorPicker({ color, onChange }) {
   )
 }
     '''
-    update_file('components/ColorPicker.js', color_picker_js)
+    plan.append(('components/ColorPicker.js', color_picker_js))
 
     # Update ColorInfo component
     color_info_js = '''
-export default function ColorInfo({ color }) {
-  const rgb = hexToRgb(color)
-  const hsl = hexToHsl(color)
+import { useColorModel } from './ColorModelContext'
+
+export default function ColorInfo() {
+  // Parsed once by ColorExplorer, so these are available without waiting for the worker
+  const { model } = useColorModel()
+  const rgb = model && model.rgb
+  const hsl = model && model.hsl
 
   return (
     <div className="bg-white dark:bg-gray-800 p-4 rounded-lg shadow mt-4">
@@ -231,55 +411,22 @@ export default function ColorInfo({ color }) {
       <div className="grid grid-cols-3 gap-4">
         <div>
           <p className="font-semibold text-gray-700 dark:text-gray-300">HEX</p>
-          <p className="text-gray-600 dark:text-gray-400">{color}</p>
+          <p className="text-gray-600 dark:text-gray-400">{model ? model.hex : '…'}</p>
         </div>
         <div>
           <p className="font-semibold text-gray-700 dark:text-gray-300">RGB</p>
-          <p className="text-gray-600 dark:text-gray-400">{`${rgb.r}, ${rgb.g}, ${rgb.b}`}</p>
+          <p className="text-gray-600 dark:text-gray-400">{rgb ? `${rgb.r}, ${rgb.g}, ${rgb.b}` : '…'}</p>
         </div>
         <div>
           <p className="font-semibold text-gray-700 dark:text-gray-300">HSL</p>
-          <p className="text-gray-600 dark:text-gray-400">{`${Math.round(hsl.h)}°, ${Math.round(hsl.s)}%, ${Math.round(hsl.l)}%`}</p>
+          <p className="text-gray-600 dark:text-gray-400">{hsl ? `${Math.round(hsl.h)}°, ${Math.round(hsl.s)}%, ${Math.round(hsl.l)}%` : '…'}</p>
         </div>
       </div>
     </div>
   )
-
-  function hexToRgb(hex) {
-    const result = /^#?([a-f\d]{2})([a-f\d]{2})([a-f\d]{2})$/i.exec(hex)
-    return result ? {
-      r: parseInt(result[1], 16),
-      g: parseInt(result[2], 16),
-      b: parseInt(result[3], 16)
-    } : null
-  }
-
-  function hexToHsl(hex) {
-    const rgb = hexToRgb(hex)
-    const r = rgb.r / 255
-    const g = rgb.g / 255
-    const b = rgb.b / 255
-    const max = Math.max(r, g, b), min = Math.min(r, g, b)
-    let h, s, l = (max + min) / 2
-
-    if (max === min) {
-      h = s = 0
-    } else {
-      const d = max - min
-      s = l > 0.5 ? d / (2 - max - min) : d / (max + min)
-      switch (max) {
-        case r: h = (g - b) / d + (g < b ? 6 : 0); break
-        case g: h = (b - r) / d + 2; break
-        case b: h = (r - g) / d + 4; break
-      }
-      h /= 6
-    }
-
-    return { h: h * 360, s: s * 100, l: l * 100 }
-  }
 }
     '''
-    update_file('components/ColorInfo.js', color_info_js)
+    plan.append(('components/ColorInfo.js', color_info_js))
 
     # Update ColorHarmony component
     color_harmony_js = '''
@@ -310,7 +457,7 @@ export default function ColorHarmony({ harmony, onChange }) {
   )
 }
     '''
-    update_file('components/ColorHarmony.js', color_harmony_js)
+    plan.append(('components/ColorHarmony.js', color_harmony_js))
 
 # Continuing the ColorPalette component
     color_palette_js = '''
@@ -333,15 +480,25 @@ export default function ColorPalette({ palette }) {
   )
 }
     '''
-    update_file('components/ColorPalette.js', color_palette_js)
+    plan.append(('components/ColorPalette.js', color_palette_js))
 
     # Update GradientGenerator component
     gradient_generator_js = '''
-import { useState } from 'react'
+import { useState, useMemo } from 'react'
+import { INTERPOLATION_SPACES, gradientCss, gradientStops } from '@/lib/colorGradient'
+
+const SPACE_LABELS = { oklab: 'OKLab', oklch: 'OKLCH', srgb: 'sRGB' }
 
 export default function GradientGenerator({ gradient, setGradient }) {
   const [angle, setAngle] = useState(90)
 
+  // OKLab/OKLCH gradients are baked into the few sRGB stops that reproduce them
+  const stops = useMemo(
+    () => gradientStops([gradient.start, gradient.end], { space: gradient.space }),
+    [gradient.start, gradient.end, gradient.space]
+  )
+  const css = gradientCss(stops, Number(angle))
+
   const handleColorChange = (e, type) => {
     setGradient({ ...gradient, [type]: e.target.value })
   }
@@ -351,7 +508,7 @@ export default function GradientGenerator({ gradient, setGradient }) {
   }
 
   const gradientStyle = {
-    background: `linear-gradient(${angle}deg, ${gradient.start}, ${gradient.end})`,
+    background: css,
     height: '100px',
     borderRadius: '8px'
   }
@@ -360,7 +517,7 @@ export default function GradientGenerator({ gradient, setGradient }) {
     <div className="bg-white dark:bg-gray-800 p-4 rounded-lg shadow">
       <h2 className="text-xl font-bold mb-4 text-gray-800 dark:text-gray-200">Gradient Generator</h2>
       <div style={gradientStyle} className="mb-4"></div>
-      <div className="grid grid-cols-1 md:grid-cols-3 gap-4">
+      <div className="grid grid-cols-1 md:grid-cols-4 gap-4">
         <div>
           <label className="block text-sm font-medium text-gray-700 dark:text-gray-300">Start Color</label>
           <input
@@ -390,62 +547,39 @@ export default function GradientGenerator({ gradient, setGradient }) {
             className="mt-1 block w-full"
           />
         </div>
+        <div>
+          <label className="block text-sm font-medium text-gray-700 dark:text-gray-300">Interpolation</label>
+          <select
+            value={gradient.space}
+            onChange={(e) => handleColorChange(e, 'space')}
+            className="mt-1 block w-full rounded-md border-gray-300 shadow-sm focus:border-indigo-300 focus:ring focus:ring-indigo-200 focus:ring-opacity-50 dark:bg-gray-700 dark:border-gray-600 dark:text-white"
+          >
+            {INTERPOLATION_SPACES.map(space => (
+              <option key={space} value={space}>{SPACE_LABELS[space]}</option>
+            ))}
+          </select>
+        </div>
       </div>
-      <p className="mt-4 text-sm text-gray-600 dark:text-gray-400">
-        CSS: background: linear-gradient({angle}deg, {gradient.start}, {gradient.end});
+      <p className="mt-4 text-sm text-gray-600 dark:text-gray-400 break-all">
+        CSS: background: {css};
       </p>
     </div>
   )
 }
     '''
-    update_file('components/GradientGenerator.js', gradient_generator_js)
+    plan.append(('components/GradientGenerator.js', gradient_generator_js))
 
     # Update ColorAccessibility component
     color_accessibility_js = '''
-import { useState, useEffect } from 'react'
-
-export default function ColorAccessibility({ color1, color2 }) {
-  const [contrast, setContrast] = useState(null)
-  const [wcagLevel, setWcagLevel] = useState('')
-
-  useEffect(() => {
-    const ratio = calculateContrastRatio(color1, color2)
-    setContrast(ratio)
-    setWcagLevel(getWCAGLevel(ratio))
-  }, [color1, color2])
-
-  function calculateContrastRatio(color1, color2) {
-    const lum1 = calculateLuminance(color1)
-    const lum2 = calculateLuminance(color2)
-    const brightest = Math.max(lum1, lum2)
-    const darkest = Math.min(lum1, lum2)
-    return (brightest + 0.05) / (darkest + 0.05)
-  }
+import { useColorModel } from './ColorModelContext'
 
-  function calculateLuminance(hex) {
-    const rgb = hexToRgb(hex)
-    const [r, g, b] = [rgb.r, rgb.g, rgb.b].map(val => {
-      val /= 255
-      return val <= 0.03928 ? val / 12.92 : Math.pow((val + 0.055) / 1.055, 2.4)
-    })
-    return 0.2126 * r + 0.7152 * g + 0.0722 * b
-  }
-
-  function hexToRgb(hex) {
-    const result = /^#?([a-f\d]{2})([a-f\d]{2})([a-f\d]{2})$/i.exec(hex)
-    return result ? {
-      r: parseInt(result[1], 16),
-      g: parseInt(result[2], 16),
-      b: parseInt(result[3], 16)
-    } : null
-  }
-
-  function getWCAGLevel(ratio) {
-    if (ratio >= 7) return 'AAA'
-    if (ratio >= 4.5) return 'AA'
-    if (ratio >= 3) return 'AA Large'
-    return 'Fail'
-  }
+export default function ColorAccessibility() {
+  const { derived } = useColorModel()
+  // Contrast of the base color against the first palette variation, from the derivation worker
+  const color1 = derived ? derived.color : null
+  const color2 = derived ? derived.contrast.color : null
+  const contrast = derived ? derived.contrast.ratio : null
+  const wcagLevel = derived ? derived.contrast.level : ''
 
   return (
     <div className="bg-white dark:bg-gray-800 p-4 rounded-lg shadow">
@@ -460,74 +594,15 @@ export default function ColorAccessibility({ color1, color2 }) {
   )
 }
     '''
-    update_file('components/ColorAccessibility.js', color_accessibility_js)
+    plan.append(('components/ColorAccessibility.js', color_accessibility_js))
 
     # Update ColorSchemeGenerator component
     color_scheme_generator_js = '''
-import { useState, useEffect } from 'react'
-
-export default function ColorSchemeGenerator({ baseColor }) {
-  const [scheme, setScheme] = useState([])
+import { useColorModel } from './ColorModelContext'
 
-  useEffect(() => {
-    generateScheme(baseColor)
-  }, [baseColor])
-
-  function generateScheme(color) {
-    const hsl = hexToHsl(color)
-    const newScheme = [
-      hslToHex({ ...hsl, l: 90 }), // Lightest
-      hslToHex({ ...hsl, l: 70 }),
-      hslToHex({ ...hsl, l: 50 }), // Base color
-      hslToHex({ ...hsl, l: 30 }),
-      hslToHex({ ...hsl, l: 10 }), // Darkest
-    ]
-    setScheme(newScheme)
-  }
-
-  function hexToHsl(hex) {
-    let r = 0, g = 0, b = 0
-    if (hex.length === 4) {
-      r = parseInt(hex[1] + hex[1], 16)
-      g = parseInt(hex[2] + hex[2], 16)
-      b = parseInt(hex[3] + hex[3], 16)
-    } else if (hex.length === 7) {
-      r = parseInt(hex.slice(1, 3), 16)
-      g = parseInt(hex.slice(3, 5), 16)
-      b = parseInt(hex.slice(5, 7), 16)
-    }
-    r /= 255
-    g /= 255
-    b /= 255
-    const max = Math.max(r, g, b), min = Math.min(r, g, b)
-    let h, s, l = (max + min) / 2
-
-    if (max === min) {
-      h = s = 0
-    } else {
-      const d = max - min
-      s = l > 0.5 ? d / (2 - max - min) : d / (max + min)
-      switch (max) {
-        case r: h = (g - b) / d + (g < b ? 6 : 0); break
-        case g: h = (b - r) / d + 2; break
-        case b: h = (r - g) / d + 4; break
-      }
-      h /= 6
-    }
-
-    return { h: h * 360, s: s * 100, l: l * 100 }
-  }
-
-  function hslToHex({ h, s, l }) {
-    l /= 100
-    const a = s * Math.min(l, 1 - l) / 100
-    const f = n => {
-      const k = (n + h / 30) % 12
-      const color = l - a * Math.max(Math.min(k - 3, 9 - k, 1), -1)
-      return Math.round(255 * color).toString(16).padStart(2, '0')
-    }
-    return `#${f(0)}${f(8)}${f(4)}`
-  }
+export default function ColorSchemeGenerator() {
+  const { derived } = useColorModel()
+  const scheme = derived ? derived.scheme : []
 
   return (
     <div className="bg-white dark:bg-gray-800 p-4 rounded-lg shadow">
@@ -544,7 +619,7 @@ export default function ColorSchemeGenerator({ baseColor }) {
   )
 }
     '''
-    update_file('components/ColorSchemeGenerator.js', color_scheme_generator_js)
+    plan.append(('components/ColorSchemeGenerator.js', color_scheme_generator_js))
 
     # Create ColorHistory component
     color_history_js = '''
@@ -567,18 +642,22 @@ export default function ColorHistory({ history, onSelect }) {
   )
 }
     '''
-    update_file('components/ColorHistory.js', color_history_js)
+    plan.append(('components/ColorHistory.js', color_history_js))
 
     # Create ExportOptions component
     export_options_js = '''
+import { gradientCss, gradientStops } from '@/lib/colorGradient'
+
 export default function ExportOptions({ palette, gradient }) {
+  const gradientValue = () => gradientCss(gradientStops([gradient.start, gradient.end], { space: gradient.space }), 90)
+
   const generateCSS = () => {
     let css = '/* Color Palette */\\n'
     palette.forEach((color, index) => {
       css += `--color-${index + 1}: ${color};\\n`
     })
     css += '\\n/* Gradient */\\n'
-    css += `background: linear-gradient(90deg, ${gradient.start}, ${gradient.end});`
+    css += `background: ${gradientValue()};`
     return css
   }
 
@@ -588,7 +667,7 @@ export default function ExportOptions({ palette, gradient }) {
       scss += `$color-${index + 1}: ${color};\\n`
     })
     scss += '\\n// Gradient\\n'
-    scss += `$gradient: linear-gradient(90deg, ${gradient.start}, ${gradient.end});`
+    scss += `$gradient: ${gradientValue()};`
     return scss
   }
 
@@ -621,76 +700,24 @@ export default function ExportOptions({ palette, gradient }) {
   )
 }
     '''
-    update_file('components/ExportOptions.js', export_options_js)
+    plan.append(('components/ExportOptions.js', export_options_js))
 
     # Continuing the ColorBlindnessSimulator component
     color_blindness_simulator_js = '''
-import { useState, useEffect } from 'react'
-
-export default function ColorBlindnessSimulator({ color }) {
-  const [simulatedColors, setSimulatedColors] = useState({})
-
-  useEffect(() => {
-    setSimulatedColors({
-      protanopia: simulateColorBlindness(color, 'protanopia'),
-      deuteranopia: simulateColorBlindness(color, 'deuteranopia'),
-      tritanopia: simulateColorBlindness(color, 'tritanopia'),
-    })
-  }, [color])
-
-  function simulateColorBlindness(hex, type) {
-    const rgb = hexToRgb(hex)
-    let simulated
-
-    switch (type) {
-      case 'protanopia':
-        simulated = [
-          0.567 * rgb.r + 0.433 * rgb.g + 0.0 * rgb.b,
-          0.558 * rgb.r + 0.442 * rgb.g + 0.0 * rgb.b,
-          0.0 * rgb.r + 0.242 * rgb.g + 0.758 * rgb.b
-        ]
-        break
-      case 'deuteranopia':
-        simulated = [
-          0.625 * rgb.r + 0.375 * rgb.g + 0.0 * rgb.b,
-          0.7 * rgb.r + 0.3 * rgb.g + 0.0 * rgb.b,
-          0.0 * rgb.r + 0.3 * rgb.g + 0.7 * rgb.b
-        ]
-        break
-      case 'tritanopia':
-        simulated = [
-          0.95 * rgb.r + 0.05 * rgb.g + 0.0 * rgb.b,
-          0.0 * rgb.r + 0.433 * rgb.g + 0.567 * rgb.b,
-          0.0 * rgb.r + 0.475 * rgb.g + 0.525 * rgb.b
-        ]
-        break
-      default:
-        simulated = [rgb.r, rgb.g, rgb.b]
-    }
-
-    return rgbToHex(Math.round(simulated[0]), Math.round(simulated[1]), Math.round(simulated[2]))
-  }
-
-  function hexToRgb(hex) {
-    const result = /^#?([a-f\d]{2})([a-f\d]{2})([a-f\d]{2})$/i.exec(hex)
-    return result ? {
-      r: parseInt(result[1], 16),
-      g: parseInt(result[2], 16),
-      b: parseInt(result[3], 16)
-    } : null
-  }
+import { useColorModel } from './ColorModelContext'
 
-  function rgbToHex(r, g, b) {
-    return "#" + ((1 << 24) + (r << 16) + (g << 8) + b).toString(16).slice(1)
-  }
+export default function ColorBlindnessSimulator() {
+  const { derived } = useColorModel()
+  // Simulations for every colorBlindnessTypes entry come from the derivation worker
+  const simulatedColors = derived ? derived.blindness : {}
 
   return (
     <div className="bg-white dark:bg-gray-800 p-4 rounded-lg shadow">
       <h2 className="text-xl font-bold mb-4 text-gray-800 dark:text-gray-200">Color Blindness Simulation</h2>
-      <div className="grid grid-cols-2 md:grid-cols-4 gap-4">
+      <div className="grid grid-cols-2 md:grid-cols-3 lg:grid-cols-5 gap-4">
         <div>
           <p className="text-sm font-medium text-gray-700 dark:text-gray-300">Original</p>
-          <div className="w-full h-20 rounded-md" style={{ backgroundColor: color }}></div>
+          <div className="w-full h-20 rounded-md" style={{ backgroundColor: derived ? derived.color : undefined }}></div>
         </div>
         {Object.entries(simulatedColors).map(([type, simulatedColor]) => (
           <div key={type}>
@@ -703,184 +730,109 @@ export default function ColorBlindnessSimulator({ color }) {
   )
 }
     '''
-    update_file('components/ColorBlindnessSimulator.js', color_blindness_simulator_js)
+    plan.append(('components/ColorBlindnessSimulator.js', color_blindness_simulator_js))
 
     # Create ColorNamer component
     color_namer_js = '''
-import { useState, useEffect } from 'react'
-
-const colorNames = {
-  '#FF0000': 'Red',
-  '#00FF00': 'Green',
-  '#0000FF': 'Blue',
-  '#FFFF00': 'Yellow',
-  '#FF00FF': 'Magenta',
-  '#00FFFF': 'Cyan',
-  '#FFA500': 'Orange',
-  '#800080': 'Purple',
-  '#FFC0CB': 'Pink',
-  '#A52A2A': 'Brown',
-  '#808080': 'Gray',
-  '#FFFFFF': 'White',
-  '#000000': 'Black'
-}
-
-export default function ColorNamer({ color }) {
-  const [colorName, setColorName] = useState('')
-
-  useEffect(() => {
-    setColorName(findNearestColorName(color))
-  }, [color])
-
-  function findNearestColorName(hexColor) {
-    let nearestColor = Object.keys(colorNames)[0]
-    let minDistance = Number.MAX_VALUE
-
-    for (let namedColor in colorNames) {
-      const distance = calculateColorDistance(hexColor, namedColor)
-      if (distance < minDistance) {
-        minDistance = distance
-        nearestColor = namedColor
-      }
-    }
-
-    return colorNames[nearestColor]
-  }
+import { useColorModel } from './ColorModelContext'
 
-  function calculateColorDistance(color1, color2) {
-    const rgb1 = hexToRgb(color1)
-    const rgb2 = hexToRgb(color2)
-
-    return Math.sqrt(
-      Math.pow(rgb1.r - rgb2.r, 2) +
-      Math.pow(rgb1.g - rgb2.g, 2) +
-      Math.pow(rgb1.b - rgb2.b, 2)
-    )
-  }
-
-  function hexToRgb(hex) {
-    const result = /^#?([a-f\d]{2})([a-f\d]{2})([a-f\d]{2})$/i.exec(hex)
-    return result ? {
-      r: parseInt(result[1], 16),
-      g: parseInt(result[2], 16),
-      b: parseInt(result[3], 16)
-    } : null
-  }
+export default function ColorNamer() {
+  const { derived } = useColorModel()
+  const name = derived && derived.name
 
   return (
     <div className="bg-white dark:bg-gray-800 p-4 rounded-lg shadow mt-4">
       <h2 className="text-xl font-bold mb-2 text-gray-800 dark:text-gray-200">Color Name</h2>
-      <p className="text-lg text-gray-700 dark:text-gray-300">{colorName}</p>
+      <p className="text-lg capitalize text-gray-700 dark:text-gray-300">{name || ''}</p>
     </div>
   )
 }
     '''
-    update_file('components/ColorNamer.js', color_namer_js)
+    plan.append(('components/ColorNamer.js', color_namer_js))
 
     # Create ColorWheel component
     color_wheel_js = '''
 import { useEffect, useRef } from 'react'
+import { useColorModel } from './ColorModelContext'
+
+// The wheel itself is public/color-wheel.png, rendered by colors_update.py: the pixel at
+// hue angle h and distance d shows hsl(h, d / RADIUS * 100%, 50%). Only the marker
+// layer is redrawn when the color changes.
+const SIZE = 300
+const RADIUS = SIZE / 2 - 5
 
-export default function ColorWheel({ color, onChange }) {
-  const canvasRef = useRef(null)
+export default function ColorWheel({ onChange }) {
+  const { model } = useColorModel()
+  const markerRef = useRef(null)
+  const draggingRef = useRef(false)
+  const pendingColorRef = useRef(null)
+  const frameRef = useRef(0)
 
   useEffect(() => {
-    const canvas = canvasRef.current
+    const canvas = markerRef.current
     const ctx = canvas.getContext('2d')
-    const centerX = canvas.width / 2
-    const centerY = canvas.height / 2
-    const radius = Math.min(centerX, centerY) - 5
-
-    // Draw color wheel
-    for (let angle = 0; angle < 360; angle++) {
-      const startAngle = (angle - 2) * Math.PI / 180
-      const endAngle = (angle + 2) * Math.PI / 180
-
-      ctx.beginPath()
-      ctx.moveTo(centerX, centerY)
-      ctx.arc(centerX, centerY, radius, startAngle, endAngle)
-      ctx.closePath()
-
-      const gradient = ctx.createRadialGradient(centerX, centerY, 0, centerX, centerY, radius)
-      gradient.addColorStop(0, '#FFFFFF')
-      gradient.addColorStop(1, `hsl(${angle}, 100%, 50%)`)
-      
-      ctx.fillStyle = gradient
-      ctx.fill()
-    }
+    ctx.clearRect(0, 0, SIZE, SIZE)
+    if (!model) return
 
     // Draw color indicator
-    const hsl = hexToHsl(color)
+    const { hsl } = model
     const indicatorAngle = hsl.h * Math.PI / 180
-    const indicatorRadius = radius * (1 - hsl.s / 100)
-    
+    const indicatorRadius = RADIUS * hsl.s / 100
+
     ctx.beginPath()
     ctx.arc(
-      centerX + indicatorRadius * Math.cos(indicatorAngle),
-      centerY - indicatorRadius * Math.sin(indicatorAngle),
+      SIZE / 2 + indicatorRadius * Math.cos(indicatorAngle),
+      SIZE / 2 - indicatorRadius * Math.sin(indicatorAngle),
       8, 0, 2 * Math.PI
     )
-    ctx.fillStyle = color
+    ctx.fillStyle = model.hex
     ctx.strokeStyle = hsl.l > 50 ? '#000000' : '#FFFFFF'
     ctx.lineWidth = 2
     ctx.fill()
     ctx.stroke()
-  }, [color])
-
-  const handleCanvasClick = (event) => {
-    const canvas = canvasRef.current
-    const rect = canvas.getBoundingClientRect()
-    const x = event.clientX - rect.left
-    const y = event.clientY - rect.top
-    
-    const centerX = canvas.width / 2
-    const centerY = canvas.height / 2
-    const radius = Math.min(centerX, centerY) - 5
-
-    const dx = x - centerX
-    const dy = y - centerY
+  }, [model])
+
+  useEffect(() => {
+    return () => cancelAnimationFrame(frameRef.current)
+  }, [])
+
+  const colorAtPointer = (event) => {
+    const rect = markerRef.current.getBoundingClientRect()
+    const dx = (event.clientX - rect.left) * SIZE / rect.width - SIZE / 2
+    const dy = (event.clientY - rect.top) * SIZE / rect.height - SIZE / 2
     const distance = Math.sqrt(dx * dx + dy * dy)
 
-    if (distance <= radius) {
-      const angle = (Math.atan2(-dy, dx) + Math.PI) * 180 / Math.PI
-      const saturation = Math.min(distance / radius * 100, 100)
-      
-      const hsl = { h: angle, s: saturation, l: 50 }
-      onChange(hslToHex(hsl))
-    }
+    if (distance > RADIUS) return null
+    const hue = (Math.atan2(-dy, dx) * 180 / Math.PI + 360) % 360
+    return hslToHex({ h: hue, s: distance / RADIUS * 100, l: 50 })
   }
 
-  function hexToHsl(hex) {
-    const rgb = hexToRgb(hex)
-    const r = rgb.r / 255
-    const g = rgb.g / 255
-    const b = rgb.b / 255
-    const max = Math.max(r, g, b), min = Math.min(r, g, b)
-    let h, s, l = (max + min) / 2
-
-    if (max === min) {
-      h = s = 0
-    } else {
-      const d = max - min
-      s = l > 0.5 ? d / (2 - max - min) : d / (max + min)
-      switch (max) {
-        case r: h = (g - b) / d + (g < b ? 6 : 0); break
-        case g: h = (b - r) / d + 2; break
-        case b: h = (r - g) / d + 4; break
-      }
-      h /= 6
+  const selectAtPointer = (event) => {
+    const newColor = colorAtPointer(event)
+    if (!newColor) return
+
+    // Coalesce pointer moves into at most one onChange per frame
+    pendingColorRef.current = newColor
+    if (!frameRef.current) {
+      frameRef.current = requestAnimationFrame(() => {
+        frameRef.current = 0
+        onChange(pendingColorRef.current)
+      })
     }
+  }
+
+  const handlePointerDown = (event) => {
+    draggingRef.current = true
+    event.currentTarget.setPointerCapture(event.pointerId)
+    selectAtPointer(event)
+  }
 
-    return { h: h * 360, s: s * 100, l: l * 100 }
+  const handlePointerMove = (event) => {
+    if (draggingRef.current) selectAtPointer(event)
   }
 
-  function hexToRgb(hex) {
-    const result = /^#?([a-f\d]{2})([a-f\d]{2})([a-f\d]{2})$/i.exec(hex)
-    return result ? {
-      r: parseInt(result[1], 16),
-      g: parseInt(result[2], 16),
-      b: parseInt(result[3], 16)
-    } : null
+  const handlePointerUp = () => {
+    draggingRef.current = false
   }
 
   function hslToHex({ h, s, l }) {
@@ -897,70 +849,69 @@ export default function ColorWheel({ color, onChange }) {
   return (
     <div className="bg-white dark:bg-gray-800 p-4 rounded-lg shadow">
       <h2 className="text-xl font-bold mb-4 text-gray-800 dark:text-gray-200">Color Wheel</h2>
-      <canvas
-        ref={canvasRef}
-        width={300}
-        height={300}
-        onClick={handleCanvasClick}
-        className="mx-auto cursor-pointer"
-      ></canvas>
+      <div className="relative mx-auto" style={{ width: SIZE, height: SIZE }}>
+        <img
+          src="/color-wheel.png"
+          width={SIZE}
+          height={SIZE}
+          alt=""
+          draggable={false}
+          className="absolute inset-0 select-none"
+        />
+        <canvas
+          ref={markerRef}
+          width={SIZE}
+          height={SIZE}
+          onPointerDown={handlePointerDown}
+          onPointerMove={handlePointerMove}
+          onPointerUp={handlePointerUp}
+          onPointerCancel={handlePointerUp}
+          className="absolute inset-0 cursor-pointer touch-none"
+        ></canvas>
+      </div>
     </div>
   )
 }
     '''
-    update_file('components/ColorWheel.js', color_wheel_js)
+    plan.append(('components/ColorWheel.js', color_wheel_js))
 
     # Create ColorImageExtractor component
     color_image_extractor_js = '''
-import { useState } from 'react'
+import { useState, useEffect } from 'react'
+import { extractDominantColors } from '@/lib/colorExtraction'
 
 export default function ColorImageExtractor({ onColorExtract }) {
   const [imagePreview, setImagePreview] = useState(null)
+  const [dominantColors, setDominantColors] = useState([])
+  const [isExtracting, setIsExtracting] = useState(false)
+
+  useEffect(() => {
+    return () => {
+      if (imagePreview) URL.revokeObjectURL(imagePreview)
+    }
+  }, [imagePreview])
 
   const handleImageUpload = (event) => {
     const file = event.target.files[0]
     if (file) {
-      const reader = new FileReader()
-      reader.onload = (e) => {
-        setImagePreview(e.target.result)
-        extractColor(e.target.result)
-      }
-      reader.readAsDataURL(file)
+      setImagePreview(URL.createObjectURL(file))
+      extractColors(file)
     }
   }
 
-  const extractColor = (imageSrc) => {
-    const img = new Image()
-    img.crossOrigin = 'Anonymous'
-    img.onload = () => {
-      const canvas = document.createElement('canvas')
-      const ctx = canvas.getContext('2d')
-      canvas.width = img.width
-      canvas.height = img.height
-      ctx.drawImage(img, 0, 0, img.width, img.height)
-      
-      const imageData = ctx.getImageData(0, 0, canvas.width, canvas.height)
-      const data = imageData.data
-      let r = 0, g = 0, b = 0
-
-      for (let i = 0; i < data.length; i += 4) {
-        r += data[i]
-        g += data[i + 1]
-        b += data[i + 2]
+  const extractColors = async (file) => {
+    setIsExtracting(true)
+    try {
+      const colors = await extractDominantColors(file, { count: 5 })
+      setDominantColors(colors)
+      if (colors.length > 0) {
+        onColorExtract(colors[0].hex)
       }
-
-      r = Math.floor(r / (data.length / 4))
-      g = Math.floor(g / (data.length / 4))
-      b = Math.floor(b / (data.length / 4))
-
-      const hex = rgbToHex(r, g, b)
-      onColorExtract(hex)
+    } catch (err) {
+      console.error('Could not extract colors: ', err)
+    } finally {
+      setIsExtracting(false)
     }
-    img.src = imageSrc
-  }
-
-  function rgbToHex(r, g, b) {
-    return "#" + ((1 << 24) + (r << 16) + (g << 8) + b).toString(16).slice(1)
   }
 
   return (
@@ -975,11 +926,29 @@ export default function ColorImageExtractor({ onColorExtract }) {
       {imagePreview && (
         <img src={imagePreview} alt="Uploaded" className="max-w-full h-auto mb-4 rounded-lg" />
       )}
+      {isExtracting && (
+        <p className="text-sm text-gray-600 dark:text-gray-400">Extracting colors...</p>
+      )}
+      {dominantColors.length > 0 && (
+        <div className="flex flex-wrap gap-2">
+          {dominantColors.map(({ hex, weight }) => (
+            <button
+              key={hex}
+              className="flex flex-col items-center focus:outline-none"
+              onClick={() => onColorExtract(hex)}
+              title={hex}
+            >
+              <span className="w-12 h-12 rounded-md shadow-md" style={{ backgroundColor: hex }}></span>
+              <span className="mt-1 text-xs text-gray-600 dark:text-gray-400">{Math.round(weight * 100)}%</span>
+            </button>
+          ))}
+        </div>
+      )}
     </div>
   )
 }
     '''
-    update_file('components/ColorImageExtractor.js', color_image_extractor_js)
+    plan.append(('components/ColorImageExtractor.js', color_image_extractor_js))
 # Continuing the index.js file
     index_js = '''
 import Head from 'next/head'
@@ -1009,7 +978,154 @@ export default function Home() {
   )
 }
     '''
-    update_file('pages/index.js', index_js)
+    plan.append(('pages/index.js', index_js))
+    return plan
+
+def similar_colors_json(similar):
+    # One color per line so regenerating after a table change gives a readable diff
+    lines = [f"    {json.dumps(name)}: {json.dumps(names)}" for name, names in similar.items()]
+    return '{\n  "metric": "de2000",\n  "similar": {\n' + ',\n'.join(lines) + '\n  }\n}\n'
+
+def plan_data_assets(grid_levels=GRID_LEVELS, processes=None):
+    # Static assets precomputed from the color tables in lib/
+    plan = []
+    named_colors = load_named_colors()
+
+    name_index = NamedColorIndex.build(named_colors)
+    name_index_json = name_index.to_json()
+    plan.append(('public/data/color-name-index.json', name_index_json))
+    print(f"Color name index: {len(name_index)} colors, {len(name_index_json)} bytes, built in {name_index.build_ms:.1f} ms")
+
+    start = time.perf_counter()
+    similar = similar_named_colors(SIMILAR_COLORS_COUNT, candidates=SIMILAR_COLORS_CANDIDATES)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    plan.append((SIMILAR_COLORS_FILE, similar_colors_json(similar)))
+    print(f"Similar colors: {len(similar)} colors × {SIMILAR_COLORS_COUNT}, built in {elapsed_ms:.1f} ms")
+
+    plan.append(('public/color-wheel.png', encode_png(render_color_wheel())))
+
+    # Contrast matrices for the collection pages: named colors by table position, brand
+    # colors deduplicated by hex and named after the first brand that uses them
+    brand_colors = load_brand_colors()
+    brand_names = {}
+    for brand in brand_colors:
+        for hex_color in brand['colors']:
+            brand_names.setdefault(hex_color.upper(), brand['brand'])
+    collections = [
+        ('named-colors', [c['name'] for c in named_colors], [c['hex'] for c in named_colors]),
+        ('brand-colors', list(brand_names.values()), list(brand_names)),
+    ]
+    for collection, names, hex_colors in collections:
+        start = time.perf_counter()
+        matrix_json = contrast_matrix_json(names, hex_colors)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        plan.append((f'public/data/contrast-{collection}.json', matrix_json))
+        print(f"Contrast matrix ({collection}): {len(hex_colors)} colors, {len(matrix_json)} bytes, built in {elapsed_ms:.1f} ms")
+
+    # Nearest AA-passing foreground for every ordered pair within a brand palette and for
+    # each brand color as text on white and on black
+    pairs = sorted({
+        (fg.upper(), bg.upper())
+        for brand in brand_colors
+        for fg in brand['colors']
+        for bg in brand['colors'] + ['#FFFFFF', '#000000']
+        if fg.upper() != bg.upper()
+    })
+    start = time.perf_counter()
+    suggestions_json = accessible_suggestions_json(pairs, ACCESSIBLE_TARGET)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    plan.append(('public/data/accessible-brand-colors.json', suggestions_json))
+    print(f"Accessible suggestions: {len(pairs)} pairs, {len(suggestions_json)} bytes, built in {elapsed_ms:.1f} ms")
+
+    # OKLab gradient through each brand palette, reduced to minimal CSS stops
+    start = time.perf_counter()
+    gradients_json = palette_gradients_json({brand['brand']: brand['colors'] for brand in brand_colors})
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    plan.append(('public/data/brand-gradients.json', gradients_json))
+    print(f"Brand gradients: {len(brand_colors)} palettes, {len(gradients_json)} bytes, built in {elapsed_ms:.1f} ms")
+
+    # Prefix, trigram and RGB grid index behind the collection page search boxes
+    search_index = ColorSearchIndex.build(named_colors, brand_colors)
+    search_json = search_index.to_json()
+    plan.append(('public/data/color-search-index.json', search_json))
+    print(f"Color search index: {len(search_index)} entries, {len(search_json)} bytes, built in {search_index.build_ms:.1f} ms")
+
+    # HSL and OKLCH 50-950 scales plus tints and shades for every named and brand color,
+    # in one array pass, for /tools/shade-generator and the /colors/[name] pages
+    scale_colors = {c['hex'].upper(): None for c in named_colors} | brand_names
+    start = time.perf_counter()
+    scales_json = shade_scales_json(scale_colors)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    plan.append(('public/data/shade-scales.json', scales_json))
+    print(f"Shade scales: {len(scale_colors)} colors, {len(scales_json)} bytes, built in {elapsed_ms:.1f} ms")
+
+    # Static palette pages for every color on a quantized grid (app/palettes/[hex])
+    if grid_levels:
+        start = time.perf_counter()
+        grid_files = build_grid(grid_levels, processes)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        plan.extend(grid_files)
+        grid_bytes = sum(len(text) for _, text in grid_files)
+        print(f"Color grid: {grid_levels ** 3} colors in {len(grid_files) - 1} shards, {grid_bytes} bytes, built in {elapsed_ms:.1f} ms")
+
+    return plan
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Regenerate the Color Explorer components.")
+    parser.add_argument('--dry-run', action='store_true', help="print the plan and a unified diff without writing")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="size of the write thread pool")
+    parser.add_argument('--no-manifest', action='store_true', help="always hash files on disk instead of using the manifest")
+    parser.add_argument('--grid-levels', type=int, default=GRID_LEVELS, help="values per channel of the static palette grid (0 to skip)")
+    parser.add_argument('--processes', type=int, default=None, help="processes for building grid shards (default: all cores)")
+    parser.add_argument('--data-only', action='store_true', help="only write the precomputed assets under public/ (run by npm prebuild)")
+
+    # Batch subcommands stream color lists, images or design tokens instead of writing site
+    # files (see color_batch.py, color_extract.py and color_tokens.py)
+    subparsers = parser.add_subparsers(dest='command', metavar='command')
+    add_batch_commands(subparsers)
+    add_extract_command(subparsers)
+    add_tokens_command(subparsers)
+    add_search_command(subparsers)
+    return parser
+
+def main(argv=None, manifest_path=MANIFEST_FILE):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.grid_levels != 0 and not 2 <= args.grid_levels <= 256:
+        # Channel values are spaced 255 / (levels - 1) apart, so one level has no spacing
+        parser.error("--grid-levels must be 0 (skip the grid) or from 2 to 256")
+    if args.command:
+        try:
+            rows = args.run(args)
+        except (ValueError, RuntimeError, OSError) as error:
+            sys.exit(f"Error: {error}")
+        print(f"{args.command}: {rows} {args.unit}", file=sys.stderr)
+        return
+
+    # Ensure we're in the project directory (App Router trees have app/ instead of pages/)
+    if not (os.path.exists('app') or os.path.exists('pages')) or not os.path.exists('components'):
+        sys.exit("Error: Make sure you run this script from the root of your color-explorer project.")
+
+    if args.data_only:
+        plan = plan_data_assets(args.grid_levels, args.processes)
+    else:
+        plan = plan_updates(args.grid_levels, args.processes)
+    if not os.path.exists('pages'):
+        # The app/ router already serves the home page; a pages/index.js would conflict with it
+        plan = [(path, content) for path, content in plan if not path.startswith('pages/')]
+    if args.dry_run:
+        print_plan(plan)
+        return
+
+    if args.no_manifest:
+        manifest_path = None
+    manifest = load_manifest(manifest_path) if manifest_path else None
+    statuses = apply_plan(plan, manifest, args.workers)
+    if manifest is not None:
+        save_manifest(manifest_path, manifest)
+    print_write_summary(statuses)
+    if args.data_only:
+        return
 
     print("Update complete! The Color Explorer has been enhanced with new features and improved styling.")
     print("New components added: ColorBlindnessSimulator, ColorNamer, ColorWheel, and ColorImageExtractor.")
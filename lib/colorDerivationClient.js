@@ -0,0 +1,100 @@
+// Main-thread side of lib/colorDerivations.worker.js
+// At most one request is in the worker and one waits behind it. A newer request replaces
+// the waiting one, whose promise resolves to null, so a fast drag on the wheel or picker
+// never builds a backlog: the worker only sees the latest color once it is free.
+
+import { deriveColor } from './colorDerivations';
+import { getColorModelStats } from './colorModel';
+import { loadColorNameIndex } from './colorNameIndex';
+
+let worker = null;
+let nextRequestId = 0;
+let inFlight = null;
+let waiting = null;
+let workerStats = null;
+let workerFailed = false;
+
+const supportsWorkerDerivation = () => typeof Worker !== 'undefined' && !workerFailed;
+
+const deriveOnMainThread = (color, harmony) => {
+  return loadColorNameIndex()
+    .catch(() => null)
+    .then(nameIndex => deriveColor(color, harmony, nameIndex));
+};
+
+// A worker that fails to load or crashes is dropped for the rest of the page; its request
+// and the waiting one are derived on this thread, as are all later ones
+const fallBackToMainThread = (reason) => {
+  console.error('Color derivation worker failed, deriving on the main thread:', reason);
+  if (worker) worker.terminate();
+  worker = null;
+  workerFailed = true;
+  const requests = [inFlight, waiting].filter(Boolean);
+  inFlight = null;
+  waiting = null;
+  for (const request of requests) {
+    deriveOnMainThread(request.color, request.harmony).then(request.resolve, request.reject);
+  }
+};
+
+const getWorker = () => {
+  if (!worker) {
+    worker = new Worker(new URL('./colorDerivations.worker.js', import.meta.url));
+    worker.onerror = (event) => {
+      event.preventDefault();
+      fallBackToMainThread(event.message || 'worker error');
+    };
+    worker.onmessageerror = () => fallBackToMainThread('unreadable worker message');
+    worker.onmessage = ({ data }) => {
+      const request = inFlight;
+      inFlight = null;
+      if (data.stats) workerStats = data.stats;
+      if (request && request.id === data.id) {
+        if (data.error) {
+          request.reject(new Error(data.error));
+        } else {
+          request.resolve(data.result);
+        }
+      }
+      sendNext();
+    };
+  }
+  return worker;
+};
+
+const sendNext = () => {
+  if (inFlight || !waiting) return;
+  inFlight = waiting;
+  waiting = null;
+  inFlight.id = nextRequestId++;
+  try {
+    getWorker().postMessage({ id: inFlight.id, color: inFlight.color, harmony: inFlight.harmony });
+  } catch (error) {
+    // new Worker() throws where workers are blocked
+    fallBackToMainThread(error);
+  }
+};
+
+/**
+ * Derive a base color's data (see deriveColor) in the worker
+ * Resolves to the result, or to null if a newer request replaced this one first.
+ */
+export const requestColorDerivation = (color, harmony) => {
+  if (!supportsWorkerDerivation()) {
+    return deriveOnMainThread(color, harmony);
+  }
+
+  return new Promise((resolve, reject) => {
+    if (waiting) waiting.resolve(null);
+    waiting = { color, harmony, resolve, reject };
+    sendNext();
+  });
+};
+
+/**
+ * Model cache counters of the thread that derives colors: the worker's as of its last
+ * reply, or this thread's when derivation runs here
+ */
+export const getDerivationCacheStats = () => {
+  return supportsWorkerDerivation() ? workerStats : getColorModelStats();
+};
@@ -0,0 +1,95 @@
+// Everything ColorExplorer shows for a base color, computed in one pass
+// Runs in lib/colorDerivations.worker.js; kept free of DOM access so it can also run on
+// the main thread where workers are unavailable.
+
+import { colorBlindnessTypes, simulatePalette } from './colorBlindness';
+import { findNearestColors } from './colorNameIndex';
+import { getColorModel, getModelContrast } from './colorModel';
+import { getWCAGLevel } from './contrastUtils';
+
+// Lightness stops of the color scheme, lightest first
+export const SCHEME_LIGHTNESS = [90, 70, 50, 30, 10];
+
+const simulatedTypes = colorBlindnessTypes.filter(type => type.id !== 'normal');
+
+const toHex = (value) => Math.round(value).toString(16).padStart(2, '0');
+
+// Parsed once through the shared model cache; anything unparseable reads as black,
+// like the component helpers did
+const modelFor = (color) => getColorModel(color) || getColorModel('#000000');
+
+const hslToHex = ({ h, s, l }) => {
+  l /= 100;
+  const a = s * Math.min(l, 1 - l) / 100;
+  const f = n => {
+    const k = (n + h / 30) % 12;
+    const color = l - a * Math.max(Math.min(k - 3, 9 - k, 1), -1);
+    return toHex(255 * color);
+  };
+  return `#${f(0)}${f(8)}${f(4)}`;
+};
+
+const rotate = (hsl, angle) => ({ ...hsl, h: (hsl.h + angle + 360) % 360 });
+const complement = (hsl) => ({ ...hsl, h: (hsl.h + 180) % 360 });
+
+/**
+ * [color, ...variations] for a harmony, as ColorExplorer.generatePalette builds it
+ */
+export const generatePalette = (color, harmony) => {
+  const { hsl } = modelFor(color);
+  const palette = [color];
+
+  switch (harmony) {
+    case 'complementary':
+      palette.push(hslToHex(complement(hsl)));
+      break;
+    case 'analogous':
+      palette.push(hslToHex(rotate(hsl, 30)), hslToHex(rotate(hsl, -30)));
+      break;
+    case 'triadic':
+      palette.push(hslToHex(rotate(hsl, 120)), hslToHex(rotate(hsl, -120)));
+      break;
+    case 'tetradic':
+      palette.push(hslToHex(rotate(hsl, 90)), hslToHex(complement(hsl)), hslToHex(rotate(hsl, -90)));
+      break;
+    case 'monochromatic':
+      palette.push(hslToHex({ ...hsl, l: hsl.l * 0.7 }), hslToHex({ ...hsl, l: hsl.l * 1.3 }));
+      break;
+    case 'split-complementary':
+      palette.push(hslToHex(rotate(complement(hsl), 30)), hslToHex(rotate(complement(hsl), -30)));
+      break;
+  }
+
+  return palette;
+};
+
+/**
+ * Combined result for one base color: values, palette, scheme, contrast against the
+ * first palette variation, color blindness simulations and (with an index) the name
+ */
+export const deriveColor = (color, harmony, nameIndex = null) => {
+  const model = modelFor(color);
+  const { rgb, hsl } = model;
+  const palette = generatePalette(color, harmony);
+  const contrastColor = palette[1] || '#ffffff';
+  const ratio = getModelContrast(model, modelFor(contrastColor));
+
+  const blindness = {};
+  simulatedTypes.forEach(type => {
+    blindness[type.name] = simulatePalette([color], type.id)[0];
+  });
+
+  return {
+    color,
+    harmony,
+    rgb,
+    hsl,
+    luminance: model.luminance,
+    lab: model.lab,
+    palette,
+    scheme: SCHEME_LIGHTNESS.map(l => hslToHex({ ...hsl, l })),
+    contrast: { color: contrastColor, ratio, level: getWCAGLevel(ratio) },
+    blindness,
+    name: nameIndex ? findNearestColors(nameIndex, rgb.r, rgb.g, rgb.b)[0].name : null
+  };
+};
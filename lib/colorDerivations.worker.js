@@ -0,0 +1,19 @@
+// Derives everything ColorExplorer shows for a base color off the main thread
+
+import { deriveColor } from './colorDerivations';
+import { getColorModelStats } from './colorModel';
+import { loadColorNameIndex } from './colorNameIndex';
+
+self.onmessage = async ({ data }) => {
+  const { id, color, harmony } = data;
+
+  try {
+    // The name index is fetched once; naming is skipped if it cannot be loaded
+    const nameIndex = await loadColorNameIndex().catch(() => null);
+    const result = deriveColor(color, harmony, nameIndex);
+    // The worker has its own model cache; its counters ride along for the debug overlay
+    self.postMessage({ id, result, stats: getColorModelStats() });
+  } catch (error) {
+    self.postMessage({ id, error: error.message });
+  }
+};
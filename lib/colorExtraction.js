@@ -0,0 +1,122 @@
+// Dominant color extraction for uploaded images
+// Images are downsampled to a pixel budget while decoding, then quantized in a Web Worker
+// (falling back to the main thread where OffscreenCanvas is unavailable or the worker fails).
+
+import { addPixels, createHistogram, medianCut } from './colorQuantize';
+
+// Sampled pixels per image; 256×256 is plenty for a 5-color palette
+export const DEFAULT_PIXEL_BUDGET = 256 * 256;
+
+let worker = null;
+let nextRequestId = 0;
+const pendingRequests = new Map();
+let workerFailed = false;
+
+// A worker that fails to load or crashes is dropped for the rest of the page. Its bitmaps
+// were transferred away, so pending images are decoded again and quantized on this thread.
+const fallBackToMainThread = (reason) => {
+  console.error('Color extraction worker failed, extracting on the main thread:', reason);
+  if (worker) worker.terminate();
+  worker = null;
+  workerFailed = true;
+  const requests = [...pendingRequests.values()];
+  pendingRequests.clear();
+  for (const { file, size, count, resolve, reject } of requests) {
+    decodeSample(file, size)
+      .then(bitmap => extractOnMainThread(bitmap, size.width, size.height, count))
+      .then(resolve, reject);
+  }
+};
+
+const getWorker = () => {
+  if (!worker) {
+    worker = new Worker(new URL('./colorExtraction.worker.js', import.meta.url));
+    worker.onerror = (event) => {
+      event.preventDefault();
+      fallBackToMainThread(event.message || 'worker error');
+    };
+    worker.onmessageerror = () => fallBackToMainThread('unreadable worker message');
+    worker.onmessage = ({ data }) => {
+      const request = pendingRequests.get(data.id);
+      if (!request) return;
+      pendingRequests.delete(data.id);
+      if (data.error) {
+        request.reject(new Error(data.error));
+      } else {
+        request.resolve(data.colors);
+      }
+    };
+  }
+  return worker;
+};
+
+const supportsWorkerExtraction = () => {
+  return typeof Worker !== 'undefined' && typeof OffscreenCanvas !== 'undefined' && !workerFailed;
+};
+
+/**
+ * Width and height that fit the pixel budget, keeping the aspect ratio
+ */
+export const getSampleSize = (width, height, maxPixels = DEFAULT_PIXEL_BUDGET) => {
+  const scale = Math.min(1, Math.sqrt(maxPixels / (width * height)));
+  return {
+    width: Math.max(1, Math.round(width * scale)),
+    height: Math.max(1, Math.round(height * scale))
+  };
+};
+
+const loadImageSize = (url) => new Promise((resolve, reject) => {
+  const img = new Image();
+  img.onload = () => resolve({ width: img.naturalWidth, height: img.naturalHeight });
+  img.onerror = () => reject(new Error('Could not load image'));
+  img.src = url;
+});
+
+// Decode straight to the sample size so the full-resolution bitmap is never allocated
+const decodeSample = (file, size) => createImageBitmap(file, {
+  resizeWidth: size.width,
+  resizeHeight: size.height,
+  resizeQuality: 'medium'
+});
+
+const extractOnMainThread = (bitmap, width, height, count) => {
+  const canvas = document.createElement('canvas');
+  canvas.width = width;
+  canvas.height = height;
+  const ctx = canvas.getContext('2d', { willReadFrequently: true });
+  ctx.drawImage(bitmap, 0, 0, width, height);
+  bitmap.close();
+  return medianCut(addPixels(createHistogram(), ctx.getImageData(0, 0, width, height).data), count);
+};
+
+/**
+ * Extract the dominant colors of an image File/Blob
+ * Resolves to [{ hex, weight }], heaviest first.
+ */
+export const extractDominantColors = async (file, { count = 5, maxPixels = DEFAULT_PIXEL_BUDGET } = {}) => {
+  const url = URL.createObjectURL(file);
+  let size;
+  try {
+    const { width, height } = await loadImageSize(url);
+    size = getSampleSize(width, height, maxPixels);
+  } finally {
+    URL.revokeObjectURL(url);
+  }
+
+  const bitmap = await decodeSample(file, size);
+
+  if (!supportsWorkerExtraction()) {
+    return extractOnMainThread(bitmap, size.width, size.height, count);
+  }
+
+  const id = nextRequestId++;
+  return new Promise((resolve, reject) => {
+    pendingRequests.set(id, { file, size, count, resolve, reject });
+    try {
+      getWorker().postMessage({ id, bitmap, ...size, count }, [bitmap]);
+    } catch (error) {
+      // new Worker() throws where workers are blocked
+      fallBackToMainThread(error);
+    }
+  });
+};
@@ -0,0 +1,27 @@
+// Downsamples an ImageBitmap on an OffscreenCanvas and quantizes it tile by tile
+
+import { addPixels, createHistogram, medianCut } from './colorQuantize';
+
+// Rows per getImageData call; keeps each tile's RGBA copy small
+const TILE_ROWS = 64;
+
+self.onmessage = ({ data }) => {
+  const { id, bitmap, width, height, count } = data;
+
+  try {
+    const canvas = new OffscreenCanvas(width, height);
+    const ctx = canvas.getContext('2d', { willReadFrequently: true });
+    ctx.drawImage(bitmap, 0, 0, width, height);
+    bitmap.close();
+
+    const histogram = createHistogram();
+    for (let y = 0; y < height; y += TILE_ROWS) {
+      const rows = Math.min(TILE_ROWS, height - y);
+      addPixels(histogram, ctx.getImageData(0, y, width, rows).data);
+    }
+
+    self.postMessage({ id, colors: medianCut(histogram, count) });
+  } catch (error) {
+    self.postMessage({ id, error: error.message });
+  }
+};
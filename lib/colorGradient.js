@@ -0,0 +1,174 @@
+// Perceptual gradients (same algorithm as color_gradient.py)
+// Anchors are interpolated in OKLab, or OKLCH along the shorter hue arc, and the curve is
+// reduced to the fewest CSS stops whose sRGB segments stay within a ΔE tolerance of it.
+
+import { hexToRgb, rgbToHex, rgbToOklab, oklabToRgb } from './colorUtils';
+
+export const INTERPOLATION_SPACES = ['oklab', 'oklch', 'srgb'];
+
+// Largest ΔE (Euclidean OKLab distance ×100) between the stops and the true curve
+export const DEFAULT_TOLERANCE = 1;
+
+// Samples of the true curve checked against the stops
+export const DEFAULT_RESOLUTION = 256;
+
+// Below this OKLCH chroma a color has no meaningful hue and takes the other anchor's
+const ACHROMATIC_CHROMA = 1e-4;
+
+// Minimal stops for whole palettes, precomputed by colors_update.py
+export const PALETTE_GRADIENTS_URL = '/data/brand-gradients.json';
+
+let gradientsPromise = null;
+
+const toLch = ({ l, a, b }) => ({
+  l,
+  c: Math.hypot(a, b),
+  h: (((Math.atan2(b, a) * 180) / Math.PI) % 360 + 360) % 360
+});
+
+const fromLch = (l, c, h) => {
+  const rad = (h * Math.PI) / 180;
+  return oklabToRgb(l, c * Math.cos(rad), c * Math.sin(rad));
+};
+
+const mix = (start, end, u) => start + (end - start) * u;
+
+const oklabDistance = (p, q) => Math.hypot(p.l - q.l, p.a - q.a, p.b - q.b) * 100;
+
+/**
+ * Unrounded RGB of the gradient through `anchors` (hex) at each position in t (0-1)
+ * Anchor positions (0-1, ascending) default to evenly spaced.
+ */
+export const sampleCurve = (anchors, t, { space = 'oklab', positions = null } = {}) => {
+  if (!INTERPOLATION_SPACES.includes(space)) throw new Error(`Unknown interpolation space: ${space}`);
+  const rgb = anchors.map(hexToRgb);
+  const lab = rgb.map(({ r, g, b }) => rgbToOklab(r, g, b));
+  const lch = lab.map(toLch);
+  const at = positions || anchors.map((_, i) => i / (anchors.length - 1));
+
+  return t.map((x) => {
+    let segment = 0;
+    while (segment < at.length - 2 && x >= at[segment + 1]) segment++;
+    const span = at[segment + 1] - at[segment];
+    const u = Math.min(1, Math.max(0, span > 0 ? (x - at[segment]) / span : 0));
+    const i = segment, j = segment + 1;
+
+    if (space === 'srgb') {
+      return { r: mix(rgb[i].r, rgb[j].r, u), g: mix(rgb[i].g, rgb[j].g, u), b: mix(rgb[i].b, rgb[j].b, u) };
+    }
+    if (space === 'oklab') {
+      return oklabToRgb(mix(lab[i].l, lab[j].l, u), mix(lab[i].a, lab[j].a, u), mix(lab[i].b, lab[j].b, u));
+    }
+    // An achromatic end takes the other end's hue, so grey-to-color does not swing round the wheel
+    const startHue = lch[i].c < ACHROMATIC_CHROMA ? lch[j].h : lch[i].h;
+    const endHue = lch[j].c < ACHROMATIC_CHROMA ? startHue : lch[j].h;
+    const hueDelta = ((endHue - startHue + 180) % 360 + 360) % 360 - 180;
+    return fromLch(mix(lch[i].l, lch[j].l, u), mix(lch[i].c, lch[j].c, u), startHue + hueDelta * u);
+  });
+};
+
+const roundRgb = ({ r, g, b }) => ({ r: Math.round(r), g: Math.round(g), b: Math.round(b) });
+
+/**
+ * `count` evenly spaced hex colors along the gradient
+ */
+export const sampleGradient = (anchors, count, options) => {
+  const t = Array.from({ length: count }, (_, i) => (count > 1 ? i / (count - 1) : 0));
+  return sampleCurve(anchors, t, options).map(c => {
+    const { r, g, b } = roundRgb(c);
+    return rgbToHex(r, g, b);
+  });
+};
+
+/**
+ * Fewest [{ color, position }] stops (position in %) reproducing the gradient within tolerance
+ * Each stop reaches as far along the densely sampled curve as it can: gallop out, then bisect.
+ */
+export const gradientStops = (anchors, {
+  space = 'oklab',
+  tolerance = DEFAULT_TOLERANCE,
+  resolution = DEFAULT_RESOLUTION,
+  positions = null
+} = {}) => {
+  const at = positions || anchors.map((_, i) => i / (anchors.length - 1));
+  // Evenly spaced samples plus the anchors themselves, where the curve has corners
+  const t = [...new Set([...Array.from({ length: resolution }, (_, i) => i / (resolution - 1)), ...at])]
+    .sort((a, b) => a - b);
+  const curve = sampleCurve(anchors, t, { space, positions: at });
+  const stopRgb = curve.map(roundRgb);
+  const curveLab = curve.map(({ r, g, b }) => rgbToOklab(r, g, b));
+  const last = t.length - 1;
+
+  const fits = (i, j) => {
+    for (let k = i + 1; k < j; k++) {
+      const u = (t[k] - t[i]) / (t[j] - t[i]);
+      const chord = rgbToOklab(
+        mix(stopRgb[i].r, stopRgb[j].r, u),
+        mix(stopRgb[i].g, stopRgb[j].g, u),
+        mix(stopRgb[i].b, stopRgb[j].b, u)
+      );
+      if (oklabDistance(chord, curveLab[k]) > tolerance) return false;
+    }
+    return true;
+  };
+
+  const indices = [0];
+  let i = 0;
+  while (i < last) {
+    let good = i + 1, bad = -1, step = 1;
+    while (good < last) {
+      const probe = Math.min(i + step * 2, last);
+      if (!fits(i, probe)) {
+        bad = probe;
+        break;
+      }
+      good = probe;
+      step *= 2;
+    }
+    if (bad >= 0) {
+      while (bad - good > 1) {
+        const mid = Math.floor((good + bad) / 2);
+        if (fits(i, mid)) good = mid;
+        else bad = mid;
+      }
+    }
+    indices.push(good);
+    i = good;
+  }
+
+  return indices.map(k => {
+    const { r, g, b } = stopRgb[k];
+    return { color: rgbToHex(r, g, b), position: Math.round(t[k] * 10000) / 100 };
+  });
+};
+
+/**
+ * CSS linear-gradient for stops; direction is an angle in degrees or a keyword like 'to right'
+ */
+export const gradientCss = (stops, direction = 90) => {
+  const dir = typeof direction === 'number' ? `${direction}deg` : direction;
+  return `linear-gradient(${dir}, ${stops.map(s => `${s.color} ${s.position}%`).join(', ')})`;
+};
+
+/**
+ * Fetch the precomputed palette gradients once: { space, tolerance, gradients: { name: [[hex, %]] } }
+ */
+export const loadPaletteGradients = () => {
+  if (!gradientsPromise) {
+    gradientsPromise = fetch(PALETTE_GRADIENTS_URL)
+      .then(res => res.json())
+      .catch(error => {
+        gradientsPromise = null;
+        throw error;
+      });
+  }
+  return gradientsPromise;
+};
+
+/**
+ * Stops of a precomputed palette gradient, in the { color, position } shape of gradientStops
+ */
+export const getPaletteGradient = (data, name) => {
+  const stops = data.gradients[name];
+  return stops ? stops.map(([color, position]) => ({ color, position })) : null;
+};
@@ -0,0 +1,107 @@
+// Build-time access to the quantized color grid written by colors_update.py
+// (public/data/grid, see color_grid.py). Server only: shards are read from disk.
+
+import fs from 'fs';
+import path from 'path';
+
+const GRID_DIR = path.join(process.cwd(), 'public', 'data', 'grid');
+
+let gridIndex;
+const shardCache = new Map();
+
+/**
+ * The grid index, or null when the generator has not been run
+ */
+export const getGridIndex = () => {
+  if (gridIndex === undefined) {
+    try {
+      gridIndex = JSON.parse(fs.readFileSync(path.join(GRID_DIR, 'index.json'), 'utf8'));
+    } catch (error) {
+      gridIndex = null;
+    }
+  }
+  return gridIndex;
+};
+
+const readShard = (red) => {
+  if (!shardCache.has(red)) {
+    const index = getGridIndex();
+    const records = JSON.parse(fs.readFileSync(path.join(GRID_DIR, index.shards[red]), 'utf8'));
+    shardCache.set(red, records);
+  }
+  return shardCache.get(red);
+};
+
+/**
+ * Every grid color as a lowercase 6-digit hex without '#', for generateStaticParams
+ */
+export const getGridHexes = () => {
+  const index = getGridIndex();
+  if (!index) return [];
+  const toHex = (v) => v.toString(16).padStart(2, '0');
+  const hexes = [];
+  for (const r of index.values) {
+    for (const g of index.values) {
+      for (const b of index.values) {
+        hexes.push(toHex(r) + toHex(g) + toHex(b));
+      }
+    }
+  }
+  return hexes;
+};
+
+/**
+ * Precomputed record for a grid color ('#rrggbb' or 'rrggbb'), or null if it is off the grid
+ */
+export const getGridColor = (hex) => {
+  const index = getGridIndex();
+  const match = /^#?([a-f\d]{2})([a-f\d]{2})([a-f\d]{2})$/i.exec(hex);
+  if (!index || !match) return null;
+
+  const [r, g, b] = match.slice(1).map(c => index.values.indexOf(parseInt(c, 16)));
+  if (r < 0 || g < 0 || b < 0) return null;
+  // Shards hold one red level each, in green-major, blue-minor order
+  return readShard(r)[g * index.levels + b];
+};
+
+const nearestLevel = (values, channel) => {
+  let best = 0;
+  for (let i = 1; i < values.length; i++) {
+    if (Math.abs(values[i] - channel) < Math.abs(values[best] - channel)) best = i;
+  }
+  return best;
+};
+
+const gridHex = (values, levels) => levels.map(i => values[i].toString(16).padStart(2, '0')).join('');
+
+/**
+ * The grid color closest to any '#rrggbb' color, channel by channel, as its page's hex; null without a grid
+ */
+export const getNearestGridHex = (hex) => {
+  const index = getGridIndex();
+  const match = /^#?([a-f\d]{2})([a-f\d]{2})([a-f\d]{2})$/i.exec(hex);
+  if (!index || !match) return null;
+  return gridHex(index.values, match.slice(1).map(c => nearestLevel(index.values, parseInt(c, 16))));
+};
+
+/**
+ * Grid colors one level away on each channel, as [{ channel, step, hex }], for linking palette pages
+ */
+export const getGridNeighbors = (hex) => {
+  const index = getGridIndex();
+  const match = /^#?([a-f\d]{2})([a-f\d]{2})([a-f\d]{2})$/i.exec(hex);
+  if (!index || !match) return [];
+  const levels = match.slice(1).map(c => index.values.indexOf(parseInt(c, 16)));
+  if (levels.some(level => level < 0)) return [];
+  const neighbors = [];
+  ['r', 'g', 'b'].forEach((channel, axis) => {
+    for (const step of [-1, 1]) {
+      const moved = [...levels];
+      moved[axis] += step;
+      if (moved[axis] >= 0 && moved[axis] < index.levels) {
+        neighbors.push({ channel, step, hex: gridHex(index.values, moved) });
+      }
+    }
+  });
+  return neighbors;
+};
@@ -0,0 +1,141 @@
+// Parsed form of a color, computed once per color and shared by everything that shows it
+// Models are memoized in a small LRU cache keyed by the 24-bit RGB value, so '#3b82f6',
+// '3B82F6' and '#38f' style inputs of the same color share one entry.
+
+import { getRelativeLuminance } from './contrastUtils';
+
+// Entries kept before the least recently used one is dropped
+export const MODEL_CACHE_SIZE = 256;
+
+// sRGB (D65) -> XYZ and the D65 reference white, as in color_distance.py
+const SRGB_TO_XYZ = [
+  [0.4124564, 0.3575761, 0.1804375],
+  [0.2126729, 0.7151522, 0.0721750],
+  [0.0193339, 0.1191920, 0.9503041]
+];
+const WHITE_D65 = [0.95047, 1.0, 1.08883];
+const LAB_EPSILON = 216 / 24389;
+const LAB_KAPPA = 24389 / 27;
+
+/**
+ * Linearized sRGB channel for every 8-bit value (IEC 61966-2-1 transfer function)
+ */
+const SRGB_LINEAR = (() => {
+  const table = new Float64Array(256);
+  for (let i = 0; i < 256; i++) {
+    const val = i / 255;
+    table[i] = val <= 0.04045 ? val / 12.92 : Math.pow((val + 0.055) / 1.055, 2.4);
+  }
+  return table;
+})();
+
+const cache = new Map();
+const stats = { hits: 0, misses: 0, evictions: 0 };
+
+/**
+ * 24-bit integer for a 3- or 6-digit hex color (with or without '#'), or -1
+ */
+export const parseColorKey = (hex) => {
+  if (typeof hex !== 'string') return -1;
+  const digits = hex[0] === '#' ? hex.slice(1) : hex;
+  if (!/^([a-f\d]{3}|[a-f\d]{6})$/i.test(digits)) return -1;
+  const full = digits.length === 3
+    ? digits[0] + digits[0] + digits[1] + digits[1] + digits[2] + digits[2]
+    : digits;
+  return parseInt(full, 16);
+};
+
+const rgbToHsl = ({ r, g, b }) => {
+  r /= 255;
+  g /= 255;
+  b /= 255;
+  const max = Math.max(r, g, b), min = Math.min(r, g, b);
+  let h, s, l = (max + min) / 2;
+
+  if (max === min) {
+    h = s = 0;
+  } else {
+    const d = max - min;
+    s = l > 0.5 ? d / (2 - max - min) : d / (max + min);
+    switch (max) {
+      case r: h = (g - b) / d + (g < b ? 6 : 0); break;
+      case g: h = (b - r) / d + 2; break;
+      case b: h = (r - g) / d + 4; break;
+    }
+    h /= 6;
+  }
+
+  return { h: h * 360, s: s * 100, l: l * 100 };
+};
+
+const rgbToLab = ({ r, g, b }) => {
+  const linear = [SRGB_LINEAR[r], SRGB_LINEAR[g], SRGB_LINEAR[b]];
+  const f = SRGB_TO_XYZ.map((row, i) => {
+    const t = (row[0] * linear[0] + row[1] * linear[1] + row[2] * linear[2]) / WHITE_D65[i];
+    return t > LAB_EPSILON ? Math.cbrt(t) : (LAB_KAPPA * t + 16) / 116;
+  });
+  return { l: 116 * f[1] - 16, a: 500 * (f[0] - f[1]), b: 200 * (f[1] - f[2]) };
+};
+
+const buildModel = (key) => {
+  const rgb = { r: key >> 16, g: (key >> 8) & 0xff, b: key & 0xff };
+  return Object.freeze({
+    key,
+    hex: '#' + (key + (1 << 24)).toString(16).slice(1).toUpperCase(),
+    rgb,
+    hsl: rgbToHsl(rgb), // unrounded: h 0..360, s and l 0..100
+    luminance: getRelativeLuminance(rgb.r, rgb.g, rgb.b),
+    lab: rgbToLab(rgb)
+  });
+};
+
+/**
+ * { key, hex, rgb, hsl, luminance, lab } for a hex color, or null if it does not parse
+ * Models are frozen and shared between callers, so they must not be modified.
+ */
+export const getColorModel = (hex) => {
+  const key = parseColorKey(hex);
+  if (key < 0) return null;
+
+  let model = cache.get(key);
+  if (model) {
+    stats.hits++;
+    // Re-insert so Map order stays least recently used first
+    cache.delete(key);
+  } else {
+    stats.misses++;
+    model = buildModel(key);
+    if (cache.size >= MODEL_CACHE_SIZE) {
+      cache.delete(cache.keys().next().value);
+      stats.evictions++;
+    }
+  }
+  cache.set(key, model);
+  return model;
+};
+
+/**
+ * Contrast ratio between two models, from their cached luminances
+ */
+export const getModelContrast = (model1, model2) => {
+  const lighter = Math.max(model1.luminance, model2.luminance);
+  const darker = Math.min(model1.luminance, model2.luminance);
+  return (lighter + 0.05) / (darker + 0.05);
+};
+
+/**
+ * Cache counters for this thread: { hits, misses, evictions, size, capacity, hitRate }
+ */
+export const getColorModelStats = () => {
+  const lookups = stats.hits + stats.misses;
+  return {
+    ...stats,
+    size: cache.size,
+    capacity: MODEL_CACHE_SIZE,
+    hitRate: lookups ? stats.hits / lookups : 0
+  };
+};
+
+export const resetColorModelStats = () => {
+  stats.hits = stats.misses = stats.evictions = 0;
+};
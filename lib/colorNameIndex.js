@@ -0,0 +1,101 @@
+// Nearest named color lookup over the k-d tree built by colors_update.py
+// (public/data/color-name-index.json, see color_index.py for the layout)
+
+export const COLOR_NAME_INDEX_URL = '/data/color-name-index.json';
+
+let indexPromise = null;
+
+const decodeBase64 = (str) => {
+  const binary = atob(str);
+  const bytes = new Uint8Array(binary.length);
+  for (let i = 0; i < binary.length; i++) {
+    bytes[i] = binary.charCodeAt(i);
+  }
+  return bytes;
+};
+
+/**
+ * Decode the JSON asset into typed arrays
+ */
+export const decodeColorNameIndex = (data) => {
+  const order = decodeBase64(data.order);
+  const view = new DataView(order.buffer);
+  const positions = new Uint32Array(order.length / 4);
+  for (let i = 0; i < positions.length; i++) {
+    positions[i] = view.getUint32(i * 4, true);
+  }
+
+  return {
+    names: data.names,
+    points: decodeBase64(data.points),
+    axes: decodeBase64(data.axes),
+    order: positions
+  };
+};
+
+/**
+ * Fetch and decode the index once per page load
+ */
+export const loadColorNameIndex = () => {
+  if (!indexPromise) {
+    indexPromise = fetch(COLOR_NAME_INDEX_URL)
+      .then(res => res.json())
+      .then(decodeColorNameIndex)
+      .catch(error => {
+        indexPromise = null;
+        throw error;
+      });
+  }
+  return indexPromise;
+};
+
+/**
+ * k nearest named colors to an RGB color, closest first
+ * Ties resolve to the earlier entry in the original table.
+ */
+export const findNearestColors = (index, r, g, b, k = 1) => {
+  const { names, points, axes, order } = index;
+  const query = [r, g, b];
+  const best = []; // sorted ascending by (distance, order), at most k entries
+
+  const worse = (a, b) => a.dist > b.dist || (a.dist === b.dist && a.order > b.order);
+
+  const consider = (node, dist) => {
+    const candidate = { node, dist, order: order[node] };
+    if (best.length === k && !worse(best[k - 1], candidate)) return;
+    let i = best.length === k ? k - 1 : best.length;
+    while (i > 0 && worse(best[i - 1], candidate)) {
+      best[i] = best[i - 1];
+      i--;
+    }
+    best[i] = candidate;
+  };
+
+  const search = (lo, hi) => {
+    if (lo >= hi) return;
+    const mid = (lo + hi) >> 1;
+    const p = mid * 3;
+    const dr = points[p] - r;
+    const dg = points[p + 1] - g;
+    const db = points[p + 2] - b;
+    consider(mid, dr * dr + dg * dg + db * db);
+
+    const axis = axes[mid];
+    const diff = query[axis] - points[p + axis];
+    if (diff < 0) {
+      search(lo, mid);
+      if (best.length < k || diff * diff <= best[best.length - 1].dist) search(mid + 1, hi);
+    } else {
+      search(mid + 1, hi);
+      if (best.length < k || diff * diff <= best[best.length - 1].dist) search(lo, mid);
+    }
+  };
+
+  search(0, names.length);
+
+  return best.map(({ node, dist }) => ({
+    name: names[node],
+    hex: '#' + ((1 << 24) + (points[node * 3] << 16) + (points[node * 3 + 1] << 8) + points[node * 3 + 2]).toString(16).slice(1),
+    distance: Math.sqrt(dist)
+  }));
+};
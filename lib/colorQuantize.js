@@ -0,0 +1,128 @@
+// Histogram and median-cut quantization shared by the image extractor and its worker
+// (same algorithm as color_extract.py)
+
+import { rgbToHex } from './colorUtils';
+
+export const HISTOGRAM_BITS = 5;
+export const HISTOGRAM_SIZE = 1 << (3 * HISTOGRAM_BITS);
+
+// Pixels with alpha below this are treated as background and skipped
+export const MIN_ALPHA = 128;
+
+/**
+ * Create an empty 5-bit-per-channel histogram with per-bin channel sums
+ */
+export const createHistogram = () => ({
+  counts: new Uint32Array(HISTOGRAM_SIZE),
+  sums: new Float64Array(HISTOGRAM_SIZE * 3)
+});
+
+/**
+ * Accumulate an RGBA buffer (ImageData.data or a tile of it) into a histogram
+ */
+export const addPixels = (histogram, data) => {
+  const { counts, sums } = histogram;
+  const shift = 8 - HISTOGRAM_BITS;
+
+  for (let i = 0; i < data.length; i += 4) {
+    if (data[i + 3] < MIN_ALPHA) continue;
+    const r = data[i];
+    const g = data[i + 1];
+    const b = data[i + 2];
+    const bin = ((r >> shift) << (2 * HISTOGRAM_BITS)) | ((g >> shift) << HISTOGRAM_BITS) | (b >> shift);
+    counts[bin]++;
+    sums[bin * 3] += r;
+    sums[bin * 3 + 1] += g;
+    sums[bin * 3 + 2] += b;
+  }
+  return histogram;
+};
+
+const boxStats = (box, colors, weights) => {
+  let weight = 0;
+  const min = [255, 255, 255];
+  const max = [0, 0, 0];
+  for (const i of box) {
+    weight += weights[i];
+    for (let c = 0; c < 3; c++) {
+      const v = colors[i * 3 + c];
+      if (v < min[c]) min[c] = v;
+      if (v > max[c]) max[c] = v;
+    }
+  }
+  const spans = [max[0] - min[0], max[1] - min[1], max[2] - min[2]];
+  const axis = spans.indexOf(Math.max(...spans));
+  return { weight, axis, priority: weight * spans[axis] };
+};
+
+/**
+ * Median cut over the occupied histogram bins
+ * Returns up to `count` colors as [{ hex, weight }], heaviest first; weights sum to 1.
+ */
+export const medianCut = (histogram, count = 5) => {
+  const { counts, sums } = histogram;
+  const occupied = [];
+  for (let bin = 0; bin < counts.length; bin++) {
+    if (counts[bin]) occupied.push(bin);
+  }
+  if (!occupied.length) return [];
+
+  const colors = new Float64Array(occupied.length * 3);
+  const weights = new Float64Array(occupied.length);
+  let total = 0;
+  occupied.forEach((bin, i) => {
+    const n = counts[bin];
+    weights[i] = n;
+    total += n;
+    for (let c = 0; c < 3; c++) colors[i * 3 + c] = sums[bin * 3 + c] / n;
+  });
+
+  const boxes = [occupied.map((_, i) => i)];
+  while (boxes.length < count) {
+    // Split the box with the largest weight × widest channel span
+    const stats = boxes.map(box => boxStats(box, colors, weights));
+    let target = 0;
+    stats.forEach((s, i) => {
+      if (s.priority > stats[target].priority) target = i;
+    });
+    if (stats[target].priority === 0) break;
+
+    // Cut along the widest channel where the between-class variance is largest,
+    // which lands in gaps between color clusters rather than inside a noisy one
+    const { axis } = stats[target];
+    const box = boxes.splice(target, 1)[0].sort((a, b) => colors[a * 3 + axis] - colors[b * 3 + axis]);
+    let totalW = 0;
+    let totalS = 0;
+    for (const i of box) {
+      totalW += weights[i];
+      totalS += weights[i] * colors[i * 3 + axis];
+    }
+    let w = 0;
+    let s = 0;
+    let split = 1;
+    let bestBetween = -1;
+    for (let j = 0; j < box.length - 1; j++) {
+      w += weights[box[j]];
+      s += weights[box[j]] * colors[box[j] * 3 + axis];
+      const between = (s * totalW - w * totalS) ** 2 / (w * (totalW - w));
+      if (between > bestBetween) {
+        bestBetween = between;
+        split = j + 1;
+      }
+    }
+    boxes.push(box.slice(0, split), box.slice(split));
+  }
+
+  return boxes
+    .map(box => {
+      let weight = 0;
+      const mean = [0, 0, 0];
+      for (const i of box) {
+        weight += weights[i];
+        for (let c = 0; c < 3; c++) mean[c] += colors[i * 3 + c] * weights[i];
+      }
+      const [r, g, b] = mean.map(v => Math.round(v / weight));
+      return { hex: rgbToHex(r, g, b), weight: weight / total };
+    })
+    .sort((a, b) => b.weight - a.weight);
+};
@@ -0,0 +1,300 @@
+// Name and color search over the index built by colors_update.py
+// (public/data/color-search-index.json, see color_search.py for the layout and ranking)
+
+export const COLOR_SEARCH_INDEX_URL = '/data/color-search-index.json';
+
+export const MATCH_TIERS = ['exact', 'prefix', 'word', 'substring', 'fuzzy'];
+
+// Smallest trigram Dice similarity for a fuzzy match
+const FUZZY_THRESHOLD = 0.4;
+
+// Results for a color query when no limit is given
+export const NEAR_COUNT = 24;
+
+// Grid cells are 2^CELL_BITS levels wide on each channel
+const CELL_BITS = 5;
+const CELLS_PER_AXIS = 256 >> CELL_BITS;
+
+const COLOR_QUERY_RE = /^\s*(?:near\s+(\S.*?)|(#[0-9a-f]{3}(?:[0-9a-f]{3})?|rgb\s*\(.*\)))\s*$/i;
+const HEX_QUERY_RE = /^#?([0-9a-f]{3}|[0-9a-f]{6})$/i;
+const RGB_QUERY_RE = /^(?:rgb\s*\()?\s*(\d{1,3})\s*[,\s]\s*(\d{1,3})\s*[,\s]\s*(\d{1,3})\s*\)?$/i;
+
+let indexPromise = null;
+
+const decodeBase64 = (str) => {
+  const binary = atob(str);
+  const bytes = new Uint8Array(binary.length);
+  for (let i = 0; i < binary.length; i++) {
+    bytes[i] = binary.charCodeAt(i);
+  }
+  return bytes;
+};
+
+const decodeUint32 = (str) => {
+  const bytes = decodeBase64(str);
+  const view = new DataView(bytes.buffer);
+  const values = new Uint32Array(bytes.length / 4);
+  for (let i = 0; i < values.length; i++) {
+    values[i] = view.getUint32(i * 4, true);
+  }
+  return values;
+};
+
+// Ascending docs from LEB128 varints of the gaps between them
+const decodeDeltas = (str) => {
+  const docs = [];
+  let doc = 0, gap = 0, shift = 0;
+  for (const byte of decodeBase64(str)) {
+    gap |= (byte & 0x7f) << shift;
+    if (byte & 0x80) {
+      shift += 7;
+    } else {
+      doc += gap;
+      docs.push(doc);
+      gap = 0;
+      shift = 0;
+    }
+  }
+  return docs;
+};
+
+/**
+ * Lowercase letters and digits only, accents folded: 'Coca-Cola' -> 'cocacola'
+ */
+export const normalizeName = (text) => text.normalize('NFKD').toLowerCase().replace(/[^a-z0-9]/g, '');
+
+// Distinct trigrams of a normalized name, in order of first occurrence
+const trigrams = (key) => {
+  const grams = new Set();
+  for (let i = 0; i + 3 <= key.length; i++) grams.add(key.slice(i, i + 3));
+  return [...grams];
+};
+
+/**
+ * [r, g, b] for '#rgb', '#rrggbb', 'rgb(r, g, b)' or 'near <any of those, or r,g,b>'; else null
+ */
+export const parseColorQuery = (query) => {
+  const match = COLOR_QUERY_RE.exec(query);
+  if (!match) return null;
+  const spec = (match[1] || match[2]).trim();
+  const hexMatch = HEX_QUERY_RE.exec(spec);
+  if (hexMatch) {
+    let digits = hexMatch[1];
+    if (digits.length === 3) digits = digits.split('').map(c => c + c).join('');
+    return [0, 2, 4].map(i => parseInt(digits.slice(i, i + 2), 16));
+  }
+  const rgbMatch = RGB_QUERY_RE.exec(spec);
+  if (rgbMatch) {
+    const rgb = rgbMatch.slice(1, 4).map(Number);
+    if (rgb.every(v => v <= 255)) return rgb;
+  }
+  return null;
+};
+
+/**
+ * Decode the JSON asset; trigram postings are decoded on first use
+ * The per-document scratch arrays are shared by every query and left zeroed after each,
+ * so a keystroke allocates nothing in proportion to the index.
+ */
+export const decodeColorSearchIndex = (data) => ({
+  labels: data.labels,
+  named: data.named,
+  keys: data.labels.map(normalizeName),
+  prefixes: decodeUint32(data.prefixes),
+  trigrams: data.trigrams,
+  postings: new Map(),
+  cells: decodeUint32(data.cells),
+  points: decodeBase64(data.points),
+  pointDocs: decodeUint32(data.pointDocs),
+  scratch: {
+    tiers: new Uint8Array(data.labels.length),
+    shared: new Uint16Array(data.labels.length),
+    distances: new Uint32Array(data.labels.length)
+  }
+});
+
+/**
+ * Fetch and decode the index once per page load
+ */
+export const loadColorSearchIndex = () => {
+  if (!indexPromise) {
+    indexPromise = fetch(COLOR_SEARCH_INDEX_URL)
+      .then(res => res.json())
+      .then(decodeColorSearchIndex)
+      .catch(error => {
+        indexPromise = null;
+        throw error;
+      });
+  }
+  return indexPromise;
+};
+
+const postingsFor = (index, gram) => {
+  if (!index.postings.has(gram)) {
+    const encoded = index.trigrams[gram];
+    index.postings.set(gram, encoded ? decodeDeltas(encoded) : []);
+  }
+  return index.postings.get(gram);
+};
+
+const docRange = (index, kind) => {
+  if (kind === 'named') return [0, index.named];
+  if (kind === 'brand') return [index.named, index.labels.length];
+  if (!kind) return [0, index.labels.length];
+  throw new Error(`Unknown search kind: ${kind}`);
+};
+
+const toResult = (index, doc, match) => ({
+  doc,
+  kind: doc < index.named ? 'named' : 'brand',
+  name: index.labels[doc],
+  match
+});
+
+/**
+ * Up to k documents closest to an RGB color, each at its nearest point, closest first;
+ * with a radius, only those within it
+ */
+export const findNearColors = (index, [r, g, b], { kind = null, k = NEAR_COUNT, radius = null } = {}) => {
+  const [lo, hi] = docRange(index, kind);
+  const { cells, points, pointDocs } = index;
+  const rgb = [r, g, b];
+  const center = rgb.map(v => v >> CELL_BITS);
+  const top = CELLS_PER_AXIS - 1;
+  const size = 1 << CELL_BITS;
+  // One more than the squared distance to each document's nearest point so far, 0 until one is seen
+  const best = index.scratch.distances;
+  const seen = [];
+  // Once k documents are within the searched cells' bound, only those can rank
+  let cutoff = radius === null ? Infinity : radius * radius;
+
+  for (let ring = 0; ; ring++) {
+    // Cells at Chebyshev distance `ring` from the query's cell
+    const [x0, y0, z0] = center.map(c => Math.max(c - ring, 0));
+    const [x1, y1, z1] = center.map(c => Math.min(c + ring, top));
+    for (let x = x0; x <= x1; x++) {
+      for (let y = y0; y <= y1; y++) {
+        for (let z = z0; z <= z1; z++) {
+          if (Math.max(Math.abs(x - center[0]), Math.abs(y - center[1]), Math.abs(z - center[2])) !== ring) continue;
+          const cell = (x * CELLS_PER_AXIS + y) * CELLS_PER_AXIS + z;
+          for (let i = cells[cell]; i < cells[cell + 1]; i++) {
+            const doc = pointDocs[i];
+            if (doc < lo || doc >= hi) continue;
+            const dr = points[i * 3] - r, dg = points[i * 3 + 1] - g, db = points[i * 3 + 2] - b;
+            const distance = dr * dr + dg * dg + db * db;
+            if (!best[doc]) seen.push(doc);
+            if (!best[doc] || distance < best[doc] - 1) best[doc] = distance + 1;
+          }
+        }
+      }
+    }
+
+    // Every point outside the cells searched so far is at least `bound` away
+    const gaps = [];
+    rgb.forEach((value, axis) => {
+      const c = center[axis];
+      if (c - ring > 0) gaps.push(value - (c - ring) * size + 1);
+      if (c + ring < top) gaps.push((c + ring + 1) * size - value);
+    });
+    if (!gaps.length) break;
+    const bound = Math.min(...gaps);
+    if (radius !== null && bound > radius) break;
+    let settled = 0;
+    for (const doc of seen) {
+      if (best[doc] - 1 <= bound * bound) settled++;
+    }
+    if (settled >= k) {
+      cutoff = Math.min(cutoff, bound * bound);
+      break;
+    }
+  }
+
+  // Sorted as distance × 2^24 + doc, exact in a double
+  const keys = [];
+  for (const doc of seen) {
+    if (best[doc] - 1 <= cutoff) keys.push((best[doc] - 1) * 0x1000000 + doc);
+    best[doc] = 0;
+  }
+  const order = new Float64Array(keys).sort();
+  const results = [];
+  for (let i = 0; i < k && i < order.length; i++) {
+    const doc = order[i] % 0x1000000;
+    const result = toResult(index, doc, 'near');
+    result.distance = Math.sqrt((order[i] - doc) / 0x1000000);
+    results.push(result);
+  }
+  return results;
+};
+
+/**
+ * Best matches first: [{ doc, kind, name, match }], plus distance for color queries
+ * doc is the position among the named colors, then the brands, in table order.
+ */
+export const searchColorIndex = (index, query, { kind = null, limit = null } = {}) => {
+  const rgb = parseColorQuery(query);
+  if (rgb) return findNearColors(index, rgb, { kind, k: limit || NEAR_COUNT });
+  const [lo, hi] = docRange(index, kind);
+  const q = normalizeName(query);
+  if (!q) return [];
+  const { keys, prefixes } = index;
+  // tiers holds tier + 1 (0 = no match), and matches are sorted as tier << 24 | doc
+  const { tiers, shared } = index.scratch;
+  const matched = [];
+
+  // Word starts whose remaining key begins with q form one run of the sorted array
+  let first = 0, last = prefixes.length;
+  while (first < last) {
+    const mid = (first + last) >> 1;
+    const entry = prefixes[mid];
+    if (keys[entry >>> 8].slice(entry & 0xff) < q) first = mid + 1;
+    else last = mid;
+  }
+  for (let i = first; i < prefixes.length; i++) {
+    const doc = prefixes[i] >>> 8, offset = prefixes[i] & 0xff;
+    if (!keys[doc].startsWith(q, offset)) break;
+    if (doc < lo || doc >= hi) continue;
+    const tier = offset === 0 ? (keys[doc].length === q.length ? 1 : 2) : 3;
+    if (!tiers[doc]) matched.push(doc);
+    if (!tiers[doc] || tier < tiers[doc]) tiers[doc] = tier;
+  }
+
+  const fuzzy = [];
+  const grams = trigrams(q);
+  if (grams.length) {
+    const touched = [];
+    for (const gram of grams) {
+      for (const doc of postingsFor(index, gram)) {
+        if (doc < lo || doc >= hi || tiers[doc]) continue;
+        if (!shared[doc]) touched.push(doc);
+        shared[doc]++;
+      }
+    }
+    for (const doc of touched) {
+      if (shared[doc] === grams.length && keys[doc].includes(q)) {
+        tiers[doc] = 4;
+        matched.push(doc);
+      } else {
+        const similarity = 2 * shared[doc] / (grams.length + keys[doc].length - 2);
+        if (similarity >= FUZZY_THRESHOLD) fuzzy.push({ doc, similarity });
+      }
+      shared[doc] = 0;
+    }
+  }
+
+  const order = new Uint32Array(matched.length);
+  for (let i = 0; i < matched.length; i++) {
+    order[i] = ((tiers[matched[i]] - 1) << 24) | matched[i];
+    tiers[matched[i]] = 0;
+  }
+  order.sort();
+  const count = Math.min(limit || Infinity, order.length + fuzzy.length);
+  const results = [];
+  for (let i = 0; i < count && i < order.length; i++) {
+    results.push(toResult(index, order[i] & 0xffffff, MATCH_TIERS[order[i] >>> 24]));
+  }
+  if (results.length < count) {
+    fuzzy.sort((a, b) => b.similarity - a.similarity || a.doc - b.doc);
+    for (let i = 0; results.length < count; i++) results.push(toResult(index, fuzzy[i].doc, 'fuzzy'));
+  }
+  return results;
+};
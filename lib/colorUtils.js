@@ -167,6 +167,57 @@ export const hsvToRgb = (h, s, v) => {
   };
 };
 
+/**
+ * Convert RGB (0-255, fractions allowed) to OKLab
+ */
+export const rgbToOklab = (r, g, b) => {
+  const toLinear = (v) => {
+    v /= 255;
+    return v <= 0.04045 ? v / 12.92 : Math.pow((v + 0.055) / 1.055, 2.4);
+  };
+  const lr = toLinear(r), lg = toLinear(g), lb = toLinear(b);
+
+  const l = Math.cbrt(0.4122214708 * lr + 0.5363325363 * lg + 0.0514459929 * lb);
+  const m = Math.cbrt(0.2119034982 * lr + 0.6806995451 * lg + 0.1073969566 * lb);
+  const s = Math.cbrt(0.0883024619 * lr + 0.2817188376 * lg + 0.6299787005 * lb);
+
+  return {
+    l: 0.2104542553 * l + 0.7936177850 * m - 0.0040720468 * s,
+    a: 1.9779984951 * l - 2.4285922050 * m + 0.4505937099 * s,
+    b: 0.0259040371 * l + 0.7827717662 * m - 0.8086757660 * s
+  };
+};
+
+/**
+ * Convert OKLab to linear-light RGB (0-1), unclipped so out-of-gamut colors show
+ */
+export const oklabToLinearRgb = (l, a, b) => {
+  const lms = [
+    l + 0.3963377774 * a + 0.2158037573 * b,
+    l - 0.1055613458 * a - 0.0638541728 * b,
+    l - 0.0894841775 * a - 1.2914855480 * b
+  ].map(v => v * v * v);
+
+  return {
+    r: 4.0767416621 * lms[0] - 3.3077115913 * lms[1] + 0.2309699292 * lms[2],
+    g: -1.2684380046 * lms[0] + 2.6097574011 * lms[1] - 0.3413193965 * lms[2],
+    b: -0.0041960863 * lms[0] - 0.7034186147 * lms[1] + 1.7076147010 * lms[2]
+  };
+};
+
+/**
+ * Convert OKLab to unrounded RGB (0-255), clipped to the sRGB gamut in linear light
+ */
+export const oklabToRgb = (l, a, b) => {
+  const linear = oklabToLinearRgb(l, a, b);
+  const toSrgb = (v) => {
+    v = Math.min(1, Math.max(0, v));
+    return 255 * (v <= 0.0031308 ? v * 12.92 : 1.055 * Math.pow(v, 1 / 2.4) - 0.055);
+  };
+
+  return { r: toSrgb(linear.r), g: toSrgb(linear.g), b: toSrgb(linear.b) };
+};
+
 /**
  * Generate tints (lighter variations)
  */
@@ -308,7 +359,8 @@ export const getMonochromatic = (hex, variations = 5) => {
 };
 
 /**
- * Mix two colors
+ * Mix two colors in OKLab, so midpoints keep their lightness and chroma instead of
+ * going grey as they do when gamma-encoded RGB is averaged
  */
 export const mixColors = (hex1, hex2, percentage = 50) => {
   const rgb1 = hexToRgb(hex1);
@@ -317,11 +369,15 @@ export const mixColors = (hex1, hex2, percentage = 50) => {
   if (!rgb1 || !rgb2) return null;
 
   const p = percentage / 100;
-  const r = Math.round(rgb1.r * (1 - p) + rgb2.r * p);
-  const g = Math.round(rgb1.g * (1 - p) + rgb2.g * p);
-  const b = Math.round(rgb1.b * (1 - p) + rgb2.b * p);
-
-  return rgbToHex(r, g, b);
+  const lab1 = rgbToOklab(rgb1.r, rgb1.g, rgb1.b);
+  const lab2 = rgbToOklab(rgb2.r, rgb2.g, rgb2.b);
+  const { r, g, b } = oklabToRgb(
+    lab1.l * (1 - p) + lab2.l * p,
+    lab1.a * (1 - p) + lab2.a * p,
+    lab1.b * (1 - p) + lab2.b * p
+  );
+
+  return rgbToHex(Math.round(r), Math.round(g), Math.round(b));
 };
 
 /**
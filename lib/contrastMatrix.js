@@ -0,0 +1,124 @@
+// Precomputed WCAG contrast matrices for the color collections, emitted by colors_update.py
+// (public/data/contrast-*.json, see color_contrast.py for the layout)
+
+import { WCAG_LEVELS } from './contrastUtils';
+
+export const CONTRAST_MATRIX_URLS = {
+  named: '/data/contrast-named-colors.json',
+  brand: '/data/contrast-brand-colors.json'
+};
+
+export const ACCESSIBLE_SUGGESTIONS_URL = '/data/accessible-brand-colors.json';
+
+const matrixPromises = {};
+let suggestionsPromise = null;
+
+const decodeBase64 = (str) => {
+  const binary = atob(str);
+  const bytes = new Uint8Array(binary.length);
+  for (let i = 0; i < binary.length; i++) {
+    bytes[i] = binary.charCodeAt(i);
+  }
+  return bytes;
+};
+
+/**
+ * Decode the JSON asset into typed arrays
+ */
+export const decodeContrastMatrix = (data) => {
+  const ratioBytes = decodeBase64(data.ratios);
+  const view = new DataView(ratioBytes.buffer);
+  const ratios = new Uint16Array(ratioBytes.length / 2);
+  for (let i = 0; i < ratios.length; i++) {
+    ratios[i] = view.getUint16(i * 2, true);
+  }
+
+  return {
+    names: data.names,
+    colors: data.colors,
+    ratios,
+    levels: decodeBase64(data.levels)
+  };
+};
+
+/**
+ * Fetch and decode a collection's matrix once per page load
+ */
+export const loadContrastMatrix = (collection) => {
+  if (!matrixPromises[collection]) {
+    matrixPromises[collection] = fetch(CONTRAST_MATRIX_URLS[collection])
+      .then(res => res.json())
+      .then(decodeContrastMatrix)
+      .catch(error => {
+        delete matrixPromises[collection];
+        throw error;
+      });
+  }
+  return matrixPromises[collection];
+};
+
+// Position of pair (i, j), i < j, in the row-by-row upper triangle
+const pairOffset = (n, i, j) => i * n - (i * (i + 1)) / 2 + (j - i - 1);
+
+/**
+ * Contrast ratio (two decimals) and WCAG level between entries i and j
+ */
+export const getPairContrast = (matrix, i, j) => {
+  if (i === j) return { ratio: 1, level: WCAG_LEVELS[0] };
+  const offset = i < j
+    ? pairOffset(matrix.colors.length, i, j)
+    : pairOffset(matrix.colors.length, j, i);
+  return {
+    ratio: matrix.ratios[offset] / 100,
+    level: WCAG_LEVELS[matrix.levels[offset]]
+  };
+};
+
+/**
+ * Pairs among `indices` (default: every entry) reaching minLevel, highest contrast first
+ */
+export const getAccessiblePairs = (matrix, { minLevel = 'AA', indices = null, limit = Infinity } = {}) => {
+  const n = matrix.colors.length;
+  const minCode = WCAG_LEVELS.indexOf(minLevel);
+  const members = indices || Array.from({ length: n }, (_, i) => i);
+  const sorted = [...members].sort((a, b) => a - b);
+  const pairs = [];
+
+  for (let a = 0; a < sorted.length; a++) {
+    const i = sorted[a];
+    const rowOffset = pairOffset(n, i, i + 1);
+    for (let b = a + 1; b < sorted.length; b++) {
+      const j = sorted[b];
+      const offset = rowOffset + (j - i - 1);
+      if (matrix.levels[offset] >= minCode) {
+        pairs.push({ i, j, ratio: matrix.ratios[offset] / 100, level: WCAG_LEVELS[matrix.levels[offset]] });
+      }
+    }
+  }
+
+  pairs.sort((p, q) => q.ratio - p.ratio);
+  return pairs.slice(0, limit);
+};
+
+/**
+ * Fetch the pre-baked accessible foreground suggestions for brand color pairs once
+ */
+export const loadAccessibleSuggestions = () => {
+  if (!suggestionsPromise) {
+    suggestionsPromise = fetch(ACCESSIBLE_SUGGESTIONS_URL)
+      .then(res => res.json())
+      .catch(error => {
+        suggestionsPromise = null;
+        throw error;
+      });
+  }
+  return suggestionsPromise;
+};
+
+/**
+ * Suggested { hex, ratio } for fg text on bg, or null when the pair already passes
+ */
+export const getAccessibleSuggestion = (suggestions, fg, bg) => {
+  const entry = suggestions.suggestions[`${fg.toUpperCase()}|${bg.toUpperCase()}`];
+  return entry ? { hex: entry[0], ratio: entry[1] } : null;
+};
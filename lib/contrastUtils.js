@@ -1,18 +1,26 @@
 // Contrast and accessibility utilities based on WCAG 2.1
 
-import { hexToRgb } from './colorUtils';
+import { hexToRgb, rgbToHex } from './colorUtils';
+
+const linearize = (channel) => {
+  const val = channel / 255;
+  return val <= 0.03928 ? val / 12.92 : Math.pow((val + 0.055) / 1.055, 2.4);
+};
+
+/**
+ * Linearized sRGB channel for every 8-bit value, built once
+ */
+const LUMINANCE_LINEAR = Float64Array.from({ length: 256 }, (_, i) => linearize(i));
+
+// Table lookup for 8-bit channels; fractional or out-of-range values use the formula
+const linearChannel = (v) => (Number.isInteger(v) && v >= 0 && v <= 255 ? LUMINANCE_LINEAR[v] : linearize(v));
 
 /**
  * Calculate relative luminance
  * https://www.w3.org/TR/WCAG20-TECHS/G17.html
  */
 export const getRelativeLuminance = (r, g, b) => {
-  const [rs, gs, bs] = [r, g, b].map(val => {
-    val /= 255;
-    return val <= 0.03928 ? val / 12.92 : Math.pow((val + 0.055) / 1.055, 2.4);
-  });
-
-  return 0.2126 * rs + 0.7152 * gs + 0.0722 * bs;
+  return 0.2126 * linearChannel(r) + 0.7152 * linearChannel(g) + 0.0722 * linearChannel(b);
 };
 
 /**
@@ -48,6 +56,21 @@ export const meetsWCAG = (ratio, level = 'AA', size = 'normal') => {
   return size === 'large' ? ratio >= 3 : ratio >= 4.5;
 };
 
+/**
+ * WCAG levels in ascending order; level codes in contrast matrices index this list
+ */
+export const WCAG_LEVELS = ['Fail', 'AA Large', 'AA', 'AAA'];
+
+/**
+ * Highest WCAG level a contrast ratio reaches
+ */
+export const getWCAGLevel = (ratio) => {
+  if (ratio >= 7) return 'AAA';
+  if (ratio >= 4.5) return 'AA';
+  if (ratio >= 3) return 'AA Large';
+  return 'Fail';
+};
+
 /**
  * Get WCAG rating for a contrast ratio
  */
@@ -79,8 +102,50 @@ export const getWCAGRating = (ratio) => {
   return ratings;
 };
 
+// Unrounded HSL, so a color survives the round trip through the lightness search
+const rgbToHslExact = (r, g, b) => {
+  r /= 255;
+  g /= 255;
+  b /= 255;
+  const max = Math.max(r, g, b), min = Math.min(r, g, b);
+  let h, s, l = (max + min) / 2;
+
+  if (max === min) {
+    h = s = 0;
+  } else {
+    const d = max - min;
+    s = l > 0.5 ? d / (2 - max - min) : d / (max + min);
+    switch (max) {
+      case r: h = (g - b) / d + (g < b ? 6 : 0); break;
+      case g: h = (b - r) / d + 2; break;
+      case b: h = (r - g) / d + 4; break;
+    }
+    h /= 6;
+  }
+
+  return { h: h * 360, s: s * 100, l: l * 100 };
+};
+
+const hslToRgbClamped = (h, s, l) => {
+  l /= 100;
+  const a = s * Math.min(l, 1 - l) / 100;
+  const f = n => {
+    const k = (n + h / 30) % 12;
+    const color = l - a * Math.max(Math.min(k - 3, 9 - k, 1), -1);
+    return Math.min(255, Math.max(0, Math.round(255 * color)));
+  };
+  return [f(0), f(8), f(4)];
+};
+
+// Bisection steps on HSL lightness (0..100); 20 halvings resolve 1e-4, well below the
+// ~0.2 lightness units between neighboring 8-bit colors
+const LIGHTNESS_STEPS = 20;
+
 /**
  * Suggest an accessible color by adjusting lightness
+ * Returns the color with the same hue and saturation and the smallest lightness change
+ * whose contrast against bgColor reaches targetRatio (fgColor itself if it already does
+ * or no lightness can). Mirrors accessible_colors in color_contrast.py.
  */
 export const suggestAccessibleColor = (bgColor, fgColor, targetRatio = 4.5) => {
   const bgRgb = hexToRgb(bgColor);
@@ -89,22 +154,32 @@ export const suggestAccessibleColor = (bgColor, fgColor, targetRatio = 4.5) => {
   if (!bgRgb || !fgRgb) return fgColor;
 
   const bgLum = getRelativeLuminance(bgRgb.r, bgRgb.g, bgRgb.b);
-
-  // Try making foreground lighter or darker
-  let bestColor = fgColor;
-  let bestRatio = getContrastRatio(bgColor, fgColor);
-
-  for (let l = 0; l <= 100; l += 5) {
-    const testColor = `rgb(${Math.round(fgRgb.r * l / 100)}, ${Math.round(fgRgb.g * l / 100)}, ${Math.round(fgRgb.b * l / 100)})`;
-    const ratio = getContrastRatio(bgColor, testColor);
-
-    if (ratio >= targetRatio && ratio > bestRatio) {
-      bestRatio = ratio;
-      bestColor = testColor;
+  const ratioAt = ([r, g, b]) => {
+    const lum = getRelativeLuminance(r, g, b);
+    return (Math.max(lum, bgLum) + 0.05) / (Math.min(lum, bgLum) + 0.05);
+  };
+
+  if (ratioAt([fgRgb.r, fgRgb.g, fgRgb.b]) >= targetRatio) return fgColor;
+
+  const { h, s, l } = rgbToHslExact(fgRgb.r, fgRgb.g, fgRgb.b);
+  const passes = (lightness) => ratioAt(hslToRgbClamped(h, s, lightness)) >= targetRatio;
+
+  // Luminance is monotonic in lightness, so bisect between l (failing) and each end
+  let best = null;
+  for (const bound of [100, 0]) {
+    if (!passes(bound)) continue;
+    let lo = l, hi = bound;
+    for (let i = 0; i < LIGHTNESS_STEPS; i++) {
+      const mid = (lo + hi) / 2;
+      if (passes(mid)) hi = mid;
+      else lo = mid;
     }
+    if (best === null || Math.abs(hi - l) < Math.abs(best - l)) best = hi;
   }
 
-  return bestColor;
+  if (best === null) return fgColor;
+  const [r, g, b] = hslToRgbClamped(h, s, best);
+  return rgbToHex(r, g, b);
 };
 
 /**
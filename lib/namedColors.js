@@ -146,8 +146,14 @@ export const namedColors = [
 ];
 
 // Get color by name
+let colorsByName = null;
+
 export const getColorByName = (name) => {
-  return namedColors.find(c => c.name.toLowerCase() === name.toLowerCase());
+  if (!colorsByName) {
+    // Reverse so the first entry wins for duplicate names, as with find()
+    colorsByName = new Map(namedColors.map(c => [c.name.toLowerCase(), c]).reverse());
+  }
+  return colorsByName.get(name.toLowerCase());
 };
 
 // Get colors by category
@@ -172,6 +178,7 @@ export const getRandomNamedColor = () => {
 };
 
 // Get similar colors (by hex similarity)
+// Nearest by hex value; app/colors/[name] uses the perceptual table in lib/similarColors.json
 export const getSimilarColors = (hex, count = 5) => {
   const hexToNumber = (h) => parseInt(h.replace('#', ''), 16);
   const targetNum = hexToNumber(hex);
@@ -0,0 +1,24 @@
+// Build-time access to the shade scales written by colors_update.py
+// (public/data/shade-scales.json, see color_shades.py). Server only: the asset is read from disk.
+
+import fs from 'fs';
+import path from 'path';
+
+const SHADE_SCALES_FILE = path.join(process.cwd(), 'public', 'data', 'shade-scales.json');
+
+let shadeScales;
+
+/**
+ * The scales in the shape loadShadeScales resolves to, or null when the generator has not been run
+ */
+export const getShadeScaleData = () => {
+  if (shadeScales === undefined) {
+    try {
+      const data = JSON.parse(fs.readFileSync(SHADE_SCALES_FILE, 'utf8'));
+      shadeScales = { ...data, index: new Map(data.colors.map((color, i) => [color, i])) };
+    } catch (error) {
+      shadeScales = null;
+    }
+  }
+  return shadeScales;
+};
@@ -0,0 +1,98 @@
+// Shade scales for the named and brand colors, precomputed by colors_update.py (color_shades.py)
+// Client safe: the asset is fetched once. The perceptual ramp is mirrored here for colors
+// outside the collections; the HSL ramps are generateShadeScale/generateTints/generateShades.
+
+import { hexToRgb, rgbToHex, rgbToOklab, oklabToRgb, oklabToLinearRgb, generateShadeScale } from './colorUtils';
+
+export const SHADE_STEPS = [50, 100, 200, 300, 400, 500, 600, 700, 800, 900, 950];
+
+export const SHADE_RAMPS = ['hsl', 'oklch'];
+
+export const SHADE_SCALES_URL = '/data/shade-scales.json';
+
+// OKLCH lightness of the 50 and 950 steps
+const OKLCH_LIGHTEST = 0.97;
+const OKLCH_DARKEST = 0.27;
+
+// Share of the base chroma dropped at 50 and 950, easing in quadratically from 500
+const CHROMA_TAPER = 0.7;
+
+// Chroma bisection steps when a step falls outside sRGB
+const GAMUT_ITERATIONS = 16;
+const GAMUT_EPSILON = 1e-6;
+
+let scalesPromise = null;
+
+const inGamut = (l, a, b) => {
+  const { r, g, b: blue } = oklabToLinearRgb(l, a, b);
+  return [r, g, blue].every(v => v >= -GAMUT_EPSILON && v <= 1 + GAMUT_EPSILON);
+};
+
+/**
+ * Perceptual 50-950 scale: the color stays at 500, OKLCH lightness moves towards fixed
+ * ends with the hue held and chroma tapered, and out-of-gamut steps keep the most chroma that fits
+ */
+export const generatePerceptualScale = (hex) => {
+  const rgb = hexToRgb(hex);
+  if (!rgb) return [];
+  const lab = rgbToOklab(rgb.r, rgb.g, rgb.b);
+
+  return SHADE_STEPS.map(scale => {
+    const u = scale <= 500 ? (500 - scale) / 450 : (scale - 500) / 450;
+    const end = scale <= 500 ? OKLCH_LIGHTEST : OKLCH_DARKEST;
+    const l = lab.l + (end - lab.l) * u;
+    const taper = 1 - CHROMA_TAPER * u * u;
+    // Chroma scales along the color's own a/b direction, which keeps the hue exactly
+    let chroma = taper;
+    if (!inGamut(l, lab.a * taper, lab.b * taper)) {
+      let low = 0, high = taper;
+      for (let i = 0; i < GAMUT_ITERATIONS; i++) {
+        const mid = (low + high) / 2;
+        if (inGamut(l, lab.a * mid, lab.b * mid)) low = mid;
+        else high = mid;
+      }
+      chroma = low;
+    }
+    const { r, g, b } = oklabToRgb(l, lab.a * chroma, lab.b * chroma);
+    return { scale, color: rgbToHex(Math.round(r), Math.round(g), Math.round(b)) };
+  });
+};
+
+const unpack = (packed) => packed.match(/.{6}/g).map(hex => `#${hex}`);
+
+/**
+ * Fetch the precomputed scales once: { steps, tintSteps, colors, hsl, oklch, tints, shades }
+ */
+export const loadShadeScales = () => {
+  if (!scalesPromise) {
+    scalesPromise = fetch(SHADE_SCALES_URL)
+      .then(res => res.json())
+      .then(data => ({ ...data, index: new Map(data.colors.map((color, i) => [color, i])) }))
+      .catch(error => {
+        scalesPromise = null;
+        throw error;
+      });
+  }
+  return scalesPromise;
+};
+
+/**
+ * Precomputed ramps for a collection color, or null for any other color
+ * { scale: [{ scale, color }], tints, shades } with tints and shades nearest the base first,
+ * as generateTints/generateShades return them
+ */
+export const getShadeScale = (data, hex, ramp = 'hsl') => {
+  const i = data && typeof hex === 'string' ? data.index.get(hex.toUpperCase()) : undefined;
+  if (i === undefined) return null;
+  return {
+    scale: unpack(data[ramp][i]).map((color, k) => ({ scale: data.steps[k], color })),
+    tints: unpack(data.tints[i]),
+    shades: unpack(data.shades[i])
+  };
+};
+
+/**
+ * 50-950 scale for any color on the given ramp
+ */
+export const shadeScale = (hex, ramp = 'hsl') =>
+  ramp === 'oklch' ? generatePerceptualScale(hex) : generateShadeScale(hex);
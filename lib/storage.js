@@ -1,4 +1,9 @@
 // LocalStorage wrapper utilities
+// History, saved colors, palettes and gradients are kept in memory and written back in one
+// batch when the browser is idle (and when the page is hidden), so a burst of changes costs
+// a single localStorage write. Colors are held as packed 24-bit integers in memory and in the
+// IndexedDB archive that takes palettes beyond the localStorage cap; localStorage itself keeps
+// the original JSON arrays of hex strings, so older builds can still read what this one writes.
 
 const STORAGE_KEYS = {
   SAVED_COLORS: 'color_makr_saved_colors',
@@ -8,18 +13,44 @@ const STORAGE_KEYS = {
   USER_PREFERENCES: 'color_makr_preferences'
 };
 
+const HISTORY_LIMIT = 20;
+const SAVED_COLORS_LIMIT = 50;
+const GRADIENT_LIMIT = 20;
+
+// Palettes kept in localStorage; older ones are archived to IndexedDB
+const PALETTE_LIMIT = 50;
+
+// Wait between a color change and recording it in ColorExplorer's history, so a drag across
+// the wheel records the color it settles on rather than every color it passes
+export const HISTORY_SETTLE_MS = 300;
+
+// Longest a pending write waits for an idle period, and the delay where
+// requestIdleCallback is unavailable
+const FLUSH_TIMEOUT_MS = 2000;
+const FLUSH_FALLBACK_MS = 200;
+
+// Typical per-origin localStorage allowance, in bytes of UTF-16 keys and values
+export const LOCAL_STORAGE_QUOTA = 5 * 1024 * 1024;
+
+const PALETTE_DB = { name: 'color_makr', version: 1, store: 'palettes' };
+
 /**
  * Check if localStorage is available
  */
+let storageAvailable = null;
+
 export const isStorageAvailable = () => {
-  try {
-    const test = '__storage_test__';
-    localStorage.setItem(test, test);
-    localStorage.removeItem(test);
-    return true;
-  } catch (e) {
-    return false;
+  if (storageAvailable === null) {
+    try {
+      const test = '__storage_test__';
+      localStorage.setItem(test, test);
+      localStorage.removeItem(test);
+      storageAvailable = true;
+    } catch (e) {
+      storageAvailable = false;
+    }
   }
+  return storageAvailable;
 };
 
 /**
@@ -73,6 +104,9 @@ export const removeItem = (key) => {
 export const clearAll = () => {
   if (!isStorageAvailable()) return false;
 
+  pending.clear();
+  entries.clear();
+  archiveQueue = [];
   try {
     localStorage.clear();
     return true;
@@ -82,82 +116,406 @@ export const clearAll = () => {
   }
 };
 
+// Packed colors
+
+/**
+ * '#RRGGBB' (or 'RRGGBB', any case) as a 24-bit integer, or -1 if it is not one
+ */
+export const packColor = (color) => {
+  const match = /^#?([a-f\d]{6})$/i.exec(color);
+  return match ? parseInt(match[1], 16) : -1;
+};
+
+/**
+ * 24-bit integer back to '#rrggbb'
+ */
+export const unpackColor = (value) => '#' + (0x1000000 + value).toString(16).slice(1);
+
+/**
+ * 24-bit colors as base64, four characters each
+ */
+export const encodeColors = (values) => {
+  let binary = '';
+  for (const value of values) {
+    binary += String.fromCharCode(value >> 16, (value >> 8) & 0xff, value & 0xff);
+  }
+  return btoa(binary);
+};
+
+export const decodeColors = (str) => {
+  const binary = atob(str);
+  const values = [];
+  for (let i = 0; i + 2 < binary.length; i += 3) {
+    values.push((binary.charCodeAt(i) << 16) | (binary.charCodeAt(i + 1) << 8) | binary.charCodeAt(i + 2));
+  }
+  return values;
+};
+
+/**
+ * Most-recent-first list of at most `capacity` distinct packed colors in a ring buffer
+ * Adding a new color overwrites the oldest slot; re-adding one moves it to the front by
+ * shifting only the entries newer than it.
+ */
+export const createColorRing = (capacity, values = []) => {
+  const slots = new Uint32Array(capacity);
+  let start = 0;
+  let size = 0;
+  const slot = (i) => (start + i) % capacity;
+
+  const ring = {
+    get size() {
+      return size;
+    },
+    indexOf(value) {
+      for (let i = 0; i < size; i++) {
+        if (slots[slot(i)] === value) return i;
+      }
+      return -1;
+    },
+    // Returns false when the ring is unchanged
+    add(value) {
+      const i = ring.indexOf(value);
+      if (i === 0) return false;
+      if (i > 0) {
+        for (let j = i; j > 0; j--) slots[slot(j)] = slots[slot(j - 1)];
+      } else {
+        start = (start + capacity - 1) % capacity;
+        size = Math.min(size + 1, capacity);
+      }
+      slots[start] = value;
+      return true;
+    },
+    remove(value) {
+      const i = ring.indexOf(value);
+      if (i < 0) return false;
+      for (let j = i; j < size - 1; j++) slots[slot(j)] = slots[slot(j + 1)];
+      size--;
+      return true;
+    },
+    values() {
+      return Array.from({ length: size }, (_, i) => slots[slot(i)]);
+    }
+  };
+
+  // values are most recent first; adding oldest first leaves them in that order
+  for (let i = Math.min(values.length, capacity) - 1; i >= 0; i--) ring.add(values[i]);
+  return ring;
+};
+
+// Write-behind cache
+// Each cached key remembers the stored string its value was read from. Reads compare it with
+// localStorage, so a value another tab has written since is reloaded, with this tab's
+// unwritten changes replayed on top of it; flushing does the same before writing.
+
+const entries = new Map(); // key -> { raw, value, ops }, ops being this tab's unwritten changes
+const pending = new Set(); // keys with unwritten changes
+let archiveQueue = []; // palettes pushed past PALETTE_LIMIT, newest first, waiting for the next flush
+let flushScheduled = false;
+let listening = false;
+
+const readRaw = (key) => {
+  if (!isStorageAvailable()) return null;
+
+  try {
+    return localStorage.getItem(key);
+  } catch (error) {
+    console.error('Error reading from localStorage:', error);
+    return null;
+  }
+};
+
+const writeRaw = (key, value) => {
+  if (!isStorageAvailable()) return false;
+
+  try {
+    localStorage.setItem(key, value);
+    return true;
+  } catch (error) {
+    console.error('Error writing to localStorage:', error);
+    return false;
+  }
+};
+
+const requestIdle = (callback) => {
+  if (typeof requestIdleCallback === 'function') {
+    requestIdleCallback(callback, { timeout: FLUSH_TIMEOUT_MS });
+  } else {
+    setTimeout(callback, FLUSH_FALLBACK_MS);
+  }
+};
+
+const scheduleWrite = (key) => {
+  pending.add(key);
+  if (typeof window === 'undefined') return;
+
+  if (!listening) {
+    // Anything still pending when the tab is hidden or closed is written immediately
+    listening = true;
+    document.addEventListener('visibilitychange', () => {
+      if (document.visibilityState === 'hidden') flushStorage();
+    });
+    window.addEventListener('pagehide', flushStorage);
+  }
+  if (!flushScheduled) {
+    flushScheduled = true;
+    requestIdle(flushStorage);
+  }
+};
+
+// The current value for a key from STORES
+const cached = (key) => {
+  const raw = readRaw(key);
+  const entry = entries.get(key);
+  if (entry && entry.raw === raw) return entry.value;
+
+  const value = STORES[key].load(raw);
+  const ops = entry ? entry.ops : [];
+  for (const op of ops) op(value);
+  entries.set(key, { raw, value, ops });
+  return value;
+};
+
+// Applies op(value), which returns false when it changed nothing, and schedules the write
+const update = (key, op) => {
+  const value = cached(key);
+  if (op(value)) {
+    entries.get(key).ops.push(op);
+    scheduleWrite(key);
+  }
+  return value;
+};
+
+// Evicted palettes still to archive; one evicted before a reload from another tab may be back
+// among the newest, and stays there
+const queuedArchive = () => {
+  const kept = new Set(cached(STORAGE_KEYS.SAVED_PALETTES).map(p => p.id));
+  return archiveQueue.filter(p => !kept.has(p.id));
+};
+
+/**
+ * Write every pending change now; normally done when the browser is idle
+ */
+export const flushStorage = () => {
+  flushScheduled = false;
+  let ok = true;
+  for (const key of pending) {
+    const value = cached(key);
+    const raw = STORES[key].serialize(value);
+    if (writeRaw(key, raw)) {
+      entries.set(key, { raw, value, ops: [] });
+    } else {
+      // The changes stay cached and are retried with the next write
+      ok = false;
+    }
+  }
+  pending.clear();
+  if (archiveQueue.length) {
+    const archived = queuedArchive();
+    archiveQueue = [];
+    // Without IndexedDB palettes past the cap are dropped, as they were before archiving
+    if (archived.length && typeof indexedDB !== 'undefined') {
+      archivePalettes(archived).catch(error => console.error('Error archiving palettes:', error));
+    }
+  }
+  return ok;
+};
+
+// Color lists are JSON arrays of hex strings; a few builds stored them as base64 packed colors
+const parseColorList = (raw) => {
+  if (!raw) return [];
+
+  try {
+    if (raw.startsWith('[')) return JSON.parse(raw).map(packColor).filter(value => value >= 0);
+    return decodeColors(raw);
+  } catch (error) {
+    console.error('Error reading from localStorage:', error);
+    return [];
+  }
+};
+
+const colorListStore = (capacity) => ({
+  load: raw => createColorRing(capacity, parseColorList(raw)),
+  serialize: ring => JSON.stringify(ring.values().map(unpackColor))
+});
+
+// Palettes: { id, name, colors, createdAt }, newest first, with colors packed in memory and hex
+// arrays in localStorage (or packed there too, by the builds that stored lists packed)
+const parsePalettes = (raw) => {
+  let stored = [];
+  try {
+    stored = raw ? JSON.parse(raw) : [];
+  } catch (error) {
+    console.error('Error reading from localStorage:', error);
+  }
+  return stored.map(palette => ({
+    ...palette,
+    colors: Array.isArray(palette.colors) ? encodeColors(palette.colors.map(packColor).filter(v => v >= 0)) : palette.colors
+  }));
+};
+
+const STORES = {
+  [STORAGE_KEYS.SAVED_COLORS]: colorListStore(SAVED_COLORS_LIMIT),
+  [STORAGE_KEYS.COLOR_HISTORY]: colorListStore(HISTORY_LIMIT),
+  [STORAGE_KEYS.SAVED_PALETTES]: { load: parsePalettes, serialize: palettes => JSON.stringify(palettes.map(decodePalette)) }
+};
+
+const colorsOf = (key) => cached(key).values().map(unpackColor);
+
 // Specific storage functions
 
 /**
  * Save a color to favorites
  */
 export const saveColor = (color) => {
-  const saved = getItem(STORAGE_KEYS.SAVED_COLORS, []);
-  if (!saved.includes(color)) {
-    saved.unshift(color);
-    setItem(STORAGE_KEYS.SAVED_COLORS, saved.slice(0, 50)); // Keep max 50
-  }
+  const value = packColor(color);
+  if (value < 0) return;
+  // Favorites keep their place when saved again, unlike history
+  update(STORAGE_KEYS.SAVED_COLORS, ring => ring.indexOf(value) < 0 && ring.add(value));
 };
 
 /**
  * Get saved colors
  */
 export const getSavedColors = () => {
-  return getItem(STORAGE_KEYS.SAVED_COLORS, []);
+  return colorsOf(STORAGE_KEYS.SAVED_COLORS);
 };
 
 /**
  * Remove saved color
  */
 export const removeSavedColor = (color) => {
-  const saved = getItem(STORAGE_KEYS.SAVED_COLORS, []);
-  const filtered = saved.filter(c => c !== color);
-  setItem(STORAGE_KEYS.SAVED_COLORS, filtered);
+  const value = packColor(color);
+  update(STORAGE_KEYS.SAVED_COLORS, ring => ring.remove(value));
 };
 
 /**
- * Add color to history
+ * Add color to history; returns the history, most recent first
  */
 export const addToHistory = (color) => {
-  const history = getItem(STORAGE_KEYS.COLOR_HISTORY, []);
-  const filtered = history.filter(c => c !== color);
-  filtered.unshift(color);
-  setItem(STORAGE_KEYS.COLOR_HISTORY, filtered.slice(0, 20)); // Keep last 20
+  const value = packColor(color);
+  return update(STORAGE_KEYS.COLOR_HISTORY, ring => value >= 0 && ring.add(value)).values().map(unpackColor);
 };
 
 /**
  * Get color history
  */
 export const getColorHistory = () => {
-  return getItem(STORAGE_KEYS.COLOR_HISTORY, []);
+  return colorsOf(STORAGE_KEYS.COLOR_HISTORY);
+};
+
+const decodePalette = (palette) => ({ ...palette, colors: decodeColors(palette.colors).map(unpackColor) });
+
+const encodePalette = (palette) => ({ ...palette, colors: encodeColors(palette.colors.map(packColor).filter(v => v >= 0)) });
+
+// Puts a packed palette first; those pushed past PALETTE_LIMIT wait for the next flush's archive
+const pushPalette = (stored, palette) => {
+  stored.unshift(palette);
+  const evicted = stored.splice(PALETTE_LIMIT);
+  const queued = new Set(archiveQueue.map(p => p.id));
+  archiveQueue.unshift(...evicted.filter(p => !queued.has(p.id)));
 };
 
 /**
  * Save a palette
  */
 export const savePalette = (palette, name = 'Unnamed Palette') => {
-  const palettes = getItem(STORAGE_KEYS.SAVED_PALETTES, []);
-  const newPalette = {
-    id: Date.now(),
+  const stored = cached(STORAGE_KEYS.SAVED_PALETTES);
+  const newPalette = encodePalette({
+    // Ids are creation times, kept unique (and the archive's key) when saves share a millisecond
+    id: Math.max(Date.now(), ...stored.map(p => p.id + 1)),
     name,
     colors: palette,
     createdAt: new Date().toISOString()
-  };
-  palettes.unshift(newPalette);
-  setItem(STORAGE_KEYS.SAVED_PALETTES, palettes.slice(0, 50)); // Keep max 50
-  return newPalette;
+  });
+  update(STORAGE_KEYS.SAVED_PALETTES, stored => {
+    pushPalette(stored, newPalette);
+    return true;
+  });
+  return decodePalette(newPalette);
 };
 
 /**
- * Get saved palettes
+ * Get saved palettes (the newest PALETTE_LIMIT; see getArchivedPalettes for older ones)
  */
 export const getSavedPalettes = () => {
-  return getItem(STORAGE_KEYS.SAVED_PALETTES, []);
+  return cached(STORAGE_KEYS.SAVED_PALETTES).map(decodePalette);
 };
 
 /**
  * Delete a palette
  */
 export const deletePalette = (id) => {
-  const palettes = getItem(STORAGE_KEYS.SAVED_PALETTES, []);
-  const filtered = palettes.filter(p => p.id !== id);
-  setItem(STORAGE_KEYS.SAVED_PALETTES, filtered);
+  let removed = false;
+  update(STORAGE_KEYS.SAVED_PALETTES, stored => {
+    const index = stored.findIndex(p => p.id === id);
+    if (index < 0) return false;
+    stored.splice(index, 1);
+    removed = true;
+    return true;
+  });
+  if (removed) return Promise.resolve(true);
+  archiveQueue = archiveQueue.filter(p => p.id !== id);
+  return withPaletteStore('readwrite', store => store.delete(id)).then(() => true, () => false);
+};
+
+// IndexedDB archive for palettes past PALETTE_LIMIT
+
+let paletteDbPromise = null;
+
+const openPaletteDb = () => {
+  if (!paletteDbPromise) {
+    paletteDbPromise = new Promise((resolve, reject) => {
+      if (typeof indexedDB === 'undefined') {
+        reject(new Error('IndexedDB is not available'));
+        return;
+      }
+      const request = indexedDB.open(PALETTE_DB.name, PALETTE_DB.version);
+      request.onupgradeneeded = () => request.result.createObjectStore(PALETTE_DB.store, { keyPath: 'id' });
+      request.onsuccess = () => resolve(request.result);
+      request.onerror = () => reject(request.error);
+    }).catch(error => {
+      paletteDbPromise = null;
+      throw error;
+    });
+  }
+  return paletteDbPromise;
+};
+
+// Runs fn(store) in one transaction; resolves with the last request's result when it commits
+const withPaletteStore = (mode, fn) => openPaletteDb().then(db => new Promise((resolve, reject) => {
+  const transaction = db.transaction(PALETTE_DB.store, mode);
+  const request = fn(transaction.objectStore(PALETTE_DB.store));
+  transaction.oncomplete = () => resolve(request ? request.result : undefined);
+  transaction.onerror = () => reject(transaction.error);
+  transaction.onabort = () => reject(transaction.error);
+}));
+
+const archivePalettes = (batch) => withPaletteStore('readwrite', store => {
+  let request = null;
+  for (const palette of batch) request = store.put(palette);
+  return request;
+});
+
+/**
+ * Palettes archived to IndexedDB, newest first; empty where IndexedDB is unavailable
+ */
+export const getArchivedPalettes = () => withPaletteStore('readonly', store => store.getAll())
+  .then(archived => [...queuedArchive(), ...archived.sort((a, b) => b.id - a.id)].map(decodePalette))
+  .catch(() => queuedArchive().map(decodePalette));
+
+/**
+ * Move an archived palette (as getArchivedPalettes returns it) back to the front of the saved
+ * palettes; the oldest saved one is archived in its place when the list is full
+ */
+export const restorePalette = (palette) => {
+  archiveQueue = archiveQueue.filter(p => p.id !== palette.id);
+  const restored = encodePalette(palette);
+  update(STORAGE_KEYS.SAVED_PALETTES, stored => {
+    if (stored.some(p => p.id === restored.id)) return false;
+    pushPalette(stored, restored);
+    return true;
+  });
+  return withPaletteStore('readwrite', store => store.delete(palette.id)).then(() => true, () => false);
 };
 
 /**
@@ -166,7 +524,7 @@ export const deletePalette = (id) => {
 export const saveGradient = (gradient) => {
   const gradients = getItem(STORAGE_KEYS.RECENT_GRADIENTS, []);
   gradients.unshift(gradient);
-  setItem(STORAGE_KEYS.RECENT_GRADIENTS, gradients.slice(0, 20));
+  setItem(STORAGE_KEYS.RECENT_GRADIENTS, gradients.slice(0, GRADIENT_LIMIT));
 };
 
 /**
@@ -194,3 +552,35 @@ export const getPreferences = () => {
     autoSaveHistory: true
   });
 };
+
+/**
+ * Storage used by the app: { localStorage, localStorageQuota } in bytes for this app's keys
+ * (UTF-16, so two bytes a character), and the origin-wide { usage, quota } from the Storage
+ * API, null where it is unsupported
+ */
+export const getStorageUsage = async () => {
+  flushStorage();
+  let localBytes = 0;
+  if (isStorageAvailable()) {
+    for (const key of Object.values(STORAGE_KEYS)) {
+      const value = localStorage.getItem(key);
+      if (value !== null) localBytes += (key.length + value.length) * 2;
+    }
+  }
+
+  let estimate = null;
+  if (typeof navigator !== 'undefined' && navigator.storage && navigator.storage.estimate) {
+    try {
+      estimate = await navigator.storage.estimate();
+    } catch (error) {
+      estimate = null;
+    }
+  }
+
+  return {
+    localStorage: localBytes,
+    localStorageQuota: LOCAL_STORAGE_QUOTA,
+    usage: estimate ? estimate.usage : null,
+    quota: estimate ? estimate.quota : null
+  };
+};